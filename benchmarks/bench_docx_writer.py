@@ -0,0 +1,87 @@
+"""Бенчмарк заполнения таблицы DOCX отчета.
+
+Сравнивает построчное заполнение таблицы через объектную модель python-docx
+(add_row + cell.text) с пакетным выводом строк в DocxWriter.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_docx_writer.py --rows 5000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src' / 'python_homework_6'))
+
+from docx import Document  # noqa: E402
+from report_manager.base.formatters import format_size, readable_mtime  # noqa: E402
+from report_manager.scanner import ScanRecord  # noqa: E402
+from report_manager.writers.docx_writer import DocxWriter  # noqa: E402
+
+
+def make_rows(count):
+    """Формирование тестовых записей отчета.
+
+    Args:
+        count (int): количество записей
+
+    Returns:
+        list: записи ScanRecord
+    """
+    return [ScanRecord(f'/data/dir_{i // 100}/file_{i}.txt', i * 1024, 1704110400, 1, False)
+            for i in range(count)]
+
+
+def fill_by_rows(rows, report_path):
+    """Построчное заполнение таблицы через add_row() и cell.text.
+
+    Args:
+        rows (list): записи отчета
+        report_path (Path): путь к файлу отчета
+    """
+    word_doc = Document()
+    data_tab = word_doc.add_table(1, 3, 'Light List Accent 1')
+    for row in rows:
+        texts = (row.path, format_size(row), readable_mtime(row.mtime))
+        for cell, text in zip(data_tab.add_row().cells, texts, strict = True):
+            cell.text = text
+    word_doc.save(report_path)
+
+
+def fill_by_writer(rows, report_path):
+    """Заполнение таблицы через DocxWriter.
+
+    Args:
+        rows (list): записи отчета
+        report_path (Path): путь к файлу отчета
+    """
+    writer = DocxWriter(report_path, '/data')
+    writer.create_file()
+    for row in rows:
+        writer.write_to_file(row)
+    writer.save_file()
+
+
+def main():
+    """Запуск бенчмарка и вывод результатов."""
+    parser = argparse.ArgumentParser(description = 'Бенчмарк DocxWriter')
+    parser.add_argument('--rows', type=int, default=5000, help='Количество строк таблицы')
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        timings = {}
+        for name, func in (('add_row', fill_by_rows), ('DocxWriter', fill_by_writer)):
+            start = time.perf_counter()
+            func(rows, Path(tmp_dir) / f'{name}.docx')
+            timings[name] = time.perf_counter() - start
+
+    for name, seconds in timings.items():
+        print(f'{name:>12}: {seconds:.3f} с')
+    print(f'{"ускорение":>12}: {timings["add_row"] / timings["DocxWriter"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
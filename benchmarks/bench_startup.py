@@ -0,0 +1,90 @@
+"""Бенчмарк времени запуска CLI для каждого формата отчета.
+
+Запускает main.py с ключом -X importtime на небольшом каталоге и выводит
+суммарное время импорта модулей и общее время работы процесса. Позволяет
+отслеживать, что отчет одного формата не загружает библиотеки остальных.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_startup.py --repeat 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src' / 'python_homework_6'
+FORMATS = ('csv', 'json', 'ndjson', 'xlsx', 'docx', 'pdf')
+#Библиотеки форматов, загрузка которых отслеживается
+BACKENDS = ('reportlab', 'openpyxl', 'docx')
+
+
+def parse_importtime(stderr):
+    """Разбор вывода -X importtime.
+
+    Args:
+        stderr (str): вывод процесса в stderr
+
+    Returns:
+        tuple: (суммарное время импорта в мкс, множество загруженных библиотек форматов)
+    """
+    total = 0
+    backends = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        #Время вложенных импортов входит в cumulative модулей верхнего уровня
+        if not name.startswith('  '):
+            total += int(cumulative)
+        package = name.strip().split('.')[0]
+        if package in BACKENDS:
+            backends.add(package)
+    return total, backends
+
+
+def run_cli(report_format, tmp_dir):
+    """Запуск CLI с выводом отчета заданного формата.
+
+    Args:
+        report_format (str): формат отчета
+        tmp_dir (Path): каталог для данных и отчета
+
+    Returns:
+        tuple: (время импорта в мкс, время работы процесса в с, загруженные библиотеки форматов)
+    """
+    command = [sys.executable, '-X', 'importtime', 'main.py', '--path', str(tmp_dir / 'data'),
+               '--report', str(tmp_dir / f'report.{report_format}')]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd = SRC_DIR, capture_output = True, text = True, check = True)  # noqa: S603
+    wall = time.perf_counter() - start
+    import_us, backends = parse_importtime(result.stderr)
+    return import_us, wall, backends
+
+
+def main():
+    """Запуск бенчмарка и вывод результатов."""
+    parser = argparse.ArgumentParser(description = 'Бенчмарк времени запуска CLI')
+    parser.add_argument('--repeat', type=int, default=5, help='Количество запусков для каждого формата')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS),
+                        help='Форматы отчета')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        (tmp_dir / 'data').mkdir()
+        (tmp_dir / 'data' / 'file.txt').write_text('data')
+        print(f'{"формат":>8} {"импорт, мс":>12} {"процесс, мс":>12}  библиотеки')
+        for report_format in args.formats:
+            runs = [run_cli(report_format, tmp_dir) for _ in range(args.repeat)]
+            import_ms = statistics.median(run[0] for run in runs) / 1000
+            wall_ms = statistics.median(run[1] for run in runs) * 1000
+            backends = ', '.join(sorted(runs[-1][2])) or '-'
+            print(f'{report_format:>8} {import_ms:>12.1f} {wall_ms:>12.1f}  {backends}')
+
+
+if __name__ == '__main__':
+    main()
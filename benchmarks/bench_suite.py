@@ -0,0 +1,188 @@
+"""Набор бенчмарков сканирования и вывода отчетов.
+
+На синтетическом дереве (tree_generator.py) измеряется:
+    - scan: обход каталога вместе с чтением архивов;
+    - writer.<формат>: вывод заранее собранных записей одним Writer'ом;
+    - report.<формат>: ReportManager.make_report целиком для каждого ReportType.
+
+Результаты выводятся таблицей и сохраняются в JSON, чтобы сравнивать запуски
+и находить регрессии (--baseline - отношение к результатам прошлого запуска).
+
+Запуск из корня репозитория:
+    python benchmarks/bench_suite.py --repeat 3 --output bench_results.json
+    python benchmarks/bench_suite.py --repeat 3 --output new.json --baseline bench_results.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tree_generator import TreeSpec, generate_tree
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src' / 'python_homework_6'))
+
+from report_manager import ReportManager, writers  # noqa: E402
+from report_manager.report_manager import ReportType  # noqa: E402
+from report_manager.scanner import ArchiveInspector, DirScanner  # noqa: E402
+
+#Writer'ы и их параметры для каждого типа отчета
+WRITERS = {
+    ReportType.DOCX: ('DocxWriter', {}),
+    ReportType.XLSX: ('XlsxWriter', {}),
+    ReportType.PDF: ('PdfWriter', {}),
+    ReportType.CSV: ('CsvWriter', {}),
+    ReportType.JSON: ('JsonWriter', {}),
+    ReportType.NDJSON: ('JsonWriter', {'json_lines': True}),
+    ReportType.JSONL: ('JsonWriter', {'json_lines': True}),
+    ReportType.SNAPSHOT: ('SnapshotWriter', {}),
+}
+#Количество записей в пачке, передаваемой Writer'у
+BATCH_SIZE = 1000
+
+
+def collect_records(root, workers):
+    """Обход каталога с чтением архивов.
+
+    Args:
+        root (Path): путь к каталогу
+        workers (int): количество потоков
+
+    Returns:
+        list: записи ScanRecord в порядке вывода в отчет
+    """
+    records = []
+    for record, listing in ArchiveInspector(workers).attach(DirScanner(root, workers).scan()):
+        records.append(record)
+        if listing:
+            records.extend(archive_record for archive_record, _ in ArchiveInspector.iter_records(record, listing))
+    return records
+
+
+def write_records(report_type, records, report_path, root):
+    """Вывод записей одним Writer'ом.
+
+    Args:
+        report_type (ReportType): тип отчета
+        records (list): записи ScanRecord
+        report_path (Path): путь к файлу отчета
+        root (Path): путь к анализируемому каталогу
+    """
+    class_name, kwargs = WRITERS[report_type]
+    writer = getattr(writers, class_name)(report_path, root, **kwargs)
+    writer.create_file()
+    for start in range(0, len(records), BATCH_SIZE):
+        writer.write_batch(records[start:start + BATCH_SIZE])
+    writer.save_file()
+
+
+def measure(func, repeat):
+    """Многократный запуск функции с измерением времени.
+
+    Вывод функции в stdout подавляется.
+
+    Args:
+        func (Callable): функция без аргументов
+        repeat (int): количество запусков
+
+    Returns:
+        dict: медиана, минимум и время всех запусков (с)
+    """
+    runs = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - start)
+    return {'median': statistics.median(runs), 'min': min(runs), 'runs': runs}
+
+
+def run_suite(root, out_dir, report_types, repeat, workers):
+    """Запуск всех бенчмарков.
+
+    Args:
+        root (Path): путь к анализируемому каталогу
+        out_dir (Path): каталог для файлов отчетов
+        report_types (list): типы отчетов
+        repeat (int): количество запусков каждого бенчмарка
+        workers (int): количество потоков сканирования
+
+    Returns:
+        tuple: (результаты по именам бенчмарков, количество записей)
+    """
+    results = {'scan': measure(lambda: collect_records(root, workers), repeat)}
+    records = collect_records(root, workers)
+    for report_type in report_types:
+        report_path = out_dir / f'writer.{report_type.value}'
+        results[f'writer.{report_type.value}'] = measure(
+            lambda t = report_type, p = report_path: write_records(t, records, p, root), repeat)
+    for report_type in report_types:
+        report_path = out_dir / f'report.{report_type.value}'
+        results[f'report.{report_type.value}'] = measure(
+            lambda p = report_path: ReportManager(root, p, workers).make_report(), repeat)
+    return results, len(records)
+
+
+def main():
+    """Запуск бенчмарков, вывод и сохранение результатов."""
+    defaults = TreeSpec()
+    parser = argparse.ArgumentParser(description = 'Бенчмарки сканирования и вывода отчетов')
+    parser.add_argument('--tree', type=str, help='Существующий каталог вместо синтетического дерева')
+    for name, value in defaults.to_dict().items():
+        parser.add_argument(f'--{name.replace("_", "-")}', type=int, default=value,
+                            help=f'Параметр синтетического дерева (по умолчанию {value})')
+    parser.add_argument('--formats', nargs='+', choices=[t.value for t in WRITERS],
+                        default=[t.value for t in WRITERS], help='Форматы отчетов')
+    parser.add_argument('--repeat', type=int, default=3, help='Количество запусков каждого бенчмарка')
+    parser.add_argument('--workers', '-w', type=int, default=1, help='Количество потоков сканирования')
+    parser.add_argument('--output', '-o', type=str, default='bench_results.json',
+                        help='Путь к JSON файлу результатов')
+    parser.add_argument('--baseline', type=str, help='JSON файл результатов прошлого запуска для сравнения')
+    args = parser.parse_args()
+
+    spec = TreeSpec(**{name: getattr(args, name) for name in defaults.to_dict()})
+    report_types = [ReportType(value) for value in args.formats]
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        if args.tree:
+            root = Path(args.tree).resolve()
+            tree = {'path': str(root)}
+        else:
+            root = tmp_dir / 'tree'
+            tree = {'spec': spec.to_dict(), 'created': generate_tree(root, spec)}
+        out_dir = tmp_dir / 'reports'
+        out_dir.mkdir()
+        results, records = run_suite(root, out_dir, report_types, args.repeat, args.workers)
+    tree['records'] = records
+
+    baseline = {}
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding = 'utf-8'))['results']
+    for name, result in results.items():
+        line = f'{name:>14}: {result["median"]:8.3f} с (мин. {result["min"]:.3f} с)'
+        if name in baseline:
+            line += f' {result["median"] / baseline[name]["median"]:6.2f}x к базовому'
+        print(line)
+
+    output = {
+        'created': datetime.datetime.now().isoformat(timespec = 'seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'workers': args.workers,
+        'tree': tree,
+        'results': results,
+    }
+    Path(args.output).write_text(json.dumps(output, indent = 4, ensure_ascii = False), encoding = 'utf-8')
+    print(f'Результаты сохранены в {args.output}')
+
+
+if __name__ == '__main__':
+    main()
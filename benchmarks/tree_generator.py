@@ -0,0 +1,113 @@
+"""Генератор синтетического дерева каталогов для бенчмарков.
+
+Создает дерево заданной глубины и ширины с файлами в каждом каталоге, а также
+ZIP архивы с большим количеством файлов и глубокой вложенностью папок.
+Папки внутри архивов явно не записываются, чтобы проверять их восстановление.
+
+Запуск из корня репозитория:
+    python benchmarks/tree_generator.py ./bench_tree --depth 3 --fanout 4 --files 20
+"""
+
+import argparse
+import random
+import zipfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+@dataclass
+class TreeSpec:
+    """Параметры синтетического дерева."""
+
+    #Глубина вложенности каталогов
+    depth: int = 3
+    #Количество подкаталогов в каждом каталоге
+    fanout: int = 4
+    #Количество файлов в каждом каталоге
+    files: int = 20
+    #Максимальный размер файла (байт)
+    max_file_size: int = 4096
+    #Количество ZIP архивов в корне дерева
+    zips: int = 2
+    #Количество файлов в каждом архиве
+    zip_members: int = 5000
+    #Глубина вложенности папок внутри архива
+    zip_depth: int = 6
+    #Начальное значение генератора случайных чисел
+    seed: int = 0
+
+    def to_dict(self):
+        """Параметры дерева в виде словаря.
+
+        Returns:
+            dict: параметры дерева
+        """
+        return asdict(self)
+
+
+def generate_tree(root, spec):
+    """Создание синтетического дерева каталогов.
+
+    Args:
+        root (str | Path): путь к создаваемому каталогу (не должен существовать)
+        spec (TreeSpec): параметры дерева
+
+    Returns:
+        dict: количество созданных каталогов, файлов, архивов и файлов в архивах
+    """
+    root = Path(root)
+    rnd = random.Random(spec.seed)
+    counts = {'dirs': 0, 'files': 0, 'zips': 0, 'zip_members': 0}
+
+    root.mkdir(parents = True)
+    level = [root]
+    for depth in range(spec.depth + 1):
+        next_level = []
+        for dir_path in level:
+            for i in range(spec.files):
+                (dir_path / f'file_{i:05}.txt').write_bytes(b'x' * rnd.randint(0, spec.max_file_size))
+            counts['files'] += spec.files
+            if depth < spec.depth:
+                for i in range(spec.fanout):
+                    sub_dir = dir_path / f'dir_{i:03}'
+                    sub_dir.mkdir()
+                    next_level.append(sub_dir)
+                counts['dirs'] += spec.fanout
+        level = next_level
+
+    for i in range(spec.zips):
+        write_zip(root / f'archive_{i:03}.zip', spec, rnd)
+        counts['zips'] += 1
+        counts['zip_members'] += spec.zip_members
+    return counts
+
+
+def write_zip(zip_path, spec, rnd):
+    """Создание ZIP архива с глубоко вложенными файлами.
+
+    Args:
+        zip_path (Path): путь к архиву
+        spec (TreeSpec): параметры дерева
+        rnd (random.Random): генератор случайных чисел
+    """
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
+        for i in range(spec.zip_members):
+            #Путь из случайных папок глубиной до zip_depth
+            folders = [f'folder_{rnd.randrange(spec.fanout or 1)}' for _ in range(rnd.randint(0, spec.zip_depth))]
+            zipf.writestr('/'.join([*folders, f'member_{i:06}.txt']), b'x' * rnd.randint(0, 256))
+
+
+def main():
+    """Создание дерева по параметрам командной строки."""
+    defaults = TreeSpec()
+    parser = argparse.ArgumentParser(description = 'Генератор синтетического дерева каталогов')
+    parser.add_argument('root', type=str, help='Путь к создаваемому каталогу')
+    for name, value in defaults.to_dict().items():
+        parser.add_argument(f'--{name.replace("_", "-")}', type=int, default=value)
+    args = vars(parser.parse_args())
+    root = args.pop('root')
+    print(generate_tree(root, TreeSpec(**args)))
+
+
+if __name__ == '__main__':
+    main()
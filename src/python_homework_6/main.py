@@ -1,21 +1,172 @@
 """ДЗ №6. Работа с файлами и контекстными менеджерами."""
 
 import argparse
+import datetime
+import json
+import sys
+from contextlib import suppress
+from pathlib import Path
 
 from report_manager import ReportManager
 
 #Агрументы командной строки
 parser = argparse.ArgumentParser(description = 'Анализатор каталогов')
 parser.add_argument('--path', '-p', type=str,default='.', help='Путь к анализируемому каталогу')
-parser.add_argument('--report', '-r', type=str,default='./report.pdf', help='Путь к файлу отчета')
+parser.add_argument('--report', '-r', type=str, nargs='+', action='extend',
+                    help='Пути к файлам отчета (по умолчанию ./report.pdf)')
+parser.add_argument('--workers', '-w', type=int, default=1, help='Количество потоков для чтения каталогов')
+parser.add_argument('--background', '-b', choices=['thread', 'process'],
+                    help="Выполнение медленных Writer'ов (PDF, DOCX) в отдельных потоках/процессах")
+parser.add_argument('--batch-size', type=int, default=1000,
+                    help="Количество записей в одной пачке, передаваемой Writer'ам")
+parser.add_argument('--pipeline', action='store_true',
+                    help='Обходить каталог в отдельном потоке параллельно с выводом отчета')
+parser.add_argument('--index', '-i', type=str,
+                    help='Путь к файлу индекса для повторного использования неизмененных каталогов')
+parser.add_argument('--exclude', '-x', type=str, nargs='+', action='extend',
+                    help='Шаблоны исключаемых файлов/папок (например node_modules .git "*.pyc")')
+parser.add_argument('--include', type=str, nargs='+', action='extend',
+                    help='Шаблоны файлов, которые выводятся в отчет')
+parser.add_argument('--max-depth', type=int, help='Максимальная глубина вложенности (0 - только содержимое каталога)')
+parser.add_argument('--min-size', type=int, help='Минимальный размер выводимых файлов в байтах')
+parser.add_argument('--modified-since', type=datetime.datetime.fromisoformat,
+                    help='Выводить только файлы, измененные после указанной даты (ГГГГ-ММ-ДД[ ЧЧ:ММ])')
+parser.add_argument('--links', choices=['follow', 'skip', 'report'], default='report',
+                    help='Символические ссылки: обходить, не выводить или выводить без обхода (по умолчанию)')
+parser.add_argument('--one-file-system', action='store_true',
+                    help='Не обходить каталоги других файловых систем (точки монтирования)')
+parser.add_argument('--nested-archive-size', type=int, default=16 * 1024 * 1024,
+                    help='Максимальный размер вложенного архива, читаемого в память (байт)')
+parser.add_argument('--archive-nesting', type=int, default=3,
+                    help='Максимальная глубина вложенности архивов в архивах (0 - не читать вложенные)')
+parser.add_argument('--archive-timeout', type=float, default=60.0,
+                    help='Предельное время чтения одного архива (с), затем выводятся прочитанные записи')
+parser.add_argument('--dir-sizes', action='store_true',
+                    help='Вывод суммарного размера и количества файлов папок и ZIP архивов')
+parser.add_argument('--snapshot', '-s', type=str,
+                    help='Формирование отчетов из снимка сканирования (.snap) без обхода каталога')
+parser.add_argument('--diff', '-d', type=str, metavar='BASELINE',
+                    help='Вывод только изменений относительно снимка сканирования или каталога BASELINE')
+parser.add_argument('--duplicates', action='store_true',
+                    help='Вывод дополнительного раздела с группами файлов-дубликатов')
+parser.add_argument('--summary', action='store_true',
+                    help='Вывод сводки: крупнейшие файлы и папки, самые старые файлы, распределения по расширениям')
+parser.add_argument('--summary-top', type=int, default=10,
+                    help='Количество записей в списках сводки')
+parser.add_argument('--batch', type=str, metavar='MANIFEST',
+                    help='Пакетное формирование отчетов по файлу заданий (JSON массив {"path", "report", ...})')
+parser.add_argument('--jobs', '-j', type=int,
+                    help='Количество процессов для пакетного режима (по умолчанию - количество ядер)')
+parser.add_argument('--timeout', type=float, help='Предельное время одного задания пакета (с)')
+parser.add_argument('--watch', action='store_true',
+                    help='Обновление отчетов при изменениях каталога (inotify или периодическая проверка) до Ctrl+C')
+parser.add_argument('--watch-interval', type=float, default=2.0,
+                    help='Период проверки изменений в режиме наблюдения, если inotify недоступен (с)')
+parser.add_argument('--debounce', type=float, default=0.5,
+                    help='Время без изменений перед обновлением отчетов в режиме наблюдения (с)')
+parser.add_argument('--stats', nargs='?', const='-', metavar='PATH',
+                    help='Вывод статистики формирования отчета в JSON (в stdout или в файл PATH)')
+parser.add_argument('--progress', action='store_true', help='Вывод прогресса обхода каталога в stderr')
 arg_val = parser.parse_args()
 
+
+def print_progress(entries, entries_per_second):
+    """Вывод прогресса обхода каталога в stderr.
+
+    Args:
+        entries (int): количество обработанных записей
+        entries_per_second (float): средняя скорость обработки записей
+    """
+    print(f'Обработано записей: {entries} ({entries_per_second:.0f} в секунду)', file = sys.stderr)
+
+
+def output_stats(report_manager):
+    """Вывод статистики формирования отчета (в stdout или в файл статистики).
+
+    Args:
+        report_manager (ReportManager): объект, сформировавший отчет
+    """
+    if arg_val.stats is None:
+        return
+    stats_json = json.dumps(report_manager.stats.to_dict(), indent = 4, ensure_ascii = False)
+    if arg_val.stats == '-':
+        print(stats_json)
+    else:
+        Path(arg_val.stats).write_text(stats_json, encoding = 'utf-8')
+
+
 try:
-    #Инициализация объекта для работы со структурой каталога
-    file_sys_rep = ReportManager(arg_val.path, arg_val.report)
+    #Параметры формирования отчета
+    report_kwargs = {
+        'workers': arg_val.workers,
+        'background': arg_val.background,
+        'index': arg_val.index,
+        'batch_size': arg_val.batch_size,
+        'pipeline': arg_val.pipeline,
+        'stats': arg_val.stats is not None,
+        'progress': print_progress if arg_val.progress else None,
+        'exclude': arg_val.exclude,
+        'include': arg_val.include,
+        'max_depth': arg_val.max_depth,
+        'min_size': arg_val.min_size,
+        'modified_since': arg_val.modified_since,
+        'dir_sizes': arg_val.dir_sizes,
+        'links': arg_val.links,
+        'one_file_system': arg_val.one_file_system,
+        'nested_archive_size': arg_val.nested_archive_size,
+        'archive_nesting': arg_val.archive_nesting,
+        'archive_timeout': arg_val.archive_timeout,
+        'baseline': arg_val.diff,
+        'duplicates': arg_val.duplicates,
+        'summary': arg_val.summary,
+        'summary_top': arg_val.summary_top,
+    }
+    if arg_val.batch is not None:
+        #Пакетное формирование отчетов, прогресс выводится только для одного каталога
+        report_kwargs.pop('progress')
+        #BatchRunner импортируется только для пакетного формирования отчетов
+        from report_manager import BatchRunner
+        batch_runner = BatchRunner.from_manifest(arg_val.batch, processes = arg_val.jobs,
+                                                 timeout = arg_val.timeout, **report_kwargs)
+        summary = batch_runner.run()
+        #Вывод сводки (в stdout или в файл статистики)
+        summary_json = json.dumps(summary, indent = 4, ensure_ascii = False, default = str)
+        if arg_val.stats is None or arg_val.stats == '-':
+            print(summary_json)
+        else:
+            Path(arg_val.stats).write_text(summary_json, encoding = 'utf-8')
+        if summary['statuses'].get('ok', 0) != summary['jobs']:
+            sys.exit(1)
+    else:
+        reports = arg_val.report or ['./report.pdf']
+        #Инициализация объекта для работы со структурой каталога или снимком сканирования
+        if arg_val.snapshot is not None:
+            file_sys_rep = ReportManager.from_snapshot(arg_val.snapshot, reports, **report_kwargs)
+        else:
+            file_sys_rep = ReportManager(arg_val.path, reports, **report_kwargs)
+
+        if arg_val.watch:
+            def report_updated(changed):
+                """Сообщение об обновлении отчетов и вывод статистики.
+
+                Args:
+                    changed (set): пути измененных каталогов и архивов
+                """
+                if changed:
+                    print(f'Отчеты обновлены, изменено каталогов и архивов: {len(changed)}', file = sys.stderr)
+                else:
+                    print('Отчеты сформированы, ожидание изменений (Ctrl+C - выход)', file = sys.stderr)
+                output_stats(file_sys_rep)
 
-    #Создание отчета о структуре файлов и папок
-    file_sys_rep.make_report()
+            #Обновление отчетов при изменениях каталога до прерывания
+            ignore = [arg_val.stats] if arg_val.stats not in (None, '-') else []
+            with suppress(KeyboardInterrupt):
+                file_sys_rep.watch(arg_val.debounce, arg_val.watch_interval, report_updated, ignore = ignore)
+        else:
+            #Создание отчета о структуре файлов и папок
+            file_sys_rep.make_report()
+            #Вывод статистики
+            output_stats(file_sys_rep)
 except ValueError as e:
     print(e)
 except FileNotFoundError as e:
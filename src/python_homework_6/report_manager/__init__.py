@@ -1,4 +1,29 @@
+from . import writers
+from .base import ReportStats
 from .report_manager import ReportManager
-from .writers import CsvWriter, DocxWriter, JsonWriter, PdfWriter, XlsxWriter
+from .scanner import (
+    ChangeType,
+    DirScanner,
+    LinkPolicy,
+    ScanDiff,
+    ScanFilter,
+    ScanIndex,
+    ScanRecord,
+    ScanSnapshot,
+)
 
-__all__ = ['DocxWriter', 'XlsxWriter', 'PdfWriter', 'JsonWriter', 'CsvWriter', 'ReportManager']
\ No newline at end of file
+
+def __getattr__(name):
+    #Writer'ы загружаются лениво из пакета writers
+    if name in writers.__all__:
+        return getattr(writers, name)
+    #BatchRunner загружается только для пакетного формирования отчетов
+    if name == 'BatchRunner':
+        from .batch_runner import BatchRunner
+        return BatchRunner
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+__all__ = ['DocxWriter', 'XlsxWriter', 'PdfWriter', 'JsonWriter', 'CsvWriter', 'SnapshotWriter',
+           'ReportManager', 'DirScanner', 'ReportStats', 'ScanFilter', 'ScanIndex', 'ScanRecord',
+           'ScanSnapshot', 'ScanDiff', 'ChangeType', 'BatchRunner', 'LinkPolicy']
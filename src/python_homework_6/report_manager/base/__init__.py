@@ -1,3 +1,8 @@
+from .background_writer import BackgroundWriter
 from .base_writer import BaseWriter
+from .report_section import ReportSection
+from .report_stats import ReportStats
+from .report_summary import ReportSummary
+from .rollup_writer import RollupWriter
 
-__all__ = ['BaseWriter']
\ No newline at end of file
+__all__ = ['BaseWriter', 'BackgroundWriter', 'ReportSection', 'ReportStats', 'ReportSummary', 'RollupWriter']
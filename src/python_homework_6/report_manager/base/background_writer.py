@@ -0,0 +1,250 @@
+"""Модуль с Writer'ом, выполняющим другой Writer в отдельном потоке или процессе.
+
+Содержит класс BackgroundWriter
+"""
+
+import queue
+import threading
+
+from .base_writer import BaseWriter
+from .report_section import ReportSection
+from .report_summary import ReportSummary
+
+
+def _run_writer(writer_factory, report_path, dir_path, writer_kwargs, rows_queue, result_queue):
+    """Создание Writer'а и вывод в него всех записей из очереди.
+
+    При ошибке оставшиеся записи вычитываются из очереди, чтобы не блокировать
+    сторону, которая их отправляет. Результат (None или исключение) передается
+    через result_queue.
+
+    Args:
+        writer_factory (type): класс Writer'а или фабрика, создающая Writer
+        report_path (Path): путь для создания файла отчета
+        dir_path (Path): путь анализируемого каталога
+        writer_kwargs (dict): дополнительные параметры Writer'а
+        rows_queue (Queue): очередь пачек записей, разделов и сводки отчета, None - конец данных, False - отмена
+        result_queue (Queue): очередь для передачи результата
+    """
+    result = None
+    writer = None
+    try:
+        writer = writer_factory(report_path, dir_path, **writer_kwargs)
+        writer.create_file()
+        while isinstance(chunk := rows_queue.get(), list | ReportSection | ReportSummary):
+            if isinstance(chunk, list):
+                writer.write_batch(chunk)
+            elif isinstance(chunk, ReportSummary):
+                writer.write_summary(chunk)
+            else:
+                writer.write_section(chunk)
+        if chunk is None:
+            writer.save_file()
+        else:
+            writer.close()
+    except Exception as err:
+        result = err
+        if writer is not None:
+            writer.close()
+        while isinstance(rows_queue.get(), list | ReportSection | ReportSummary):
+            pass
+    result_queue.put(result)
+
+
+def _run_writer_process(*args):
+    """Запуск _run_writer в дочернем процессе с проверкой сериализуемости ошибки.
+
+    Args:
+        *args: аргументы _run_writer
+    """
+    result_queue = args[-1]
+    local_result = queue.Queue()
+    _run_writer(*args[:-1], local_result)
+    result = local_result.get()
+    if result is not None:
+        #pickle импортируется только в дочернем процессе
+        import pickle
+        try:
+            pickle.dumps(result)
+        except Exception:
+            result = RuntimeError(f'{type(result).__name__}: {result}')
+    result_queue.put(result)
+
+
+class BackgroundWriter(BaseWriter):
+    """Writer-обертка для вывода отчета в отдельном потоке или процессе.
+
+    Записи передаются исполняющему Writer'у пачками через ограниченную очередь,
+    поэтому медленный Writer (PDF, DOCX) не задерживает обход каталога дольше,
+    чем нужно для заполнения очереди.
+    """
+
+    #Количество записей в одной пачке
+    CHUNK_ROWS = 500
+    #Максимальное количество пачек в очереди
+    QUEUE_CHUNKS = 64
+    #Допустимые режимы выполнения
+    MODES = ('thread', 'process')
+    #Период проверки, работает ли поток/процесс, при ожидании очередей (с)
+    WAIT_STEP = 0.5
+
+    def __init__(self, writer_factory, report_path, dir_path, mode = 'thread', **writer_kwargs):
+        """Инициализация обертки.
+
+        Args:
+            writer_factory (type): класс Writer'а или фабрика, создающая Writer
+            report_path (Path): путь для создания файла отчета
+            dir_path (Path): путь анализируемого каталога
+            mode (str): режим выполнения - 'thread' или 'process'
+            **writer_kwargs: дополнительные параметры Writer'а
+
+        Raises:
+            ValueError: недопустимый режим выполнения
+        """
+        super().__init__(report_path, dir_path)
+        if mode not in type(self).MODES:
+            raise ValueError(f"Недопустимый режим выполнения Writer'а {mode}")
+        self._writer_factory = writer_factory
+        self._writer_kwargs = writer_kwargs
+        self._mode = mode
+        self._chunk = []
+        self._rows_queue = None
+        self._result_queue = None
+        self._worker = None
+
+    def create_file(self):
+        """Запуск потока/процесса, который создает файл отчета."""
+        args = (self._writer_factory, self._report_path, self._dir_path, self._writer_kwargs)
+        if self._mode == 'thread':
+            self._rows_queue = queue.Queue(type(self).QUEUE_CHUNKS)
+            self._result_queue = queue.Queue()
+            self._worker = threading.Thread(target = _run_writer, daemon = True,
+                                            args = (*args, self._rows_queue, self._result_queue))
+        else:
+            #multiprocessing импортируется только при выполнении Writer'а в отдельном процессе
+            import multiprocessing
+            self._rows_queue = multiprocessing.Queue(type(self).QUEUE_CHUNKS)
+            self._result_queue = multiprocessing.Queue()
+            self._worker = multiprocessing.Process(target = _run_writer_process, daemon = True,
+                                                   args = (*args, self._rows_queue, self._result_queue))
+        self._worker.start()
+
+    def write_to_file(self, record):
+        """Добавление информации о файле/папке в текущую пачку записей.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+        """
+        self._chunk.append(record)
+        if len(self._chunk) >= type(self).CHUNK_ROWS:
+            self._put(self._chunk)
+            self._chunk = []
+
+    def write_batch(self, records):
+        """Передача пачки записей в очередь.
+
+        Args:
+            records (list): записи ScanRecord о файлах/папках
+        """
+        self._chunk.extend(records)
+        if len(self._chunk) >= type(self).CHUNK_ROWS:
+            self._put(self._chunk)
+            self._chunk = []
+
+    def write_section(self, section):
+        """Передача оставшихся записей и раздела отчета в очередь.
+
+        Args:
+            section (ReportSection): раздел отчета
+        """
+        if self._chunk:
+            self._put(self._chunk)
+            self._chunk = []
+        self._put(section)
+
+    def write_summary(self, summary):
+        """Передача оставшихся записей и сводки отчета в очередь.
+
+        Args:
+            summary (ReportSummary): сводка отчета
+        """
+        if self._chunk:
+            self._put(self._chunk)
+            self._chunk = []
+        self._put(summary)
+
+    def save_file(self):
+        """Передача оставшихся записей, ожидание сохранения файла отчета.
+
+        Raises:
+            Exception: ошибка, возникшая в исполняющем Writer'е
+            RuntimeError: поток/процесс завершился, не сохранив отчет
+        """
+        if self._chunk:
+            self._put(self._chunk)
+            self._chunk = []
+        self._put(None)
+        result = self._get_result()
+        self._worker.join()
+        if result is not None:
+            raise result
+
+    def close(self):
+        """Отмена вывода отчета и ожидание завершения потока/процесса."""
+        if self._worker is None or not self._worker.is_alive():
+            return
+        self._chunk = []
+        try:
+            self._put(False)
+            self._get_result()
+        except RuntimeError:
+            #Поток/процесс уже завершился, отменять нечего
+            pass
+        self._worker.join()
+
+    def _put(self, item):
+        """Передача элемента в очередь с проверкой, что поток/процесс еще работает.
+
+        Args:
+            item: пачка записей, раздел или сводка отчета, None - конец данных, False - отмена
+
+        Raises:
+            RuntimeError: поток/процесс завершился, не дочитав очередь
+        """
+        while True:
+            try:
+                self._rows_queue.put(item, timeout = type(self).WAIT_STEP)
+                return
+            except queue.Full:
+                if not self._worker.is_alive():
+                    self._worker_failed()
+
+    def _get_result(self):
+        """Ожидание результата с проверкой, что поток/процесс еще работает.
+
+        Returns:
+            Exception | None: ошибка, возникшая в исполняющем Writer'е
+
+        Raises:
+            RuntimeError: поток/процесс завершился, не передав результат
+        """
+        while True:
+            #Результат, переданный непосредственно перед завершением, должен успеть прийти
+            alive = self._worker.is_alive()
+            try:
+                return self._result_queue.get(timeout = type(self).WAIT_STEP)
+            except queue.Empty:
+                if not alive:
+                    self._worker_failed()
+
+    def _worker_failed(self):
+        """Обработка аварийного завершения потока/процесса (например, процесс был убит).
+
+        Raises:
+            RuntimeError: поток/процесс завершился, не сохранив отчет
+        """
+        if self._mode == 'process':
+            #Непереданные данные очереди не должны задерживать завершение интерпретатора
+            self._rows_queue.cancel_join_thread()
+            raise RuntimeError(f"Процесс Writer'а завершился, не сохранив отчет (код завершения {self._worker.exitcode})")
+        raise RuntimeError("Поток Writer'а завершился, не сохранив отчет")
@@ -1,5 +1,6 @@
 """Моудль с базовым классом для создания Writer'ов."""
 
+import gzip
 from abc import abstractmethod
 
 
@@ -9,6 +10,12 @@ class BaseWriter:
     Они предоставляют методы для создания/заполнения/сохранения файла отчета.
     """
 
+    #Уровень сжатия gzip для сжимаемых отчетов
+    GZIP_LEVEL = 6
+    #Writer сам откладывает вывод папок до вычисления их итогов (ScanRecord.totals),
+    #иначе записи задерживаются оберткой RollupWriter
+    DEFERS_TOTALS = False
+
     def __init__(self, report_path, dir_path):
         """Инициализация путей для анализируемого каталога и для сохранения отчета.
 
@@ -19,23 +26,77 @@ class BaseWriter:
         self._report_path = report_path
         self._dir_path = dir_path
 
+    def _open_text_file(self, compress = False):
+        """Открытие текстового файла отчета для потоковой записи.
+
+        Args:
+            compress (bool): сжимать ли поток вывода в gzip
+
+        Returns:
+            TextIO: открытый на запись файл отчета
+        """
+        if compress:
+            return gzip.open(self._report_path, 'wt', encoding = 'utf-8',
+                             compresslevel = type(self).GZIP_LEVEL)
+        return open(self._report_path, 'w', encoding = 'utf-8')  # noqa: PTH123, SIM115
+
     @abstractmethod
     def create_file(self):
         """Создание файла отчета."""
         ...
 
     @abstractmethod
-    def write_to_file(self, name:str, size:str, last_changed:str):
+    def write_to_file(self, record):
         """Вывод информации о файле/папке в файл отчета.
 
         Args:
-            name (str): имя файла/папки
-            size (str): размера файла в читаемом формате
-            last_changed (str): дата последнего изменения в читаемом формате
+            record (ScanRecord): запись о файле/папке с необработанными значениями,
+                преобразование в читаемый формат выполняет Writer (см. base.formatters)
         """
         ...
 
+    def write_batch(self, records):
+        """Вывод информации о нескольких файлах/папках в файл отчета.
+
+        Реализация по умолчанию вызывает write_to_file для каждой записи,
+        Writer'ы переопределяют метод для пакетного вывода.
+
+        Args:
+            records (list): записи ScanRecord о файлах/папках
+        """
+        for record in records:
+            self.write_to_file(record)
+
+    def write_section(self, section):
+        """Вывод дополнительного раздела отчета после всех записей о файлах/папках.
+
+        По умолчанию раздел не выводится, Writer'ы с поддержкой разделов
+        переопределяют метод.
+
+        Args:
+            section (ReportSection): раздел отчета
+        """
+
+    def write_summary(self, summary):
+        """Вывод сводки отчета после всех записей о файлах/папках.
+
+        По умолчанию разделы сводки выводятся как обычные разделы отчета,
+        Writer'ы, выводящие сводку иначе, переопределяют метод.
+
+        Args:
+            summary (ReportSummary): сводка отчета
+        """
+        for section in summary.sections:
+            self.write_section(section)
+
     @abstractmethod
     def save_file(self):
         """Сохранение файла отчета."""
-        ...
\ No newline at end of file
+        ...
+
+    def close(self):
+        """Закрытие файла отчета без сохранения при ошибке.
+
+        Может вызываться повторно и после save_file(). По умолчанию ничего не делает,
+        Writer'ы с открытыми файлами переопределяют метод.
+        """
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Модуль с функциями преобразования значений записей в читаемый формат.
+
+Результаты кэшируются, поэтому одинаковые значения (например, размеры мелких
+файлов или время изменения скопированных вместе файлов) форматируются один раз.
+"""
+
+import datetime
+from functools import lru_cache
+
+#Размер кэша для каждой функции форматирования
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize = CACHE_SIZE)
+def readable_size(size_bytes):
+    """Преобразование размера файла в читаемый формат.
+
+    Args:
+        size_bytes (int): количество байт
+
+    Returns:
+        str: размер файла в читаемом формате
+    """
+    for unit in ['Б', 'КБ', 'МБ']:
+        if size_bytes < 1024:
+            return f'{size_bytes:.2f}{unit}'
+        size_bytes /= 1024
+    return f'{size_bytes:.2f}ГБ'
+
+
+@lru_cache(maxsize = CACHE_SIZE)
+def mtime_datetime(mtime):
+    """Преобразование времени изменения в datetime.
+
+    Args:
+        mtime (int | None): время изменения в секундах
+
+    Returns:
+        datetime | str: дата последнего изменения, '' - если время неизвестно
+    """
+    return datetime.datetime.fromtimestamp(mtime) if mtime is not None else ''
+
+
+@lru_cache(maxsize = CACHE_SIZE)
+def readable_mtime(mtime):
+    """Преобразование времени изменения в читаемый формат.
+
+    Args:
+        mtime (int | None): время изменения в секундах
+
+    Returns:
+        str: дата последнего изменения в читаемом формате
+    """
+    return str(mtime_datetime(mtime))
+
+
+def format_size(record):
+    """Размер файла записи в читаемом формате.
+
+    Если для записи вычислены итоги, то для папки выводится ее суммарный размер
+    и количество файлов, а для архива - те же значения для его содержимого.
+    Для записей-ссылок вместо итогов выводится путь, на который указывает ссылка.
+
+    Args:
+        record (ScanRecord): запись о файле/папке
+
+    Returns:
+        str: размер файла или 'ПАПКА' для папок
+    """
+    if record.link is not None:
+        return f"{'ПАПКА' if record.is_dir else readable_size(record.size)} (ссылка на {record.link})"
+    totals = record.totals
+    if totals is None:
+        return 'ПАПКА' if record.is_dir else readable_size(record.size)
+    if record.is_dir:
+        return f'ПАПКА ({readable_size(totals[0])}, файлов: {totals[1]})'
+    return f'{readable_size(record.size)} (в архиве {readable_size(totals[0])}, файлов: {totals[1]})'
+
+
+def readable_change(record):
+    """Тип изменения записи в отчете об изменениях.
+
+    Args:
+        record (ScanRecord): запись о файле/папке
+
+    Returns:
+        str: текст изменения, '' - для папок пути изменения
+    """
+    return record.change.value if record.change is not None else ''
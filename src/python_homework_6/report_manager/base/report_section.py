@@ -0,0 +1,63 @@
+"""Модуль с дополнительным разделом отчета.
+
+Содержит класс ReportSection
+"""
+
+from .formatters import readable_mtime, readable_size
+
+
+class ReportSection:
+    """Дополнительный раздел отчета (таблица), выводимый после записей о файлах/папках.
+
+    Writer'ы выводят раздел в своем формате: отдельным листом XLSX, заголовком
+    и таблицей DOCX, страницами PDF, блоком строк CSV, полем объекта JSON.
+
+    Строки раздела хранят необработанные значения (размеры в байтах, время изменения
+    в секундах), как и записи ScanRecord. В читаемый формат их преобразует Writer
+    по типам столбцов (formatted_rows), поэтому в JSON, CSV и XLSX выводятся числа.
+    """
+
+    __slots__ = ('name', 'title', 'columns', 'keys', 'rows', 'types')
+
+    #Типы значений столбцов
+    SIZE = 'size'
+    MTIME = 'mtime'
+
+    def __init__(self, name, title, columns, keys, rows, types = None):
+        """Инициализация раздела.
+
+        Args:
+            name (str): имя раздела (поле JSON)
+            title (str): заголовок раздела
+            columns (tuple): заголовки столбцов
+            keys (tuple): имена полей JSON для столбцов
+            rows (list): строки раздела - кортежи значений столбцов
+            types (tuple | None): типы значений столбцов - SIZE (размер в байтах), MTIME (время
+                изменения в секундах) или None (значение выводится как есть), None - все
+                значения выводятся как есть
+        """
+        self.name = name
+        self.title = title
+        self.columns = columns
+        self.keys = keys
+        self.rows = rows
+        self.types = types
+
+    def formatted_rows(self, size = readable_size, mtime = readable_mtime):
+        """Получение строк раздела с преобразованием значений по типам столбцов.
+
+        Args:
+            size (Callable | None): преобразование размеров, None - размер выводится числом байт
+            mtime (Callable | None): преобразование времени изменения, None - время выводится
+                числом секунд
+
+        Returns:
+            list: строки раздела - кортежи значений столбцов
+        """
+        if self.types is None:
+            return self.rows
+        formats = [{type(self).SIZE: size, type(self).MTIME: mtime}.get(value_type) for value_type in self.types]
+        if not any(formats):
+            return self.rows
+        return [tuple(value if value_format is None else value_format(value)
+                      for value, value_format in zip(row, formats, strict = True)) for row in self.rows]
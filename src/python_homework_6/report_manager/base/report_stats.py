@@ -0,0 +1,152 @@
+"""Модуль со статистикой формирования отчета.
+
+Содержит класс ReportStats
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ReportStats:
+    """Класс для сбора статистики формирования отчета.
+
+    Собирает время этапов (обход каталога, чтение архивов, вывод и сохранение
+    каждого отчета), счетчики (записи, вызовы scandir/stat, архивы, байты) и
+    пиковый расход памяти по данным tracemalloc. Может периодически вызывать
+    функцию отображения прогресса.
+
+    Время этапа суммируется по всем вызовам. Процессорное время этапа - время
+    потока, в котором этап выполнялся (time.thread_time), поэтому работа пула
+    потоков сканера в этап 'scan' основного потока не входит, а учитывается
+    в общем процессорном времени. Методы можно вызывать из разных потоков.
+    """
+
+    #Минимальный интервал между вызовами функции прогресса (с)
+    PROGRESS_INTERVAL = 1.0
+
+    def __init__(self, progress = None, trace_memory = False):
+        """Инициализация статистики.
+
+        Args:
+            progress (Callable | None): функция прогресса progress(entries, entries_per_second),
+                вызывается не чаще PROGRESS_INTERVAL из потока обхода каталога
+            trace_memory (bool): измерять ли пиковый расход памяти через tracemalloc
+        """
+        self._progress = progress
+        self._trace_memory = trace_memory
+        self._lock = threading.Lock()
+        #Время этапов: имя -> [время, процессорное время, количество вызовов]
+        self._phases = {}
+        self._counters = {}
+        self._tracing = False
+        self._started = None
+        self._cpu_started = None
+        self._last_progress = None
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.peak_memory = None
+
+    def start(self):
+        """Начало измерений."""
+        if self._trace_memory:
+            #tracemalloc импортируется только при измерении расхода памяти
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+        self._started = self._last_progress = time.perf_counter()
+        self._cpu_started = time.process_time()
+
+    def stop(self):
+        """Окончание измерений и последний вызов функции прогресса."""
+        self.wall_time = time.perf_counter() - self._started
+        self.cpu_time = time.process_time() - self._cpu_started
+        if self._tracing:
+            import tracemalloc
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self._tracing = False
+        if self._progress is not None:
+            self._progress(self.counter('entries'), self.entries_per_second)
+
+    @contextmanager
+    def phase(self, name):
+        """Контекстный менеджер для измерения времени этапа.
+
+        Args:
+            name (str): имя этапа
+        """
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            with self._lock:
+                totals = self._phases.setdefault(name, [0.0, 0.0, 0])
+                totals[0] += wall
+                totals[1] += cpu
+                totals[2] += 1
+
+    def add(self, **counters):
+        """Увеличение счетчиков.
+
+        Args:
+            **counters: имена счетчиков и величины увеличения
+        """
+        with self._lock:
+            for name, value in counters.items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def counter(self, name):
+        """Получение значения счетчика.
+
+        Args:
+            name (str): имя счетчика
+
+        Returns:
+            int: значение счетчика
+        """
+        return self._counters.get(name, 0)
+
+    def count_batch(self, batch):
+        """Учет пачки записей, переданной Writer'ам, и вызов функции прогресса.
+
+        Args:
+            batch (list): пачка записей ScanRecord
+        """
+        sizes = [record.size for record in batch if not record.is_dir]
+        self.add(entries = len(batch), files = len(sizes), dirs = len(batch) - len(sizes),
+                 bytes = sum(sizes), batches = 1)
+        if self._progress is not None:
+            now = time.perf_counter()
+            if now - self._last_progress >= type(self).PROGRESS_INTERVAL:
+                self._last_progress = now
+                self._progress(self.counter('entries'), self.entries_per_second)
+
+    @property
+    def entries_per_second(self):
+        """Средняя скорость обработки записей с начала измерений."""
+        elapsed = self.wall_time or time.perf_counter() - self._started
+        return self.counter('entries') / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self):
+        """Статистика в виде словаря для вывода в JSON.
+
+        Returns:
+            dict: общее время, пиковая память, скорость, время этапов и счетчики
+        """
+        with self._lock:
+            phases = {name: {'wall_time': wall, 'cpu_time': cpu, 'calls': calls}
+                      for name, (wall, cpu, calls) in self._phases.items()}
+            counters = dict(self._counters)
+        return {
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'peak_memory': self.peak_memory,
+            'entries_per_second': self.entries_per_second,
+            'phases': phases,
+            'counters': counters,
+        }
@@ -0,0 +1,27 @@
+"""Модуль со сводкой отчета.
+
+Содержит класс ReportSummary
+"""
+
+
+class ReportSummary:
+    """Сводка отчета - набор разделов (ReportSection), выводимый как одно целое.
+
+    Writer'ы выводят сводку в своем формате: в начале документа DOCX, на отдельных
+    страницах после структуры каталога PDF, отдельным листом XLSX, объектом верхнего уровня JSON. По умолчанию
+    разделы сводки выводятся как обычные разделы отчета.
+    """
+
+    __slots__ = ('name', 'title', 'sections')
+
+    def __init__(self, name, title, sections):
+        """Инициализация сводки.
+
+        Args:
+            name (str): имя сводки (поле JSON)
+            title (str): заголовок сводки
+            sections (list): разделы сводки ReportSection
+        """
+        self.name = name
+        self.title = title
+        self.sections = sections
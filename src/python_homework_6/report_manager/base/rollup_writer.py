@@ -0,0 +1,161 @@
+"""Модуль с Writer'ом, задерживающим записи до вычисления итогов папок.
+
+Содержит класс RollupWriter
+"""
+
+from collections import deque
+
+from .base_writer import BaseWriter
+
+
+class RollupWriter(BaseWriter):
+    """Writer-обертка для последовательных форматов при расчете итогов папок.
+
+    Строка папки выводится раньше ее содержимого, а итоги папки известны только
+    после обхода всего содержимого. Поэтому записи, начиная с первой папки, итоги
+    которой еще вычисляются (ScanRecord.totals - список), задерживаются и передаются
+    исполняющему Writer'у, как только итоги становятся известны.
+
+    Задерживается все содержимое открытой папки верхнего уровня, поэтому в памяти
+    хранится не больше HOLD_ROWS записей, а остальные выгружаются во временный файл.
+    Writer'ы, которые сами откладывают вывод папок (BaseWriter.DEFERS_TOTALS),
+    в обертку не помещаются.
+    """
+
+    #Максимальное количество задержанных записей в памяти
+    HOLD_ROWS = 50000
+
+    def __init__(self, writer):
+        """Инициализация обертки.
+
+        Args:
+            writer (BaseWriter): исполняющий Writer
+        """
+        super().__init__(writer._report_path, writer._dir_path)
+        self._writer = writer
+        #Задержанные записи в памяти
+        self._held = deque()
+        #Временный файл с выгруженными задержанными записями (пачки записей pickle)
+        self._spill = None
+        #Папки, выгруженные до вычисления итогов, - в файле вместо них их номера
+        self._spilled_open = []
+
+    def create_file(self):
+        """Создание файла отчета исполняющим Writer'ом."""
+        self._writer.create_file()
+
+    def write_to_file(self, record):
+        """Вывод записи или ее задержка до вычисления итогов папок.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+        """
+        self.write_batch([record])
+
+    def write_batch(self, records):
+        """Вывод готовых записей пачки и задержка остальных.
+
+        Args:
+            records (list): записи ScanRecord о файлах/папках
+        """
+        held = self._held
+        if not held and self._spill is None:
+            #Поиск первой папки, итоги которой еще не известны
+            for i, record in enumerate(records):
+                if type(record.totals) is list:
+                    held.extend(records[i:])
+                    records = records[:i]
+                    break
+            if records:
+                self._writer.write_batch(records)
+            return
+
+        held.extend(records)
+        #Первая задержанная папка - папка верхнего уровня. Пока она открыта, ничего не выводится
+        first = self._spilled_open[0] if self._spill is not None else held[0]
+        if type(first.totals) is list:
+            if len(held) > type(self).HOLD_ROWS:
+                self._spill_held()
+            return
+        #Все выгруженные записи относятся к этой папке, поэтому их итоги уже известны
+        self._release_spill()
+        ready = []
+        while held and type(held[0].totals) is not list:
+            ready.append(held.popleft())
+        if ready:
+            self._writer.write_batch(ready)
+
+    def _spill_held(self):
+        """Выгрузка задержанных записей из памяти во временный файл."""
+        if self._spill is None:
+            #tempfile и pickle импортируются только при выгрузке записей
+            import tempfile
+            self._spill = tempfile.TemporaryFile()  # noqa: SIM115
+        import pickle
+        chunk = []
+        for record in self._held:
+            if type(record.totals) is list:
+                #Итоги открытой папки еще изменятся, поэтому она остается в памяти
+                chunk.append(len(self._spilled_open))
+                self._spilled_open.append(record)
+            else:
+                chunk.append(record)
+        pickle.dump(chunk, self._spill, pickle.HIGHEST_PROTOCOL)
+        self._held.clear()
+
+    def _release_spill(self):
+        """Вывод выгруженных записей исполняющим Writer'ом и удаление временного файла."""
+        if self._spill is None:
+            return
+        import pickle
+        spill = self._spill
+        self._spill = None
+        with spill:
+            spill.seek(0)
+            while True:
+                try:
+                    chunk = pickle.load(spill)  # noqa: S301
+                except EOFError:
+                    break
+                self._writer.write_batch([self._spilled_open[item] if type(item) is int else item
+                                          for item in chunk])
+        self._spilled_open.clear()
+
+    def write_section(self, section):
+        """Вывод оставшихся записей и раздела отчета исполняющим Writer'ом.
+
+        Args:
+            section (ReportSection): раздел отчета
+        """
+        self._release_held()
+        self._writer.write_section(section)
+
+    def write_summary(self, summary):
+        """Вывод оставшихся записей и сводки отчета исполняющим Writer'ом.
+
+        Args:
+            summary (ReportSummary): сводка отчета
+        """
+        self._release_held()
+        self._writer.write_summary(summary)
+
+    def _release_held(self):
+        """Вывод всех задержанных записей."""
+        self._release_spill()
+        if self._held:
+            self._writer.write_batch(list(self._held))
+            self._held.clear()
+
+    def save_file(self):
+        """Вывод оставшихся записей и сохранение файла отчета."""
+        self._release_held()
+        self._writer.save_file()
+
+    def close(self):
+        """Удаление задержанных записей и закрытие файла отчета исполняющим Writer'ом."""
+        self._held.clear()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        self._spilled_open.clear()
+        self._writer.close()
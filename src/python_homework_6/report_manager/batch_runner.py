@@ -0,0 +1,206 @@
+"""Модуль для пакетного формирования отчетов по нескольким каталогам.
+
+Содержит классы JobTimeoutError и BatchRunner
+"""
+
+import json
+import os
+import signal
+import sys
+import time
+from contextlib import redirect_stdout
+from importlib import import_module
+from pathlib import Path
+
+from . import writers
+from .report_manager import ReportManager, ReportType
+
+
+class JobTimeoutError(Exception):
+    """Превышено время выполнения задания пакета."""
+
+
+def _raise_timeout(*_):
+    """Обработчик SIGALRM, прерывающий задание по истечении времени.
+
+    Raises:
+        JobTimeoutError: всегда
+    """
+    raise JobTimeoutError
+
+
+def _init_worker(writer_names):
+    """Инициализация процесса пула: загрузка модулей Writer'ов один раз на процесс.
+
+    Args:
+        writer_names (tuple): имена классов Writer'ов, нужных заданиям пакета
+    """
+    for name in writer_names:
+        getattr(writers, name)
+    if 'PdfWriter' in writer_names:
+        #Регистрация шрифта PDF кэшируется в процессе
+        import_module('.pdf_writer', writers.__name__)._register_font()
+
+
+def _run_job(job, timeout):
+    """Выполнение одного задания пакета в процессе пула.
+
+    Время задания ограничивается через SIGALRM (на платформах с signal.setitimer),
+    при превышении ReportManager закрывает файлы отчетов без сохранения.
+
+    Args:
+        job (dict): задание - path, report и остальные параметры ReportManager
+        timeout (float | None): предельное время задания (с)
+
+    Returns:
+        dict: итог задания - путь, отчеты, статус ('ok', 'error', 'timeout'), ошибка,
+            время, процессорное время и статистика, если она собиралась
+    """
+    kwargs = {key: value for key, value in job.items() if key not in ('path', 'report')}
+    result = {'path': job['path'], 'report': job['report'], 'status': 'ok', 'error': None}
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    alarm = timeout is not None and hasattr(signal, 'setitimer')
+    manager = None
+    try:
+        if alarm:
+            signal.signal(signal.SIGALRM, _raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            #Сообщения заданий выводятся в stderr, stdout остается для сводки пакета
+            with redirect_stdout(sys.stderr):
+                manager = ReportManager(job['path'], job['report'], **kwargs)
+                manager.make_report()
+        finally:
+            if alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+    except JobTimeoutError:
+        result['status'] = 'timeout'
+        result['error'] = f'Превышено время выполнения {timeout} с'
+    except Exception as err:
+        result['status'] = 'error'
+        result['error'] = f'{type(err).__name__}: {err}'
+    result['wall_time'] = time.perf_counter() - wall
+    result['cpu_time'] = time.process_time() - cpu
+    if manager is not None and manager.stats is not None:
+        result['stats'] = manager.stats.to_dict()
+    return result
+
+
+class BatchRunner:
+    """Класс для формирования отчетов по списку заданий в пуле процессов.
+
+    Каждое задание - каталог и отчеты для него, задания выполняются параллельно
+    в ProcessPoolExecutor. Модули форматов (reportlab, openpyxl, python-docx),
+    нужных заданиям, загружаются при запуске каждого процесса пула, поэтому
+    импорт выполняется один раз на процесс, а не на задание.
+    """
+
+    def __init__(self, jobs, processes = None, timeout = None, **defaults):
+        """Инициализация пакета заданий.
+
+        Args:
+            jobs (list): задания - словари с ключами path, report и необязательными
+                параметрами ReportManager
+            processes (int | None): количество процессов пула, по умолчанию - количество
+                доступных ядер
+            timeout (float | None): предельное время выполнения одного задания (с)
+            **defaults: параметры ReportManager по умолчанию для всех заданий
+
+        Raises:
+            ValueError: задание без каталога или отчета, недопустимое количество процессов
+                или предельное время
+        """
+        for number, job in enumerate(jobs, 1):
+            if not isinstance(job, dict) or 'path' not in job or 'report' not in job:
+                raise ValueError(f'Задание {number} пакета должно содержать path и report')
+        if processes is not None and processes < 1:
+            raise ValueError(f'Недопустимое количество процессов {processes}')
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f'Недопустимое время выполнения задания {timeout}')
+        self._jobs = [{**defaults, **job} for job in jobs]
+        self._processes = processes
+        self._timeout = timeout
+
+    @classmethod
+    def from_manifest(cls, manifest_path, **kwargs):
+        """Создание пакета из файла заданий.
+
+        Файл заданий - JSON массив объектов {"path": ..., "report": ... или [...], ...},
+        остальные поля объекта передаются ReportManager.
+
+        Args:
+            manifest_path (str | Path): путь к файлу заданий
+            **kwargs: остальные параметры BatchRunner
+
+        Raises:
+            ValueError: файл заданий не является JSON массивом
+
+        Returns:
+            BatchRunner: пакет заданий
+        """
+        jobs = json.loads(Path(manifest_path).read_text(encoding = 'utf-8'))
+        if not isinstance(jobs, list):
+            raise ValueError(f'Файл заданий {manifest_path} должен содержать JSON массив')
+        return cls(jobs, **kwargs)
+
+    @staticmethod
+    def _available_cpus():
+        """Количество ядер, доступных процессу.
+
+        Returns:
+            int: количество ядер
+        """
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+
+    def _writer_names(self):
+        """Имена классов Writer'ов для отчетов всех заданий.
+
+        Returns:
+            tuple: имена классов Writer'ов
+        """
+        names = set()
+        for job in self._jobs:
+            reports = job['report']
+            for report in [reports] if isinstance(reports, str | os.PathLike) else reports:
+                for suffix in Path(report).suffixes:
+                    try:
+                        names.add(ReportManager.WRITERS[ReportType(suffix[1:].lower())])
+                    except (ValueError, KeyError):
+                        continue
+        return tuple(sorted(names))
+
+    def run(self):
+        """Выполнение всех заданий пакета.
+
+        Returns:
+            dict: сводка - количество заданий по статусам, общее время и итоги заданий
+                в порядке файла заданий
+        """
+        started = time.perf_counter()
+        results = []
+        if self._jobs:
+            #concurrent.futures импортируется только при выполнении пакета
+            from concurrent.futures import ProcessPoolExecutor
+            processes = min(self._processes or self._available_cpus(), len(self._jobs))
+            with ProcessPoolExecutor(processes, initializer = _init_worker,
+                                     initargs = (self._writer_names(),)) as pool:
+                futures = [pool.submit(_run_job, job, self._timeout) for job in self._jobs]
+                for job, future in zip(self._jobs, futures, strict = True):
+                    try:
+                        results.append(future.result())
+                    except Exception as err:
+                        #Процесс пула завершился аварийно
+                        results.append({'path': job['path'], 'report': job['report'], 'status': 'error',
+                                        'error': f'{type(err).__name__}: {err}'})
+        statuses = {}
+        for result in results:
+            statuses[result['status']] = statuses.get(result['status'], 0) + 1
+        return {
+            'jobs': len(results),
+            'statuses': statuses,
+            'wall_time': time.perf_counter() - started,
+            'results': results,
+        }
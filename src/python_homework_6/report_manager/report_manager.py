@@ -4,11 +4,38 @@
 """
 
 import datetime
+import os
+import queue
+import threading
+import time
+from contextlib import nullcontext
 from enum import Enum
+from functools import partial
 from pathlib import Path
-from zipfile import BadZipFile, ZipFile
 
-from .writers import CsvWriter, DocxWriter, JsonWriter, PdfWriter, XlsxWriter
+from . import writers
+from .base import (
+    BackgroundWriter,
+    ReportSection,
+    ReportStats,
+    ReportSummary,
+    RollupWriter,
+)
+from .scanner import (
+    ArchiveInspector,
+    DirScanner,
+    DuplicateFinder,
+    InotifyWatcher,
+    LinkPolicy,
+    PollingWatcher,
+    ScanDiff,
+    ScanFilter,
+    ScanIndex,
+    ScanSnapshot,
+    ScanSummary,
+    SizeRollup,
+    TreeModel,
+)
 
 
 class ReportType(Enum):
@@ -22,6 +49,9 @@ class ReportType(Enum):
     PDF  = 'pdf'
     CSV  = 'csv'
     JSON = 'json'
+    NDJSON = 'ndjson'
+    JSONL = 'jsonl'
+    SNAPSHOT = 'snap'
 
 class ReportManager():
     """Класс структуры каталога.
@@ -31,27 +61,203 @@ class ReportManager():
     форматах в зависимости от типа отчета ReportType, определяемого расширением файла
     """
 
-    def __init__(self, path, report):
-        """Инициализация и проверка корректности пути к каталогу и пути для файла отчета.
+    #Имена классов Writer'ов, модуль Writer'а импортируется только для нужного типа отчета
+    WRITERS = {
+        ReportType.DOCX: 'DocxWriter',
+        ReportType.XLSX: 'XlsxWriter',
+        ReportType.CSV: 'CsvWriter',
+        ReportType.JSON: 'JsonWriter',
+        ReportType.NDJSON: 'JsonWriter',
+        ReportType.JSONL: 'JsonWriter',
+        ReportType.PDF: 'PdfWriter',
+        ReportType.SNAPSHOT: 'SnapshotWriter',
+    }
+    #Типы отчетов, которые можно сжимать в gzip
+    COMPRESSIBLE = (ReportType.CSV, ReportType.JSON, ReportType.NDJSON, ReportType.JSONL)
+    #Типы отчетов с медленными Writer'ами, которые можно выполнять в отдельном потоке/процессе
+    BACKGROUND_TYPES = (ReportType.PDF, ReportType.DOCX)
+    #Максимальное количество пачек записей в очереди конвейера
+    PIPELINE_BATCHES = 16
+    #Период проверки остановки конвейера при заполненной очереди (с)
+    PIPELINE_TIMEOUT = 0.1
+    #Период проверки остановки в режиме наблюдения (с)
+    WATCH_STEP = 0.5
+    #Максимальная задержка обновления отчетов при непрерывных изменениях каталога (с)
+    WATCH_MAX_DELAY = 10.0
 
-        Здесь также определяется тип отчета по расширению файла.
+    def __init__(self, path, report, workers = 1, report_types = None, background = None, index = None,
+                 batch_size = 1000, pipeline = False, stats = False, progress = None, exclude = None,
+                 include = None, max_depth = None, min_size = None, modified_since = None, dir_sizes = False,
+                 snapshot = None, baseline = None, duplicates = False, links = LinkPolicy.REPORT,
+                 one_file_system = False, archive_formats = None, nested_archive_size = 16 * 1024 * 1024,
+                 archive_nesting = 3, archive_timeout = 60.0, summary = False, summary_top = 10):
+        """Инициализация и проверка корректности пути к каталогу и путей для файлов отчета.
+
+        Здесь также определяются типы отчетов по расширениям файлов. Если задано
+        несколько отчетов, все они формируются за один обход каталога.
 
         Args:
             path (str): путь к каталогу для описания структуры
-            report (str): путь для создания файла отчета
+            report (str | list): путь для создания файла отчета или список путей
+            workers (int): количество потоков для чтения каталогов
+            report_types (list | None): список типов отчетов ReportType, если задан,
+                то report - путь к файлу отчета без расширения
+            background (str | None): режим выполнения медленных Writer'ов (PDF, DOCX) -
+                'thread' или 'process', None - выполнение в основном потоке
+            index (str | None): путь к файлу индекса сканирования для повторного
+                использования списков неизмененных каталогов
+            batch_size (int): количество записей в одной пачке, передаваемой Writer'ам
+            pipeline (bool): обходить каталог в отдельном потоке параллельно с выводом отчета
+            stats (bool): собирать статистику формирования отчета (время этапов, счетчики,
+                пиковый расход памяти), статистика доступна в свойстве stats
+            progress (Callable | None): функция прогресса progress(entries, entries_per_second)
+            exclude (list | None): шаблоны исключаемых файлов/папок (подкаталоги не читаются)
+            include (list | None): шаблоны файлов, которые выводятся в отчет
+            max_depth (int | None): максимальная глубина вложенности выводимых записей
+            min_size (int | None): минимальный размер выводимых файлов в байтах
+            modified_since (datetime | float | None): выводить только файлы, измененные после этого времени
+            dir_sizes (bool): вычислять суммарный размер и количество файлов папок и архивов
+            snapshot (str | None): путь к снимку сканирования, из которого берутся записи вместо
+                обхода каталога path (см. from_snapshot)
+            baseline (str | None): путь к снимку сканирования или каталогу с прежним состоянием,
+                если задан - в отчет выводятся только изменения относительно него (см. ScanDiff)
+            duplicates (bool): выводить ли раздел с группами файлов-дубликатов (см. DuplicateFinder)
+            links (LinkPolicy | str): обработка символических ссылок - 'follow' (обходить),
+                'skip' (не выводить) или 'report' (выводить без обхода)
+            one_file_system (bool): не обходить каталоги других файловых систем (точки монтирования)
+            archive_formats (list | None): форматы архивов ArchiveFormat, содержимое которых
+                выводится в отчет, None - ZIP и tar (см. ArchiveInspector)
+            nested_archive_size (int): максимальный размер вложенного архива, читаемого в память (байт)
+            archive_nesting (int): максимальная глубина вложенности архивов в архивах
+            archive_timeout (float | None): предельное время чтения одного архива (с), после
+                которого выводятся уже прочитанные записи, None - без ограничения
+            summary (bool): выводить ли сводку - крупнейшие файлы и папки, самые старые файлы,
+                распределения файлов по размеру и давности изменения (см. ScanSummary)
+            summary_top (int): количество записей в списках сводки
 
         Raises:
-            FileNotFoundError: указанный каталог path не существует
+            FileNotFoundError: указанный каталог path или baseline не существует
+            ValueError: недопустимое количество потоков, тип отчета, режим выполнения,
+                размер пачки, параметры фильтра, обработка ссылок, параметры чтения архивов,
+                фильтр/индекс для снимка,
+                параметры отчета об изменениях, поиск дубликатов без обхода каталога,
+                количество записей сводки или сводка для отчета об изменениях
         """
         self.__path = path
         self.__report = report
+        if workers < 1:
+            raise ValueError(f'Недопустимое количество потоков {workers}')
+        self.__workers = workers
+        if batch_size < 1:
+            raise ValueError(f'Недопустимый размер пачки записей {batch_size}')
+        self.__batch_size = batch_size
+        self.__pipeline = pipeline
+        if background is not None and background not in BackgroundWriter.MODES:
+            raise ValueError(f"Недопустимый режим выполнения Writer'ов {background}")
+        self.__background = background
+        self.__index = index
+        self.__collect_stats = stats
+        self.__progress = progress
+        self.__stats = None
+        #Фильтр записей, применяемый при обходе каталога
+        self.__scan_filter = None
+        self.__dir_sizes = dir_sizes
+        if exclude or include or max_depth is not None or min_size is not None or modified_since is not None:
+            if isinstance(modified_since, datetime.datetime):
+                modified_since = modified_since.timestamp()
+            self.__scan_filter = ScanFilter(exclude or (), include or (), max_depth, min_size, modified_since)
+        try:
+            self.__links = LinkPolicy(links)
+        except ValueError:
+            raise ValueError(f'Недопустимая обработка ссылок {links}') from None
+        self.__one_file_system = one_file_system
+        #Параметры чтения архивов проверяются при создании ArchiveInspector
+        self.__archive_kwargs = {'formats': archive_formats, 'nested_size': nested_archive_size,
+                                 'max_nesting': archive_nesting, 'timeout': archive_timeout}
+        ArchiveInspector(**self.__archive_kwargs)
+        self.__snapshot = snapshot
+        if snapshot is not None and (self.__scan_filter is not None or index is not None):
+            raise ValueError('Фильтры и индекс не применяются при формировании отчета из снимка')
         #Инициализация объект Path из pathlib для работы с файловой системой
         self.__file_path = Path(self.__path).absolute()
-        self.__file_report = Path(self.__report)
-        #Проверка существования файла
-        if not self.__file_path.exists():
+        #Проверка существования файла (при формировании отчета из снимка каталог не нужен)
+        if snapshot is None and not self.__file_path.exists():
             raise FileNotFoundError(f'Путь {self.__path} не существует')
-        self.__report_type = self.__get_report_type_by_extension(self.__file_report.suffix)
+        #Прежнее состояние для отчета об изменениях - каталог или снимок сканирования
+        self.__baseline = None
+        if baseline is not None:
+            self.__baseline = Path(baseline).absolute()
+            if not self.__baseline.exists():
+                raise FileNotFoundError(f'Путь {baseline} не существует')
+            if not self.__baseline.is_dir() and self.__scan_filter is not None:
+                raise ValueError('Фильтры не применяются при сравнении со снимком')
+            if dir_sizes:
+                raise ValueError('Итоги папок не выводятся в отчете об изменениях')
+        self.__duplicates = duplicates
+        self.__duplicate_finder = None
+        if duplicates and (snapshot is not None or baseline is not None):
+            raise ValueError('Дубликаты ищутся только при обходе каталога')
+        self.__summary = summary
+        self.__summary_top = summary_top
+        self.__scan_summary = None
+        if summary:
+            if summary_top < 1:
+                raise ValueError(f'Недопустимое количество записей сводки {summary_top}')
+            if baseline is not None:
+                raise ValueError('Сводка не формируется для отчета об изменениях')
+
+        reports = [report] if isinstance(report, str | os.PathLike) else list(report)
+        if report_types is not None:
+            if len(reports) != 1:
+                raise ValueError('Для списка типов отчетов нужен один путь к файлу отчета')
+            file_report = Path(reports[0])
+            reports = [file_report.with_name(f'{file_report.name}.{ReportType(report_type).value}')
+                       for report_type in report_types]
+        if not reports:
+            raise ValueError('Не задан ни один файл отчета')
+        #Список отчетов (путь к файлу, тип отчета, сжатие)
+        self.__reports = [self.__parse_report(Path(file_report)) for file_report in reports]
+        if self.__baseline is not None and any(report[1] == ReportType.SNAPSHOT for report in self.__reports):
+            raise ValueError('Снимок сканирования не формируется для отчета об изменениях')
+
+    @classmethod
+    def from_snapshot(cls, snapshot, report, **kwargs):
+        """Создание объекта для формирования отчетов из снимка сканирования.
+
+        Каталог не читается: путь к каталогу и записи о файлах/папках берутся из снимка,
+        сохраненного отчетом с расширением .snap.
+
+        Args:
+            snapshot (str | Path): путь к файлу снимка
+            report (str | list): путь для создания файла отчета или список путей
+            **kwargs: остальные параметры ReportManager
+
+        Returns:
+            ReportManager: объект для формирования отчетов из снимка
+        """
+        with ScanSnapshot(snapshot) as scan_snapshot:
+            root = scan_snapshot.root
+        return cls(root, report, snapshot = snapshot, **kwargs)
+
+    def __parse_report(self, file_report):
+        """Определение типа отчета и сжатия по расширениям файла отчета.
+
+        Args:
+            file_report (Path): путь к файлу отчета
+
+        Raises:
+            ValueError: недопустимый тип отчета или сжатие
+
+        Returns:
+            tuple: (путь к файлу отчета, тип отчета, сжатие в gzip)
+        """
+        #Расширение .gz после основного расширения включает сжатие отчета (report.csv.gz)
+        suffixes = file_report.suffixes
+        compress = len(suffixes) > 1 and suffixes[-1].lower() == '.gz'
+        report_type = self.__get_report_type_by_extension(suffixes[-2] if compress else file_report.suffix)
+        if compress and report_type not in type(self).COMPRESSIBLE:
+            raise ValueError(f'Сжатие gzip не поддерживается для отчета {report_type.value}')
+        return file_report, report_type, compress
 
     def __get_report_type_by_extension(self, extension:str)->ReportType:
         """Получение типа отчета по расширению файла отчета.
@@ -71,107 +277,512 @@ class ReportManager():
         except ValueError as err:
             raise ValueError(f'Недопустимый тип отчета {extension}') from err
 
+    @property
+    def stats(self):
+        """Статистика последнего формирования отчета (ReportStats) или None, если не собиралась."""
+        return self.__stats
+
     def make_report(self):
-        """Создание файла отчета с выводом в него информации о всех файлах/папках.
+        """Создание файлов отчета с выводом в них информации о всех файлах/папках.
+
+        Каталог обходится один раз, каждая запись передается всем Writer'ам.
+        При ошибке файлы отчетов закрываются без сохранения.
 
         Raises:
             ValueError: неизвестный тип отчета
         """
-        #Создание всех промежуточных папок, если их нет
-        self.__file_report.parent.mkdir(parents=True, exist_ok=True)
+        stats = None
+        if self.__collect_stats or self.__progress is not None:
+            stats = ReportStats(self.__progress, trace_memory = self.__collect_stats)
+            stats.start()
+        self.__stats = stats
+        #Имена отчетов для статистики этапов
+        names = [report[0].name for report in self.__reports]
+        writers = []
+        try:
+            #Создание Writer'ов (в том числе импорт модулей форматов)
+            for report, name in zip(self.__reports, names, strict = True):
+                with self.__phase(f'init:{name}'):
+                    writers.append(self.__create_writer(*report))
+            for writer, name in zip(writers, names, strict = True):
+                with self.__phase(f'create:{name}'):
+                    writer.create_file()
+
+            write_funcs = [writer.write_batch for writer in writers]
+            if stats is not None:
+                write_funcs = [self.__timed(f'write:{name}', func)
+                               for name, func in zip(names, write_funcs, strict = True)]
+            if len(write_funcs) == 1:
+                write_func = write_funcs[0]
+            else:
+                def write_func(records):
+                    for func in write_funcs:
+                        func(records)
+
+            if self.__duplicates:
+                self.__duplicate_finder = DuplicateFinder(self.__workers, stats)
+            if self.__summary:
+                self.__scan_summary = ScanSummary(self.__summary_top)
+            if self.__pipeline:
+                self.__write_dir_structure_pipelined(write_func)
+            else:
+                self.__write_dir_structure(write_func)
+            #Сводка и дополнительные разделы отчета выводятся после всех записей
+            summary = self.__report_summary()
+            if summary is not None:
+                for writer, name in zip(writers, names, strict = True):
+                    with self.__phase(f'write:{name}'):
+                        writer.write_summary(summary)
+            for section in self.__report_sections():
+                for writer, name in zip(writers, names, strict = True):
+                    with self.__phase(f'write:{name}'):
+                        writer.write_section(section)
+            for writer, name in zip(writers, names, strict = True):
+                with self.__phase(f'save:{name}'):
+                    writer.save_file()
+        except BaseException:
+            for writer in writers:
+                writer.close()
+            raise
+        finally:
+            if stats is not None:
+                stats.stop()
+
+    def watch(self, debounce = 0.5, interval = 2.0, on_update = None, stop = None, ignore = ()):
+        """Формирование отчетов и их обновление при изменениях каталога.
+
+        После первого полного обхода записи каталогов и списки архивов хранятся
+        в модели каталога (TreeModel), которая используется вместо индекса сканирования.
+        Изменения отслеживаются через inotify (Linux), иначе - периодической проверкой
+        времени изменения и размера (PollingWatcher). Серия изменений объединяется:
+        отчеты формируются заново, когда изменений не было debounce секунд (но не позже
+        WATCH_MAX_DELAY). При этом заново читаются только измененные каталоги и архивы,
+        остальные записи берутся из модели.
+
+        Args:
+            debounce (float): время без изменений перед обновлением отчетов (с)
+            interval (float): период проверки изменений, если inotify недоступен (с)
+            on_update (Callable | None): функция on_update(changed), вызываемая после каждого
+                формирования отчетов, changed - пути измененных каталогов и архивов
+                (пустое множество после первого формирования)
+            stop (threading.Event | None): событие остановки наблюдения, None - до прерывания
+                (KeyboardInterrupt)
+            ignore (Iterable): дополнительные пути файлов, изменения которых не учитываются
+                (файлы отчетов учитываются всегда)
+
+        Raises:
+            ValueError: наблюдение за снимком, наблюдение с индексом сканирования
+                или недопустимое время ожидания
+        """
+        if self.__snapshot is not None:
+            raise ValueError('Режим наблюдения не применяется к снимку сканирования')
+        if self.__index is not None:
+            raise ValueError('Индекс сканирования не применяется в режиме наблюдения')
+        if debounce < 0 or interval <= 0:
+            raise ValueError('Недопустимое время ожидания изменений')
+        #Файлы отчетов изменяются при каждом обновлении и не должны вызывать новое обновление
+        ignore = {str(report[0].absolute()) for report in self.__reports} | {str(Path(path).absolute())
+                                                                            for path in ignore}
+        model = TreeModel()
+        self.__index = model
+        watcher = None
+
+        def wait(timeout):
+            nonlocal watcher
+            try:
+                return watcher.wait(timeout)
+            except OSError:
+                #Не удалось добавить наблюдение за новым каталогом (превышен предел количества
+                #наблюдений inotify): изменения, еще не учтенные в модели, найдет периодическая проверка
+                watcher.close()
+                watcher = PollingWatcher(model, interval, ignore)
+                return set()
+
+        try:
+            self.make_report()
+            watcher = self.__create_watcher(model, interval, ignore)
+            if on_update is not None:
+                on_update(set())
+            while stop is None or not stop.is_set():
+                changed = wait(type(self).WATCH_STEP)
+                if not changed:
+                    continue
+                #Ожидание окончания серии изменений
+                deadline = time.monotonic() + type(self).WATCH_MAX_DELAY
+                while time.monotonic() < deadline and (more := wait(debounce)):
+                    changed |= more
+                model.invalidate(changed)
+                self.make_report()
+                try:
+                    watcher.sync()
+                except OSError:
+                    #Превышен предел количества наблюдений inotify
+                    watcher.close()
+                    watcher = PollingWatcher(model, interval, ignore)
+                if on_update is not None:
+                    on_update(changed)
+        finally:
+            if watcher is not None:
+                watcher.close()
+            self.__index = None
+
+    @staticmethod
+    def __create_watcher(model, interval, ignore):
+        """Создание объекта отслеживания изменений каталогов модели.
+
+        Args:
+            model (TreeModel): модель каталога
+            interval (float): период проверки изменений, если inotify недоступен (с)
+            ignore (set): пути файлов, изменения которых не учитываются
+
+        Returns:
+            InotifyWatcher | PollingWatcher: объект отслеживания изменений
+        """
+        watcher = None
+        try:
+            watcher = InotifyWatcher(model, ignore)
+            watcher.sync()
+        except OSError:
+            #inotify недоступен или превышен предел количества наблюдений
+            if watcher is not None:
+                watcher.close()
+            return PollingWatcher(model, interval, ignore)
+        return watcher
+
+    def __report_summary(self):
+        """Формирование сводки отчета по статистике, собранной при обходе.
+
+        Returns:
+            ReportSummary | None: сводка отчета или None, если сводка не собиралась
+        """
+        scan_summary = self.__scan_summary
+        if scan_summary is None:
+            return None
+        self.__scan_summary = None
+        size_titles = tuple(title for _, title, _ in ScanSummary.SIZE_BUCKETS)
+        size_keys = tuple(key for _, _, key in ScanSummary.SIZE_BUCKETS)
+        age_titles = tuple(title for _, title, _ in ScanSummary.AGE_BUCKETS)
+        age_keys = tuple(key for _, _, key in ScanSummary.AGE_BUCKETS)
+        extensions = scan_summary.extensions()
+        #Размеры и время изменения преобразует в читаемый формат Writer
+        size, mtime = ReportSection.SIZE, ReportSection.MTIME
+        sections = [
+            ReportSection('largest_files', 'Крупнейшие файлы', ('Размер файла', 'Путь к файлу'), ('size', 'path'),
+                          scan_summary.largest_files(), (size, None)),
+            ReportSection('largest_dirs', 'Крупнейшие папки', ('Размер папки', 'Файлов', 'Путь к папке'),
+                          ('size', 'files', 'path'), scan_summary.largest_dirs(), (size, None, None)),
+            ReportSection('oldest_files', 'Самые старые файлы', ('Последнее изменение', 'Путь к файлу'),
+                          ('mtime', 'path'), scan_summary.oldest_files(), (mtime, None)),
+            ReportSection('size_histogram', 'Распределение файлов по размеру',
+                          ('Расширение', 'Файлов', 'Размер', *size_titles), ('extension', 'files', 'size', *size_keys),
+                          [(extension, files, total, *sizes) for extension, files, total, sizes, _ in extensions],
+                          (None, None, size) + (None,) * len(size_keys)),
+            ReportSection('age_histogram', 'Распределение файлов по давности изменения',
+                          ('Расширение', 'Файлов', 'Размер', *age_titles), ('extension', 'files', 'size', *age_keys),
+                          [(extension, files, total, *ages) for extension, files, total, _, ages in extensions],
+                          (None, None, size) + (None,) * len(age_keys)),
+        ]
+        return ReportSummary('summary', 'Сводка', sections)
+
+    def __report_sections(self):
+        """Формирование дополнительных разделов отчета по результатам обхода.
+
+        Returns:
+            list: разделы отчета ReportSection
+        """
+        sections = []
+        if self.__duplicate_finder is not None:
+            with self.__phase('duplicates'):
+                groups = self.__duplicate_finder.find()
+            self.__duplicate_finder = None
+            rows = [(number, size, path) for number, (size, paths) in enumerate(groups, 1) for path in paths]
+            sections.append(ReportSection('duplicates', 'Дубликаты файлов', ('Группа', 'Размер файла', 'Путь к файлу'),
+                                          ('group', 'size', 'path'), rows, (None, ReportSection.SIZE, None)))
+        return sections
 
-        #Словарь Writer'ов
-        reprort_writers = {
-            ReportType.DOCX: DocxWriter,
-            ReportType.XLSX: XlsxWriter,
-            ReportType.CSV: CsvWriter,
-            ReportType.JSON: JsonWriter,
-            ReportType.PDF: PdfWriter,
-        }
+    def __phase(self, name):
+        """Контекстный менеджер измерения времени этапа.
+
+        Args:
+            name (str): имя этапа
+
+        Returns:
+            ContextManager: измерение этапа или nullcontext, если статистика не собирается
+        """
+        return self.__stats.phase(name) if self.__stats is not None else nullcontext()
+
+    def __timed(self, name, func):
+        """Обертка функции с измерением времени ее вызовов как этапа.
+
+        Args:
+            name (str): имя этапа
+            func (func): функция
+
+        Returns:
+            func: функция с измерением времени
+        """
+        def timed_func(*args):
+            with self.__stats.phase(name):
+                return func(*args)
+        return timed_func
+
+    def __create_writer(self, file_report, report_type, compress):
+        """Создание Writer'а для файла отчета.
+
+        Args:
+            file_report (Path): путь к файлу отчета
+            report_type (ReportType): тип отчета
+            compress (bool): сжатие отчета в gzip
+
+        Raises:
+            ValueError: неизвестный тип отчета
+
+        Returns:
+            BaseWriter: Writer для вывода отчета
+        """
+        #Создание всех промежуточных папок, если их нет
+        file_report.parent.mkdir(parents=True, exist_ok=True)
 
         #Класс Writer'а
         try:
-            writer_class = reprort_writers[self.__report_type]
+            writer_class = getattr(writers, type(self).WRITERS[report_type])
         except KeyError as err:
-            raise ValueError(f'Writer для типа отчета {self.__report_type} не реализован') from err
+            raise ValueError(f'Writer для типа отчета {report_type} не реализован') from err
+        if report_type in (ReportType.NDJSON, ReportType.JSONL):
+            writer_class = partial(writer_class, json_lines = True)
 
-        #Создание Writer'а и вывод файла отчета
-        writer = writer_class(self.__file_report, self.__file_path)
-        writer.create_file()
-        self.__write_dir_structure(writer.write_to_file)
-        writer.save_file()
+        #Создание Writer'а, медленные Writer'ы при необходимости выполняются в отдельном потоке/процессе
+        writer_kwargs = {'compress': True} if compress else {}
+        if self.__baseline is not None:
+            writer_kwargs['changes'] = True
+        if (self.__duplicates or self.__summary) and report_type in (ReportType.JSON, ReportType.NDJSON,
+                                                                      ReportType.JSONL):
+            writer_kwargs['sections'] = True
+        if self.__background is not None and report_type in type(self).BACKGROUND_TYPES:
+            writer = BackgroundWriter(writer_class, file_report, self.__file_path,
+                                      self.__background, **writer_kwargs)
+            #В отдельный процесс передаются копии записей, поэтому итоги папок должны быть известны заранее
+            defers_totals = self.__background == 'thread' and getattr(writer_class, 'DEFERS_TOTALS', False)
+        else:
+            writer = writer_class(file_report, self.__file_path, **writer_kwargs)
+            defers_totals = writer.DEFERS_TOTALS
+        if self.__dir_sizes and not defers_totals:
+            writer = RollupWriter(writer)
+        return writer
 
     def __write_dir_structure(self, write_func):
-        """Проход всех вложенных в каталог файлов и папок, в том числе ZIP.
+        """Проход всех вложенных в каталог файлов и папок с выводом пачек записей.
 
         Args:
-            write_func (func): функция-writer, выводящая информацию о файле/папке в отчет
+            write_func (func): функция-writer, выводящая пачку записей ScanRecord в отчет
         """
-        #Рекурсивный перебор структуры каталога
-        #Сортировка нужна, чтобы выводить папку + все файлы из папки подряд
-        for file in sorted(self.__file_path.rglob('*')): 
-            #Обработка файлов/папок
-            write_func(file, 
-                'ПАПКА' if not file.is_file() else self.__readable_size(file.stat().st_size),
-                datetime.datetime.fromtimestamp(int(file.stat().st_mtime)))
-            #Дополнительная обработка ZIP архивов
-            if file.suffix.lower() == '.zip':
+        batches_iter = self.__iter_batches()
+        try:
+            while True:
+                #Время получения пачки - время обхода каталога и чтения архивов
+                with self.__phase('scan'):
+                    batch = next(batches_iter, None)
+                if batch is None:
+                    break
+                write_func(batch)
+        finally:
+            batches_iter.close()
+
+    def __write_dir_structure_pipelined(self, write_func):
+        """Проход каталога в отдельном потоке с передачей пачек записей через очередь.
+
+        Поток-производитель обходит каталог и читает архивы, текущий поток
+        выводит пачки записей в отчет. Очередь ограничена, поэтому производитель
+        ждет, если Writer'ы не успевают. Ошибка любой из сторон останавливает
+        другую и передается вызывающему коду.
+
+        Args:
+            write_func (func): функция-writer, выводящая пачку записей ScanRecord в отчет
+        """
+        batches = queue.Queue(type(self).PIPELINE_BATCHES)
+        stop = threading.Event()
+
+        def put(item):
+            #Ожидание места в очереди с проверкой остановки со стороны Writer'ов
+            while not stop.is_set():
                 try:
-                    with ZipFile(file, 'r') as zipf:
-                        #Поскольку данные rglob('*') и infolist() немного отличаются,
-                        #в infolist() могут отсутствовать отдельные папки, поэтому
-                        #необходимо получить из infolist() данные в нужном виде
-
-                        #1. Сбор всех папок
-                        infolist = zipf.infolist()
-                        zip_paths = set()
-                        for info in infolist:
-                            info_parts = Path(info.filename).parts
-                            for i in range(1, len(info_parts)):
-                                i_path = Path(*info_parts[:i])
-                                if not str(i_path).endswith('/'):
-                                    zip_paths.add(Path(file).joinpath(Path(str(i_path) + '/')))
-
-                        #Добавление папок в список путей
-                        zip_items = []
-                        for zp in zip_paths:
-                            zip_items.append({
-                                'path': Path(file).joinpath(zp),
-                                'is_dir': True,
-                                'size': 'ПАПКА',
-                                'mtime': ''
-                            })
-
-                        #Сбор всех файлов и недостающих папок из infolist
-                        for info in infolist:
-                            zitem_path = Path(file).joinpath(info.filename)
-                            if zitem_path not in zip_paths:
-                                zip_items.append({
-                                    'path': zitem_path,
-                                    'is_dir': info.is_dir(),
-                                    'size': 'ПАПКА' if info.is_dir() else self.__readable_size(info.file_size),
-                                    'mtime': datetime.datetime(*info.date_time)
-                                })
-                        #Сортировка по путям к файлу, чтобы выводить файлы по папкам
-                        zip_items.sort(key = lambda x: Path(x['path']).as_posix())
-
-                        #Вывод полученного списка
-                        for z_i in zip_items:
-                            write_func(str(z_i['path']), z_i['size'], z_i['mtime'])
-                except BadZipFile:
-                    print(f'{file} - поврежденный .zip')
-
-    def __readable_size(self, size_bytes):
-        """Преобразование размера файла в читаемый формат.
+                    batches.put(item, timeout = type(self).PIPELINE_TIMEOUT)
+                except queue.Full:
+                    continue
+                return True
+            return False
+
+        def produce():
+            result = None
+            batches_iter = self.__iter_batches()
+            try:
+                while True:
+                    with self.__phase('scan'):
+                        batch = next(batches_iter, None)
+                    if batch is None or not put(batch):
+                        break
+            except BaseException as err:
+                result = err
+            finally:
+                batches_iter.close()
+            #Конец данных - None или ошибка обхода
+            put(result)
+
+        producer = threading.Thread(target = produce, name = 'ReportManager-producer', daemon = True)
+        producer.start()
+        try:
+            while True:
+                #Время ожидания пачки - время, на которое вывод отчета опережает обход каталога
+                with self.__phase('wait'):
+                    item = batches.get()
+                if not isinstance(item, list):
+                    break
+                write_func(item)
+            if item is not None:
+                raise item
+        finally:
+            stop.set()
+            producer.join()
+
+    def __iter_batches(self):
+        """Получение пачек записей о файлах/папках из обхода каталога или снимка.
+
+        Yields:
+            list: пачка записей ScanRecord размером не более batch_size
+        """
+        stats = self.__stats
+        rollup = SizeRollup() if self.__dir_sizes else None
+        scan_summary = self.__scan_summary
+        if self.__baseline is not None:
+            records = self.__iter_diff()
+        elif self.__snapshot is None:
+            records = self.__iter_scan(self.__file_path, self.__index, self.__duplicate_finder)
+        else:
+            records = self.__iter_snapshot(self.__snapshot)
+        batch = []
+        try:
+            for record, container in records:
+                batch.append(record)
+                if rollup is not None:
+                    rollup.add(record, container)
+                if scan_summary is not None:
+                    scan_summary.add(record)
+                #Передача пачки записей Writer'ам
+                if len(batch) >= self.__batch_size:
+                    if stats is not None:
+                        stats.count_batch(batch)
+                    yield batch
+                    batch = []
+        finally:
+            records.close()
+        #Закрытие папок последнего пути обхода до передачи последней пачки
+        if rollup is not None:
+            rollup.finish()
+        if scan_summary is not None:
+            scan_summary.finish()
+        if batch:
+            if stats is not None:
+                stats.count_batch(batch)
+            yield batch
+
+    def __iter_scan(self, root, index = None, duplicate_finder = None):
+        """Проход всех вложенных в каталог файлов и папок, в том числе записей архивов.
 
         Args:
-            bytes (int): количество байт
+            root (Path): путь к каталогу
+            index (str | TreeModel | None): путь к файлу индекса сканирования или модель
+                каталога режима наблюдения
+            duplicate_finder (DuplicateFinder | None): поиск дубликатов, в который передаются файлы каталога
 
-        Returns:
-            str: размер файла в читаемом формате
+        Yields:
+            tuple: (запись ScanRecord, у записи могут быть вложенные записи)
         """
-        for unit in ['Б', 'КБ', 'МБ']:
-            if size_bytes < 1024:
-                return f'{size_bytes:.2f}{unit}'
-            size_bytes /= 1024
-        return f'{size_bytes:.2f}ГБ'
\ No newline at end of file
+        stats = self.__stats
+        scan_filter = self.__scan_filter
+        #Рекурсивный перебор структуры каталога
+        #Сканер выдает папку + все файлы из папки подряд в отсортированном порядке
+        #Модель каталога режима наблюдения сама является контекстным менеджером обхода
+        if isinstance(index, TreeModel):
+            index_context = index
+        else:
+            index_context = ScanIndex(index) if index is not None else nullcontext()
+        with index_context as index:
+            archive_inspector = ArchiveInspector(self.__workers, index, stats, scan_filter, **self.__archive_kwargs)
+            scanner = DirScanner(root, self.__workers, index, stats, scan_filter, self.__links,
+                                 self.__one_file_system, archive_inspector)
+            for record, listing in archive_inspector.attach(scanner.scan()):
+                #Обработка файлов/папок
+                if duplicate_finder is not None and not record.is_dir:
+                    duplicate_finder.add(record)
+                yield record, record.is_dir or listing is not None
+                #Дополнительная обработка архивов
+                if listing is not None:
+                    if scan_filter is not None:
+                        listing = scan_filter.filter_listing(scanner.relative_path(record.path),
+                                                             record.depth, listing)
+                    yield from ArchiveInspector.iter_records(record, listing)
+                    if stats is not None:
+                        stats.add(archives = 1, archive_entries = len(listing))
+                elif archive_inspector.inspects(record):
+                    print(f'{record.path} - поврежденный {archive_inspector.archive_format(record.path).NAME}')
+                    if stats is not None:
+                        stats.add(archives_corrupted = 1)
+            if index is not None and stats is not None:
+                stats.add(index_hits = index.hits, index_misses = index.misses)
+
+    def __iter_snapshot(self, snapshot_path):
+        """Перебор записей снимка сканирования.
+
+        Если итоги папок нужны, но не сохранены в снимке, то они вычисляются заново:
+        вложенные записи могут быть у папок и у записей, за которыми следуют более
+        глубокие записи (архивы).
+
+        Args:
+            snapshot_path (str | Path): путь к файлу снимка
+
+        Yields:
+            tuple: (запись ScanRecord, у записи могут быть вложенные записи)
+        """
+        with ScanSnapshot(snapshot_path) as snapshot:
+            if not self.__dir_sizes or snapshot.has_totals:
+                #Итоги не нужны или уже есть в записях
+                for record in snapshot.iter_records(totals = self.__dir_sizes):
+                    yield record, False
+                return
+            previous = None
+            for record in snapshot.iter_records(totals = False):
+                if previous is not None:
+                    yield previous, previous.is_dir or record.depth > previous.depth
+                previous = record
+            if previous is not None:
+                yield previous, previous.is_dir
+
+    def __iter_diff(self):
+        """Перебор изменений каталога или снимка относительно прежнего состояния.
+
+        Текущее и прежнее состояния читаются одновременно и сравниваются слиянием
+        (ScanDiff), поэтому расход памяти не зависит от количества записей.
+        Индекс сканирования используется только для текущего каталога.
+
+        Yields:
+            tuple: (запись ScanRecord, у записи могут быть вложенные записи)
+        """
+        if self.__snapshot is None:
+            current = self.__iter_scan(self.__file_path, self.__index)
+        else:
+            current = self.__iter_snapshot(self.__snapshot)
+        if self.__baseline.is_dir():
+            previous = self.__iter_scan(self.__baseline)
+        else:
+            previous = self.__iter_snapshot(self.__baseline)
+        scan_diff = ScanDiff()
+        try:
+            for record in scan_diff.diff((record for record, _ in previous),
+                                         (record for record, _ in current)):
+                yield record, False
+        finally:
+            current.close()
+            previous.close()
+        if self.__stats is not None:
+            self.__stats.add(**{f'changes_{change.name.lower()}': count
+                                for change, count in scan_diff.counts.items()})
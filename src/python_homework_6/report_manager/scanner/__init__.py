@@ -0,0 +1,16 @@
+from .archive_inspector import ArchiveFormat, ArchiveInspector, TarFormat, ZipFormat
+from .dir_scanner import DirScanner, LinkPolicy
+from .dir_watcher import InotifyWatcher, PollingWatcher
+from .duplicate_finder import DuplicateFinder
+from .scan_diff import ChangeType, ScanDiff
+from .scan_filter import ScanFilter
+from .scan_index import ScanIndex
+from .scan_record import ScanRecord
+from .scan_snapshot import ScanSnapshot, SnapshotBuilder
+from .scan_summary import ScanSummary
+from .size_rollup import SizeRollup
+from .tree_model import TreeModel
+
+__all__ = ['ArchiveFormat', 'ArchiveInspector', 'ChangeType', 'DirScanner', 'DuplicateFinder', 'InotifyWatcher', 'LinkPolicy', 'PollingWatcher',
+           'ScanDiff', 'ScanFilter', 'ScanIndex', 'ScanRecord', 'ScanSnapshot', 'ScanSummary', 'SizeRollup', 'SnapshotBuilder',
+           'TarFormat', 'TreeModel', 'ZipFormat']
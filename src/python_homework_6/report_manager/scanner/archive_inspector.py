@@ -0,0 +1,415 @@
+"""Модуль для получения структуры архивов (ZIP, tar, вложенные архивы).
+
+Содержит классы ArchiveFormat, ZipFormat, TarFormat и ArchiveInspector
+"""
+
+import io
+import os
+import time
+import zlib
+from collections import deque
+from contextlib import closing, nullcontext
+from functools import partial
+from zipfile import BadZipFile, ZipFile
+
+from .scan_record import ScanRecord
+
+
+class ArchiveFormat:
+    """Базовый класс формата архива для ArchiveInspector.
+
+    Формат определяет, какие файлы являются архивами (по расширению), и перечисляет
+    записи архива без распаковки. Для поддержки нового формата нужно унаследовать
+    класс и передать его объект в ArchiveInspector (параметр formats).
+    """
+
+    #Название формата для сообщений
+    NAME = ''
+    #Расширения файлов архивов в нижнем регистре
+    EXTENSIONS = ()
+    #Исключения, возникающие при чтении поврежденного архива
+    ERRORS = ()
+
+    def matches(self, path):
+        """Проверка, является ли файл архивом этого формата.
+
+        Args:
+            path (str): путь или имя файла
+
+        Returns:
+            bool: файл с расширением формата
+        """
+        return path.lower().endswith(type(self).EXTENSIONS)
+
+    def iter_members(self, source):
+        """Перебор записей архива.
+
+        Args:
+            source (str | BinaryIO): путь к архиву или файловый объект вложенного архива
+
+        Yields:
+            tuple: (путь внутри архива, признак папки, размер, время изменения,
+                функция чтения содержимого записи или None)
+        """
+        raise NotImplementedError
+
+
+class ZipFormat(ArchiveFormat):
+    """Формат ZIP: записи берутся из центрального каталога архива."""
+
+    NAME = '.zip'
+    EXTENSIONS = ('.zip',)
+    ERRORS = (BadZipFile, zlib.error, EOFError, NotImplementedError, RuntimeError)
+
+    def iter_members(self, source):
+        """Перебор записей ZIP архива.
+
+        Args:
+            source (str | BinaryIO): путь к архиву или файловый объект вложенного архива
+
+        Yields:
+            tuple: (путь внутри архива, признак папки, размер, время изменения,
+                функция чтения содержимого записи)
+        """
+        with ZipFile(source, 'r') as zipf:
+            for info in zipf.infolist():
+                #Время в ZIP хранится как локальное, поэтому переводится через mktime
+                yield (info.filename, info.is_dir(), info.file_size, int(time.mktime((*info.date_time, 0, 0, -1))),
+                       partial(zipf.read, info))
+
+
+class TarFormat(ArchiveFormat):
+    """Формат tar (в том числе сжатый gzip, bzip2, xz).
+
+    Архив читается в потоковом режиме: заголовки записей читаются
+    последовательно, данные записей пропускаются без распаковки на диск.
+    """
+
+    NAME = '.tar'
+    EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+    @property
+    def ERRORS(self):  # noqa: N802
+        """Исключения, возникающие при чтении поврежденного архива.
+
+        Returns:
+            tuple: классы исключений
+        """
+        #tarfile и lzma импортируются только при чтении tar архивов
+        import lzma
+        import tarfile
+        return (tarfile.TarError, EOFError, OSError, zlib.error, lzma.LZMAError)
+
+    def iter_members(self, source):
+        """Перебор записей tar архива.
+
+        Args:
+            source (str | BinaryIO): путь к архиву или файловый объект вложенного архива
+
+        Yields:
+            tuple: (путь внутри архива, признак папки, размер, время изменения,
+                функция чтения содержимого записи или None для не файлов)
+        """
+        #tarfile импортируется только при чтении tar архивов
+        import tarfile
+        source_kwargs = {'name': source} if isinstance(source, str) else {'fileobj': source}
+        with tarfile.open(mode = 'r|*', **source_kwargs) as tar:
+            for info in tar:
+                #В потоковом режиме содержимое доступно только для текущей записи
+                yield (info.name, info.isdir(), info.size, int(info.mtime),
+                       partial(self._read, tar, info) if info.isfile() else None)
+
+    @staticmethod
+    def _read(tar, info):
+        """Чтение содержимого текущей записи архива.
+
+        Args:
+            tar (TarFile): архив
+            info (TarInfo): запись архива
+
+        Returns:
+            bytes: содержимое записи
+        """
+        with tar.extractfile(info) as member:
+            return member.read()
+
+
+class ArchiveInspector:
+    """Класс для получения списка файлов и папок архивов.
+
+    Форматы архивов подключаются объектами ArchiveFormat (по умолчанию ZIP и tar).
+    Папки, которые не указаны в архиве явно, восстанавливаются по путям файлов
+    за линейное время работой со строками. Вложенные архивы не больше nested_size
+    читаются в память и выводятся как папки с содержимым, не глубже max_nesting
+    уровней. Чтение одного архива (вместе с вложенными) ограничено временем timeout,
+    после которого выводятся уже прочитанные записи.
+
+    Списки архивов могут кэшироваться в индексе сканирования по ключу (путь, размер,
+    время изменения), а несколько архивов могут читаться одновременно в пуле потоков.
+    """
+
+    #Количество записей каталога, просматриваемых вперед в поиске архивов
+    LOOKAHEAD = 256
+    #Форматы архивов по умолчанию
+    FORMATS = (ZipFormat(), TarFormat())
+
+    def __init__(self, workers = 1, index = None, stats = None, scan_filter = None, formats = None,
+                 nested_size = 16 * 1024 * 1024, max_nesting = 3, timeout = None):
+        """Инициализация объекта класса.
+
+        Args:
+            workers (int): количество потоков для чтения архивов
+            index (ScanIndex | None): открытый индекс для кэширования списков архивов
+            stats (ReportStats | None): статистика для учета времени чтения архивов
+            scan_filter (ScanFilter | None): фильтр записей, архивы глубже max_depth не открываются
+            formats (Iterable | None): форматы архивов ArchiveFormat, None - FORMATS
+            nested_size (int): максимальный размер вложенного архива, читаемого в память (байт)
+            max_nesting (int): максимальная глубина вложенности архивов в архивах (0 - вложенные
+                архивы не читаются)
+            timeout (float | None): предельное время чтения одного архива (с), None - без ограничения
+
+        Raises:
+            ValueError: недопустимый размер, глубина или время
+        """
+        if nested_size < 0:
+            raise ValueError(f'Недопустимый размер вложенного архива {nested_size}')
+        if max_nesting < 0:
+            raise ValueError(f'Недопустимая глубина вложенности архивов {max_nesting}')
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f'Недопустимое время чтения архива {timeout}')
+        self._workers = workers
+        self._index = index
+        self._stats = stats
+        self._filter = scan_filter
+        self._formats = tuple(formats) if formats is not None else type(self).FORMATS
+        self._nested_size = nested_size
+        self._max_nesting = max_nesting
+        self._timeout = timeout
+
+    @classmethod
+    def is_archive_name(cls, path):
+        """Проверка, является ли файл архивом одного из форматов по умолчанию.
+
+        Args:
+            path (str): путь или имя файла
+
+        Returns:
+            bool: файл с расширением архива
+        """
+        return any(archive_format.matches(path) for archive_format in cls.FORMATS)
+
+    def archive_format(self, path):
+        """Получение формата архива по имени файла.
+
+        Args:
+            path (str): путь или имя файла
+
+        Returns:
+            ArchiveFormat | None: формат архива или None, если файл не архив
+        """
+        for archive_format in self._formats:
+            if archive_format.matches(path):
+                return archive_format
+        return None
+
+    def is_archive(self, record):
+        """Проверка, является ли запись сканера архивом.
+
+        Args:
+            record (ScanRecord): запись сканера
+
+        Returns:
+            bool: запись - файл (не ссылка) с расширением архива
+        """
+        return not record.is_dir and record.link is None and self.archive_format(record.path) is not None
+
+    def inspects(self, record):
+        """Проверка, нужно ли читать список архива для записи сканера.
+
+        Args:
+            record (ScanRecord): запись сканера
+
+        Returns:
+            bool: запись - архив, содержимое которого выводится в отчет
+        """
+        return self.is_archive(record) and (self._filter is None or self._filter.descends(record.depth))
+
+    @staticmethod
+    def iter_records(archive_record, listing):
+        """Преобразование списка архива в записи о файлах/папках.
+
+        Args:
+            archive_record (ScanRecord): запись об архиве
+            listing (list): записи архива
+
+        Yields:
+            tuple: (запись ScanRecord о файле/папке внутри архива, у записи есть вложенные
+                записи - папка или вложенный архив)
+        """
+        prefix = archive_record.path + os.sep
+        depth = archive_record.depth + 1
+        for i, (key, is_dir, size, mtime) in enumerate(listing):
+            #За вложенным архивом следуют его записи
+            container = is_dir or (i + 1 < len(listing) and listing[i + 1][0].startswith(key + '/'))
+            yield ScanRecord(prefix + (key if os.sep == '/' else key.replace('/', os.sep)),
+                             size, mtime, depth + key.count('/'), is_dir), container
+
+    def attach(self, records):
+        """Добавление списков архивов к записям сканера.
+
+        Архивы из следующих LOOKAHEAD записей читаются заранее в пуле потоков,
+        порядок записей не меняется.
+
+        Args:
+            records (Iterable): записи сканера
+
+        Yields:
+            tuple: (запись, список архива или None - не архив или поврежденный архив)
+        """
+        if self._workers == 1:
+            for record in records:
+                yield record, self.list_archive(record.path, record.size, record.mtime) if self.inspects(record) else None
+            return
+
+        #concurrent.futures импортируется только при параллельном чтении архивов
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(self._workers) as pool:
+            pending = deque()
+            for record in records:
+                pending.append((record, pool.submit(self.list_archive, record.path, record.size, record.mtime)
+                                if self.inspects(record) else None))
+                if len(pending) > type(self).LOOKAHEAD:
+                    yield self._result(*pending.popleft())
+            while pending:
+                yield self._result(*pending.popleft())
+
+    @staticmethod
+    def _result(record, listing):
+        """Получение результата чтения архива.
+
+        Args:
+            record (ScanRecord): запись сканера
+            listing (Future | None): задача чтения архива
+
+        Returns:
+            tuple: (запись, список архива или None)
+        """
+        return record, listing.result() if listing is not None else None
+
+    def list_archive(self, archive_path, size, mtime):
+        """Получение списка файлов и папок архива (из кэша или чтением архива).
+
+        Args:
+            archive_path (str): путь к архиву
+            size (int): размер архива
+            mtime (int): время изменения архива
+
+        Returns:
+            list | None: отсортированные записи архива (путь внутри архива через '/',
+                признак папки, размер, время изменения или None) или None для поврежденного архива
+        """
+        if self._index is not None:
+            listing = self._index.lookup_zip(archive_path, size, mtime)
+            if listing is not None:
+                if self._stats is not None:
+                    self._stats.add(archives_cached = 1)
+                return listing
+        archive_format = self.archive_format(archive_path)
+        deadline = time.monotonic() + self._timeout if self._timeout is not None else None
+        phase = self._stats.phase('archive') if self._stats is not None else nullcontext()
+        try:
+            with phase:
+                listing, truncated = self._read_listing(archive_format, archive_path, archive_path, 0, deadline)
+        except archive_format.ERRORS:
+            return None
+        if self._stats is not None:
+            self._stats.add(archives_read = 1)
+        if truncated:
+            #Неполный список не кэшируется, при следующем обходе архив читается заново
+            print(f'{archive_path} - превышено время чтения архива, выведена часть записей')
+            if self._stats is not None:
+                self._stats.add(archives_truncated = 1)
+        elif self._index is not None:
+            self._index.store_zip(archive_path, size, mtime, listing)
+        return listing
+
+    def _read_listing(self, archive_format, source, archive_path, nesting, deadline):
+        """Чтение списка архива вместе с вложенными архивами.
+
+        Args:
+            archive_format (ArchiveFormat): формат архива
+            source (str | BinaryIO): путь к архиву или файловый объект вложенного архива
+            archive_path (str): путь к архиву для сообщений
+            nesting (int): глубина вложенности архива (0 - архив в каталоге)
+            deadline (float | None): время (time.monotonic), после которого чтение прекращается
+
+        Returns:
+            tuple: (отсортированные записи архива, чтение прервано по времени)
+        """
+        members = []
+        nested = []
+        truncated = False
+        with closing(archive_format.iter_members(source)) as members_iter:
+            for name, is_dir, size, mtime, read in members_iter:
+                if deadline is not None and time.monotonic() > deadline:
+                    truncated = True
+                    break
+                key = '/'.join(part for part in name.split('/') if part and part != '.')
+                if not key:
+                    continue
+                members.append((key, is_dir, size, mtime))
+                nested_format = None
+                if read is not None and nesting < self._max_nesting and size <= self._nested_size:
+                    nested_format = self.archive_format(key)
+                if nested_format is None:
+                    continue
+                #Вложенный архив читается из памяти
+                try:
+                    nested_listing, truncated = self._read_listing(nested_format, io.BytesIO(read()),
+                                                                   f'{archive_path}/{key}', nesting + 1, deadline)
+                except (*archive_format.ERRORS, *nested_format.ERRORS):
+                    print(f'{archive_path}/{key} - поврежденный {nested_format.NAME}')
+                    if self._stats is not None:
+                        self._stats.add(archives_corrupted = 1)
+                    continue
+                nested.append((key, nested_listing))
+                if self._stats is not None:
+                    self._stats.add(archives_nested = 1)
+                if truncated:
+                    break
+        listing = self.build_listing(members)
+        for key, nested_listing in nested:
+            listing.extend((f'{key}/{nested_key}', *item) for nested_key, *item in nested_listing)
+        #Сортировка по частям пути, чтобы записи каждой папки шли сразу за ней
+        listing.sort(key = lambda item: item[0].split('/'))
+        return listing, truncated
+
+    @staticmethod
+    def build_listing(members):
+        """Построение списка записей архива с восстановлением папок.
+
+        В архиве могут отсутствовать отдельные папки, поэтому они
+        восстанавливаются по путям файлов. Такие папки выводятся без даты
+        изменения, а явные записи архива с теми же путями пропускаются.
+
+        Args:
+            members (list): записи архива (путь через '/', признак папки, размер, время изменения)
+
+        Returns:
+            list: записи архива (путь, признак папки, размер, время изменения или None)
+        """
+        folders = set()
+        for key, _, _, _ in members:
+            #Добавление всех родительских папок, начиная с ближайшей. Если папка уже
+            #добавлена, то добавлены и все ее родители
+            sep = key.rfind('/')
+            while sep > 0:
+                folder = key[:sep]
+                if folder in folders:
+                    break
+                folders.add(folder)
+                sep = folder.rfind('/')
+
+        listing = [(folder, True, 0, None) for folder in folders]
+        listing.extend(member for member in members if member[0] not in folders)
+        return listing
@@ -0,0 +1,372 @@
+"""Модуль для обхода структуры каталога.
+
+Содержит классы LinkPolicy(Enum) и DirScanner
+"""
+
+import os
+import stat as stat_mode
+from collections import deque
+from enum import Enum
+from itertools import islice
+
+from .scan_record import ScanRecord
+
+
+class LinkPolicy(Enum):
+    """Набор значений "Обработка символических ссылок" при обходе каталога.
+
+    Args:
+        Enum (str): название политики
+    """
+    #Ссылки на папки обходятся как папки, ссылки на файлы выводятся как файлы
+    FOLLOW = 'follow'
+    #Ссылки не выводятся в отчет
+    SKIP = 'skip'
+    #Ссылки выводятся со ссылкой на цель, но не обходятся
+    REPORT = 'report'
+
+
+class DirScanner:
+    """Класс сканера структуры каталога на основе os.scandir.
+
+    Каталоги читаются через os.scandir, данные о типе записи берутся из
+    закэшированных данных DirEntry, поэтому для каждой записи выполняется не
+    более одного вызова stat. Соседние подкаталоги могут читаться параллельно
+    в пуле потоков, при этом записи выдаются потоково в том же порядке, что и
+    sorted(Path.rglob('*')): обход в глубину с сортировкой по имени.
+
+    Фильтр применяется во время обхода: исключенные записи отбрасываются до
+    вызова stat, исключенные и слишком глубокие подкаталоги не читаются.
+
+    Каждый физический каталог (st_dev, st_ino) обходится один раз: повторные
+    вхождения (bind mount, ссылки на уже пройденные папки, циклы ссылок) и
+    повторные жесткие ссылки на файл выводятся как ссылки на первую запись.
+    Для файлов с несколькими жесткими ссылками stat выполняется один раз на inode.
+    """
+
+    def __init__(self, root, workers = 1, index = None, stats = None, scan_filter = None,
+                 links = LinkPolicy.REPORT, one_file_system = False, archive_inspector = None):
+        """Инициализация сканера.
+
+        Args:
+            root (str | Path): путь к анализируемому каталогу
+            workers (int): количество потоков для чтения каталогов
+            index (ScanIndex | None): открытый индекс для повторного использования
+                списков неизмененных каталогов
+            stats (ReportStats | None): статистика для подсчета вызовов scandir и stat
+            scan_filter (ScanFilter | None): фильтр записей
+            links (LinkPolicy | str): обработка символических ссылок
+            one_file_system (bool): не обходить каталоги других файловых систем (точки монтирования)
+            archive_inspector (ArchiveInspector | None): объект чтения архивов, архивы его форматов
+                выводятся как папки и не проверяются фильтром файлов, None - архивы не читаются
+
+        Raises:
+            ValueError: недопустимое количество потоков или политика ссылок
+        """
+        if workers < 1:
+            raise ValueError(f'Недопустимое количество потоков {workers}')
+        try:
+            self._links = LinkPolicy(links)
+        except ValueError:
+            raise ValueError(f'Недопустимая обработка ссылок {links}') from None
+        self._one_file_system = one_file_system
+        self._root_dev = None
+        #Результаты stat файлов с несколькими жесткими ссылками по (st_dev, st_ino)
+        self._inode_stats = {}
+        self._root = os.fspath(root)
+        self._workers = workers
+        self._index = index
+        self._stats = stats
+        self._filter = scan_filter
+        self._archive_inspector = archive_inspector
+        #Длина префикса пути анализируемого каталога для получения относительных путей
+        self._root_len = len(self._root) + (0 if self._root.endswith(os.sep) else 1)
+        self._prune = self._is_excluded if scan_filter is not None and scan_filter.excludes else None
+
+    def scan(self):
+        """Потоковый обход всех вложенных в каталог файлов и папок.
+
+        Записи каждого каталога сортируются локально и выдаются сразу, без
+        построения списка всего дерева. В памяти хранятся только списки
+        каталогов текущего пути и заранее прочитанные соседние подкаталоги.
+
+        Yields:
+            ScanRecord: запись о файле/папке
+        """
+        pool = None
+        if self._workers > 1:
+            #concurrent.futures импортируется только при параллельном обходе
+            from concurrent.futures import ThreadPoolExecutor
+            pool = ThreadPoolExecutor(self._workers)
+        try:
+            root_stat = os.stat(self._root)  # noqa: PTH116
+            self._root_dev = root_stat.st_dev
+            root_mtime = root_stat.st_mtime if self._index is not None else None
+            #Пройденные каталоги и файлы с несколькими жесткими ссылками: (st_dev, st_ino) -> путь первой записи
+            visited = {(root_stat.st_dev, root_stat.st_ino): self._root}
+            references = 0
+            #Стек уровней обхода в глубину
+            stack = [self._iter_level(pool if self._descends(0) else None,
+                                      self._list_dir(self._root, root_mtime, root_stat.st_dev))]
+            while stack:
+                item = next(stack[-1], None)
+                if item is None:
+                    stack.pop()
+                    continue
+                entry, listing = item
+                depth = len(stack) - 1
+                if self._filter is not None and entry[2] and not self._accepts_file(entry):
+                    continue
+                walks = self._walks(entry)
+                link = None
+                if entry[5] and (self._links is LinkPolicy.REPORT or (not entry[2] and entry[6] is None)):
+                    #Ссылка без обхода или битая ссылка выводится с целью ссылки
+                    link = self._read_link(entry[0])
+                elif entry[6] is not None:
+                    #Повторное вхождение каталога или файла выводится как ссылка и не обходится
+                    link = visited.setdefault(entry[6], entry[0])
+                    if link == entry[0]:
+                        link = None
+                    else:
+                        walks = False
+                        references += 1
+                yield ScanRecord(entry[0], entry[3], int(entry[4]), depth, not entry[2], link = link)
+                if walks and self._descends(depth):
+                    entries = (listing.result() if listing is not None
+                               else self._list_dir(entry[0], entry[4], entry[6][0]))
+                    #Подкаталоги следующего уровня читаются заранее, только если их содержимое выводится
+                    stack.append(self._iter_level(pool if self._descends(depth + 1) else None, entries))
+            if self._stats is not None and references:
+                self._stats.add(link_references = references)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures = True)
+
+    def _walks(self, entry):
+        """Проверка, нужно ли обходить запись каталога как папку.
+
+        Args:
+            entry (tuple): запись каталога
+
+        Returns:
+            bool: запись - папка (или ссылка на папку при LinkPolicy.FOLLOW) той же файловой
+                системы, если задан one_file_system
+        """
+        if entry[5]:
+            #Для ссылки признак файла и inode относятся к цели ссылки
+            is_dir = self._links is LinkPolicy.FOLLOW and not entry[2] and entry[6] is not None
+        else:
+            is_dir = entry[1]
+        return is_dir and not (self._one_file_system and entry[6][0] != self._root_dev)
+
+    @staticmethod
+    def _read_link(path):
+        """Получение цели символической ссылки.
+
+        Args:
+            path (str): путь к ссылке
+
+        Returns:
+            str: цель ссылки, '' - если ссылку не удалось прочитать
+        """
+        try:
+            return os.readlink(path)  # noqa: PTH115
+        except OSError:
+            return ''
+
+    def _descends(self, depth):
+        """Проверка, нужно ли читать подкаталоги записей глубины depth.
+
+        Args:
+            depth (int): глубина вложенности папки
+
+        Returns:
+            bool: содержимое папки выводится в отчет
+        """
+        return self._filter is None or self._filter.descends(depth)
+
+    def relative_path(self, path):
+        """Получение пути относительно анализируемого каталога через '/'.
+
+        Args:
+            path (str): полный путь
+
+        Returns:
+            str: относительный путь
+        """
+        rel_path = path[self._root_len:]
+        return rel_path if os.sep == '/' else rel_path.replace(os.sep, '/')
+
+    def _is_excluded(self, path, name):
+        """Проверка записи по шаблонам исключения фильтра.
+
+        Args:
+            path (str): полный путь к записи
+            name (str): имя записи
+
+        Returns:
+            bool: запись исключена
+        """
+        return self._filter.is_excluded(name, self.relative_path(path))
+
+    def _accepts_file(self, entry):
+        """Проверка файла по шаблонам включения, размеру и времени изменения фильтра.
+
+        Args:
+            entry (tuple): запись каталога
+
+        Returns:
+            bool: файл выводится в отчет
+        """
+        rel_path = self.relative_path(entry[0])
+        #Архивы выводятся как папки, записи внутри них фильтруются отдельно
+        if self._archive_inspector is not None and self._archive_inspector.archive_format(rel_path) is not None:
+            return True
+        return self._filter.accepts_file(rel_path.rpartition('/')[2], rel_path, entry[3], entry[4])
+
+    def _pruned(self, entries):
+        """Удаление исключенных записей из списка каталога.
+
+        Args:
+            entries (list): записи каталога
+
+        Returns:
+            list: записи каталога без исключенных
+        """
+        if self._links is LinkPolicy.SKIP:
+            entries = [e for e in entries if not e[5]]
+        if self._prune is None:
+            return entries
+        return [e for e in entries if not self._prune(e[0], os.path.basename(e[0]))]  # noqa: PTH119
+
+    def _iter_level(self, pool, entries):
+        """Перебор записей одного каталога с упреждающим чтением подкаталогов.
+
+        В пуле потоков одновременно читается не более workers следующих
+        подкаталогов этого уровня, что ограничивает расход памяти.
+
+        Args:
+            pool (ThreadPoolExecutor | None): пул потоков для чтения каталогов
+            entries (list): отсортированные записи каталога
+
+        Yields:
+            tuple: (запись, Future со списком записей подкаталога или None)
+        """
+        if pool is None:
+            for entry in entries:
+                yield entry, None
+            return
+
+        subdirs = (e for e in entries if self._walks(e))
+        prefetched = deque(pool.submit(self._list_dir, d[0], d[4], d[6][0]) for d in islice(subdirs, self._workers))
+        for entry in entries:
+            if not self._walks(entry):
+                yield entry, None
+                continue
+            listing = prefetched.popleft()
+            next_dir = next(subdirs, None)
+            if next_dir is not None:
+                prefetched.append(pool.submit(self._list_dir, next_dir[0], next_dir[4], next_dir[6][0]))
+            yield entry, listing
+
+    def _list_dir(self, dir_path, dir_mtime, dir_dev):
+        """Получение записей каталога из индекса или чтением каталога.
+
+        Args:
+            dir_path (str): путь к каталогу
+            dir_mtime (float | None): текущее время изменения каталога
+            dir_dev (int): устройство каталога (st_dev)
+
+        Returns:
+            list: записи каталога, отсортированные по имени
+        """
+        if self._index is not None:
+            entries = self._index.lookup(dir_path, dir_mtime)
+            if entries is not None:
+                entries = self._pruned(entries)
+                try:
+                    #Подкаталоги могли измениться, поэтому их время изменения обновляется
+                    entries = [(*e[:3], *self._dir_stat(e[0]), *e[5:]) if self._walks(e) else e for e in entries]
+                except OSError:
+                    pass
+                else:
+                    if self._stats is not None:
+                        self._stats.add(stat_calls = sum(1 for e in entries if self._walks(e)))
+                    return entries
+        #В индекс сохраняется полный список каталога, так как фильтр и обработка ссылок могут меняться между запусками
+        entries = self._read_dir(dir_path, dir_dev, self._prune if self._index is None else None)
+        if self._index is not None:
+            self._index.store(dir_path, dir_mtime, entries)
+            entries = self._pruned(entries)
+        elif self._links is LinkPolicy.SKIP:
+            entries = [e for e in entries if not e[5]]
+        return entries
+
+    @staticmethod
+    def _dir_stat(dir_path):
+        """Получение размера и времени изменения подкаталога (или цели ссылки на папку).
+
+        Args:
+            dir_path (str): путь к подкаталогу
+
+        Returns:
+            tuple: (размер, время изменения)
+        """
+        stat = os.stat(dir_path)  # noqa: PTH116
+        return stat.st_size, stat.st_mtime
+
+    def _read_dir(self, dir_path, dir_dev, prune = None):
+        """Чтение одного каталога через os.scandir.
+
+        Запись каталога - (путь, признак папки, признак файла, размер, время изменения,
+        признак символической ссылки, (st_dev, st_ino) или None). Номер inode сохраняется
+        для папок и файлов с несколькими жесткими ссылками (для ссылок - номер цели).
+
+        Args:
+            dir_path (str): путь к каталогу
+            dir_dev (int): устройство каталога (st_dev)
+            prune (Callable | None): проверка prune(path, name) исключения записи до вызова stat
+
+        Returns:
+            list: записи каталога, отсортированные по имени
+        """
+        inode_stats = self._inode_stats
+        entries = []
+        stat_cached = 0
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if prune is not None and prune(entry.path, entry.name):
+                        continue
+                    #Тип записи берется из DirEntry без дополнительных вызовов
+                    is_dir = entry.is_dir(follow_symlinks = False)
+                    is_link = entry.is_symlink()
+                    is_file = entry.is_file()
+                    #Номер inode файла известен без stat, поэтому stat жестких ссылок не повторяется
+                    key = (dir_dev, entry.inode()) if is_file and not is_link else None
+                    stat = inode_stats.get(key)
+                    if stat is not None:
+                        stat_cached += 1
+                    else:
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            #Битая символическая ссылка
+                            stat = entry.stat(follow_symlinks = False)
+                    inode = None
+                    if stat_mode.S_ISDIR(stat.st_mode) or stat.st_nlink > 1:
+                        inode = (stat.st_dev, stat.st_ino)
+                        if key is not None and stat.st_nlink > 1:
+                            inode_stats[key] = stat
+                    entries.append((entry.path, is_dir, is_file, stat.st_size, stat.st_mtime,
+                                    is_link, inode, os.path.normcase(entry.name)))
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            #Недоступные каталоги пропускаются, как и в Path.rglob
+            return []
+        if self._stats is not None:
+            #Для каждой записи каталога выполняется не более одного вызова stat
+            self._stats.add(scandir_calls = 1, stat_calls = len(entries) - stat_cached)
+            if stat_cached:
+                self._stats.add(stat_cached = stat_cached)
+        entries.sort(key = lambda e: e[7])
+        return [e[:7] for e in entries]
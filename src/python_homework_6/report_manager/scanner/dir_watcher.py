@@ -0,0 +1,288 @@
+"""Модуль для отслеживания изменений каталогов модели структуры каталога.
+
+Содержит классы InotifyWatcher и PollingWatcher
+"""
+
+import errno
+import os
+import select
+import struct
+import time
+from contextlib import suppress
+
+from .archive_inspector import ArchiveInspector
+
+#Флаги событий inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+
+class InotifyWatcher:
+    """Класс отслеживания изменений каталогов модели через inotify (Linux).
+
+    На каждый каталог модели (TreeModel) ставится наблюдение inotify. Событие
+    внутри каталога отмечает измененным сам каталог, а если событие относится
+    к архиву - то и архив. Новые подкаталоги начинают отслеживаться сразу
+    при создании. Используется как контекстный менеджер.
+    """
+
+    #Отслеживаемые события
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    #Заголовок события: дескриптор наблюдения, флаги, cookie, длина имени
+    EVENT = struct.Struct('iIII')
+    #Размер буфера чтения событий
+    BUFFER_SIZE = 65536
+
+    def __init__(self, model, ignore = ()):
+        """Инициализация inotify.
+
+        Args:
+            model (TreeModel): модель, каталоги которой отслеживаются
+            ignore (Iterable): пути файлов, изменения которых не учитываются (файлы отчетов)
+
+        Raises:
+            OSError: inotify недоступен
+        """
+        #ctypes импортируется только в режиме наблюдения
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno = True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify недоступен')
+        self._libc = libc
+        #Получение errno последнего вызова libc
+        self._get_errno = ctypes.get_errno
+        self._model = model
+        self._ignore = frozenset(ignore)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = self._get_errno()
+            raise OSError(err, os.strerror(err))
+        #Пути каталогов по дескрипторам наблюдения и наоборот
+        self._paths = {}
+        self._watches = {}
+
+    def __enter__(self):
+        """Получение объекта наблюдения.
+
+        Returns:
+            InotifyWatcher: объект наблюдения
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Закрытие inotify."""
+        self.close()
+
+    def close(self):
+        """Закрытие inotify и снятие всех наблюдений."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_watch(self, dir_path):
+        """Добавление наблюдения за каталогом.
+
+        Args:
+            dir_path (str): путь к каталогу
+
+        Raises:
+            OSError: превышен предел количества наблюдений
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), type(self).MASK)
+        if wd < 0:
+            err = self._get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                #Каталог уже удален или недоступен
+                return
+            raise OSError(err, os.strerror(err), dir_path)
+        self._paths[wd] = dir_path
+        self._watches[dir_path] = wd
+
+    def sync(self):
+        """Добавление наблюдений за новыми каталогами модели.
+
+        Raises:
+            OSError: превышен предел количества наблюдений
+        """
+        for dir_path, _, _ in self._model.dirs():
+            if dir_path not in self._watches:
+                self._add_watch(dir_path)
+
+    def wait(self, timeout):
+        """Ожидание изменений.
+
+        Args:
+            timeout (float): максимальное время ожидания (с)
+
+        Raises:
+            OSError: превышен предел количества наблюдений при добавлении нового каталога
+
+        Returns:
+            set: пути измененных каталогов и архивов, пустое множество - изменений не было
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, type(self).BUFFER_SIZE)
+            except BlockingIOError:
+                break
+            self._parse_events(data, changed)
+        return changed
+
+    def _parse_events(self, data, changed):
+        """Разбор прочитанных событий inotify.
+
+        Args:
+            data (bytes): события
+            changed (set): пути измененных каталогов и архивов, дополняются
+        """
+        header = type(self).EVENT
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = header.unpack_from(data, offset)
+            name = data[offset + header.size:offset + header.size + length].rstrip(b'\0')
+            offset += header.size + length
+            if mask & IN_Q_OVERFLOW:
+                #События потеряны, поэтому все каталоги читаются заново
+                changed.update(dir_path for dir_path, _, _ in self._model.dirs())
+                continue
+            dir_path = self._paths.get(wd)
+            if dir_path is None:
+                continue
+            if mask & IN_IGNORED:
+                #Каталог удален, наблюдение снято
+                del self._paths[wd]
+                if self._watches.get(dir_path) == wd:
+                    del self._watches[dir_path]
+                continue
+            if not name:
+                changed.add(dir_path)
+                continue
+            path = os.path.join(dir_path, os.fsdecode(name))  # noqa: PTH118
+            if path in self._ignore:
+                continue
+            changed.add(dir_path)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_watch(path)
+            elif ArchiveInspector.is_archive_name(path):
+                changed.add(path)
+
+
+class PollingWatcher:
+    """Класс отслеживания изменений каталогов модели периодической проверкой.
+
+    Используется, если inotify недоступен. При каждой проверке сравниваются
+    время изменения каталогов модели и размер/время изменения их файлов.
+    """
+
+    def __init__(self, model, interval = 2.0, ignore = ()):
+        """Инициализация проверки.
+
+        Args:
+            model (TreeModel): модель, каталоги которой проверяются
+            interval (float): период проверки (с)
+            ignore (Iterable): пути файлов, изменения которых не учитываются (файлы отчетов)
+        """
+        self._model = model
+        self._ignore = frozenset(ignore)
+        self._interval = interval
+        self._next_poll = time.monotonic() + interval
+
+    def __enter__(self):
+        """Получение объекта наблюдения.
+
+        Returns:
+            PollingWatcher: объект наблюдения
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Завершение проверки."""
+        self.close()
+
+    def close(self):
+        """Завершение проверки (ресурсы не используются)."""
+
+    def sync(self):
+        """Обновление списка каталогов (каталоги берутся из модели при каждой проверке)."""
+
+    def wait(self, timeout):
+        """Ожидание очередной проверки и проверка изменений.
+
+        Args:
+            timeout (float): максимальное время ожидания (с)
+
+        Returns:
+            set: пути измененных каталогов и архивов, пустое множество - изменений не было
+        """
+        delay = self._next_poll - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return set()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_poll = time.monotonic() + self._interval
+        return self._poll()
+
+    def _poll(self):
+        """Проверка изменений каталогов и файлов модели.
+
+        Returns:
+            set: пути измененных каталогов и архивов
+        """
+        changed = set()
+        for dir_path, mtime, entries in self._model.dirs():
+            try:
+                if os.stat(dir_path).st_mtime != mtime:  # noqa: PTH116
+                    changed.add(dir_path)
+                    continue
+            except OSError:
+                changed.add(dir_path)
+                continue
+            for entry in entries:
+                path = entry[0]
+                if entry[1] or path in self._ignore:
+                    continue
+                stat = self._stat(path)
+                if stat is None or stat.st_size != entry[3] or stat.st_mtime != entry[4]:
+                    changed.add(dir_path)
+                    if ArchiveInspector.is_archive_name(path):
+                        changed.add(path)
+        return changed
+
+    @staticmethod
+    def _stat(path):
+        """Получение stat записи так же, как при обходе каталога (DirScanner).
+
+        Для символических ссылок берется stat цели, а для битых ссылок - stat
+        самой ссылки, иначе битая ссылка считалась бы измененной при каждой проверке.
+
+        Args:
+            path (str): путь к записи
+
+        Returns:
+            os.stat_result | None: stat записи или None, если запись удалена
+        """
+        with suppress(OSError):
+            return os.stat(path)  # noqa: PTH116
+        try:
+            return os.stat(path, follow_symlinks = False)  # noqa: PTH116
+        except OSError:
+            return None
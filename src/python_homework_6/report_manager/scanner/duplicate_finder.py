@@ -0,0 +1,141 @@
+"""Модуль с поиском файлов-дубликатов по результатам сканирования каталога.
+
+Содержит класс DuplicateFinder
+"""
+
+import mmap
+from itertools import repeat
+
+
+class DuplicateFinder:
+    """Класс поиска файлов с одинаковым содержимым.
+
+    Файлы отбираются в три этапа, каждый следующий выполняется только для групп
+    из нескольких файлов, оставшихся после предыдущего:
+
+    1. размер файла - известен из сканирования, файлы не читаются;
+    2. хэш первых и последних PARTIAL_SIZE байт файла;
+    3. хэш всего файла (для файлов не больше 2 * PARTIAL_SIZE хэш из этапа 2
+       уже покрывает все содержимое).
+
+    Файлы читаются через mmap, хэш вычисляется по отображенной памяти без
+    копирования, а hashlib освобождает GIL, поэтому несколько файлов хэшируются
+    параллельно в пуле потоков. Пустые файлы и записи внутри архивов не
+    учитываются, как и записи-ссылки (жесткие ссылки на один inode не дубликаты),
+    недоступные для чтения файлы пропускаются.
+    """
+
+    #Количество байт начала и конца файла для частичного хэша
+    PARTIAL_SIZE = 4096
+
+    def __init__(self, workers = 1, stats = None):
+        """Инициализация поиска.
+
+        Args:
+            workers (int): количество потоков для хэширования файлов
+            stats (ReportStats | None): статистика для подсчета прочитанных файлов и байт
+        """
+        self._workers = workers
+        self._stats = stats
+        #Пути файлов по размерам
+        self._by_size = {}
+
+    def add(self, record):
+        """Учет файла из сканирования каталога.
+
+        Args:
+            record (ScanRecord): запись о файле
+        """
+        if record.size > 0 and record.link is None:
+            self._by_size.setdefault(record.size, []).append(record.path)
+
+    @classmethod
+    def _hash_file(cls, path, partial):
+        """Вычисление хэша файла через mmap.
+
+        Args:
+            path (str): путь к файлу
+            partial (bool): хэшировать только начало и конец файла
+
+        Returns:
+            tuple: (хэш или None - файл недоступен, количество прочитанных байт)
+        """
+        #hashlib импортируется только при поиске дубликатов
+        import hashlib
+        digest = hashlib.blake2b(digest_size = 20)
+        try:
+            with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as data:  # noqa: PTH123
+                size = len(data)
+                with memoryview(data) as view:
+                    if partial and size > 2 * cls.PARTIAL_SIZE:
+                        digest.update(view[:cls.PARTIAL_SIZE])
+                        digest.update(view[-cls.PARTIAL_SIZE:])
+                        size = 2 * cls.PARTIAL_SIZE
+                    else:
+                        digest.update(view)
+        except (OSError, ValueError):
+            #Файл удален, недоступен или стал пустым после сканирования
+            return None, 0
+        return digest.digest(), size
+
+    def _regroup(self, groups, partial, map_func):
+        """Разбиение групп файлов по хэшу содержимого.
+
+        Args:
+            groups (list): группы (размер, пути файлов)
+            partial (bool): хэшировать только начало и конец файлов
+            map_func (Callable): функция map для вычисления хэшей
+
+        Returns:
+            list: группы (размер, пути файлов) из нескольких файлов с одинаковым хэшем
+        """
+        paths = [path for _, group_paths in groups for path in group_paths]
+        hashes = iter(map_func(self._hash_file, paths, repeat(partial)))
+        result = []
+        read_bytes = 0
+        for size, group_paths in groups:
+            by_hash = {}
+            for path in group_paths:
+                digest, read = next(hashes)
+                read_bytes += read
+                if digest is not None:
+                    by_hash.setdefault(digest, []).append(path)
+            result.extend((size, same) for same in by_hash.values() if len(same) > 1)
+        if self._stats is not None:
+            counter = 'partial_hashes' if partial else 'full_hashes'
+            self._stats.add(**{counter: len(paths)}, hashed_bytes = read_bytes)
+        return result
+
+    def find(self):
+        """Поиск групп файлов с одинаковым содержимым.
+
+        Returns:
+            list: группы (размер файла, отсортированные пути файлов), начиная с групп,
+                занимающих больше всего лишнего места
+        """
+        groups = [(size, paths) for size, paths in self._by_size.items() if len(paths) > 1]
+        self._by_size = {}
+        if self._stats is not None:
+            self._stats.add(duplicate_candidates = sum(len(paths) for _, paths in groups))
+        if not groups:
+            return []
+
+        pool = None
+        map_func = map
+        if self._workers > 1:
+            #concurrent.futures импортируется только при параллельном хэшировании
+            from concurrent.futures import ThreadPoolExecutor
+            pool = ThreadPoolExecutor(self._workers)
+            map_func = pool.map
+        try:
+            groups = self._regroup(groups, True, map_func)
+            #Полный хэш нужен только файлам, не прочитанным целиком на предыдущем этапе
+            small = [group for group in groups if group[0] <= 2 * type(self).PARTIAL_SIZE]
+            large = [group for group in groups if group[0] > 2 * type(self).PARTIAL_SIZE]
+            groups = small + (self._regroup(large, False, map_func) if large else [])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        groups = [(size, sorted(paths)) for size, paths in groups]
+        groups.sort(key = lambda group: (-group[0] * (len(group[1]) - 1), group[1][0]))
+        return groups
@@ -0,0 +1,152 @@
+"""Модуль со сравнением двух результатов сканирования каталога.
+
+Содержит классы ChangeType(Enum) и ScanDiff
+"""
+
+import os
+from enum import Enum
+
+
+class ChangeType(Enum):
+    """Набор значений "Тип изменения" записи между двумя сканированиями.
+
+    Args:
+        Enum (str): текст изменения для вывода в отчет
+    """
+    ADDED = 'Добавлен'
+    REMOVED = 'Удален'
+    RESIZED = 'Изменен размер'
+    MODIFIED = 'Изменен'
+
+
+class ScanDiff:
+    """Класс сравнения двух последовательностей записей сканирования.
+
+    Записи сканера, снимка и архивов идут в порядке обхода в глубину
+    с сортировкой по имени, поэтому сравнение выполняется слиянием двух
+    отсортированных последовательностей за один проход. В памяти хранятся только
+    стеки папок текущего пути.
+
+    Ключ записи - кортеж имен от анализируемого каталога, для записей архивов
+    имена внутри архива (в том числе вложенных архивов) не приводятся к регистру ОС.
+    Файлы считаются измененными по размеру и времени изменения, папки - только
+    добавленными или удаленными. Перед каждым изменением выводятся еще не
+    выведенные папки его пути (ScanRecord.change - None), чтобы отчет сохранял
+    структуру каталога.
+    """
+
+    def __init__(self):
+        """Инициализация сравнения."""
+        #Количество изменений по типам
+        self.counts = dict.fromkeys(ChangeType, 0)
+
+    @staticmethod
+    def _keyed(records):
+        """Получение ключей сравнения для записей сканирования.
+
+        Args:
+            records (Iterable): записи ScanRecord в порядке обхода
+
+        Yields:
+            tuple: (ключ записи, запись ScanRecord)
+        """
+        #Стек (глубина, запись, ключ, ключ архива, длина префикса пути архива) текущего пути
+        stack = []
+        for record in records:
+            while stack and stack[-1][0] >= record.depth:
+                stack.pop()
+            zip_key = None
+            prefix_len = 0
+            if not stack:
+                key = (os.path.normcase(record.name),)
+            else:
+                _, parent, parent_key, zip_key, prefix_len = stack[-1]
+                if zip_key is None and not parent.is_dir:
+                    #Первая запись внутри архива
+                    zip_key = parent_key
+                    prefix_len = len(parent.path) + 1
+                if zip_key is None:
+                    key = (*parent_key, os.path.normcase(record.name))
+                else:
+                    member = record.path[prefix_len:]
+                    key = (*zip_key, *member.split(os.sep))  # noqa: PTH206
+            stack.append((record.depth, record, key, zip_key, prefix_len))
+            yield key, record
+
+    @staticmethod
+    def _compare(old, new):
+        """Определение изменения записи, которая есть в обоих сканированиях.
+
+        Args:
+            old (ScanRecord): прежняя запись
+            new (ScanRecord): новая запись
+
+        Returns:
+            ChangeType | None: тип изменения или None, если запись не изменилась
+        """
+        if new.is_dir:
+            return None
+        if old.size != new.size:
+            return ChangeType.RESIZED
+        if old.mtime != new.mtime:
+            return ChangeType.MODIFIED
+        return None
+
+    def _merge(self, old_records, new_records):
+        """Слияние двух последовательностей записей по ключам.
+
+        Args:
+            old_records (Iterable): записи прежнего сканирования
+            new_records (Iterable): записи нового сканирования
+
+        Yields:
+            tuple: (запись ScanRecord, тип изменения или None)
+        """
+        old_iter = self._keyed(old_records)
+        new_iter = self._keyed(new_records)
+        old = next(old_iter, None)
+        new = next(new_iter, None)
+        while old is not None or new is not None:
+            if new is None or (old is not None and old[0] < new[0]):
+                yield old[1], ChangeType.REMOVED
+                old = next(old_iter, None)
+            elif old is None or new[0] < old[0]:
+                yield new[1], ChangeType.ADDED
+                new = next(new_iter, None)
+            else:
+                if old[1].is_dir != new[1].is_dir:
+                    #Файл заменен папкой или наоборот
+                    yield old[1], ChangeType.REMOVED
+                    yield new[1], ChangeType.ADDED
+                else:
+                    yield new[1], self._compare(old[1], new[1])
+                old = next(old_iter, None)
+                new = next(new_iter, None)
+
+    def diff(self, old_records, new_records):
+        """Перебор изменений между двумя сканированиями.
+
+        Args:
+            old_records (Iterable): записи ScanRecord прежнего сканирования
+            new_records (Iterable): записи ScanRecord нового сканирования
+
+        Yields:
+            ScanRecord: измененная запись (ScanRecord.change - тип изменения) или папка
+                пути изменения (ScanRecord.change - None)
+        """
+        counts = self.counts
+        #Стек [глубина, запись, выведена ли запись] текущего пути
+        stack = []
+        for record, change in self._merge(old_records, new_records):
+            while stack and stack[-1][0] >= record.depth:
+                stack.pop()
+            if change is not None:
+                #Вывод папок пути изменения, которые еще не выведены
+                for item in stack:
+                    if not item[2]:
+                        item[2] = True
+                        yield item[1]
+                counts[change] += 1
+                record.change = change
+                yield record
+            stack.append([record.depth, record, change is not None])
@@ -0,0 +1,162 @@
+"""Модуль с фильтром записей, применяемым при обходе каталога.
+
+Содержит класс ScanFilter
+"""
+
+import os
+import re
+from fnmatch import translate
+
+
+class ScanFilter:
+    """Класс фильтра записей сканирования.
+
+    Шаблоны исключения и включения - шаблоны fnmatch. Шаблон без '/'
+    сравнивается с именем файла/папки, шаблон с '/' - с путем относительно
+    анализируемого каталога (через '/'). Все шаблоны одного вида компилируются
+    в одно регулярное выражение, поэтому проверка записи выполняется за один
+    поиск по регулярному выражению.
+
+    Исключенные папки не читаются, исключенные архивы не открываются.
+    Шаблоны включения, минимальный размер и время изменения применяются только
+    к файлам, папки выводятся все (кроме исключенных и более глубоких, чем max_depth).
+    архивы проверяются как папки, а записи внутри них - как обычные файлы и папки.
+    """
+
+    def __init__(self, exclude = (), include = (), max_depth = None, min_size = None, modified_since = None):
+        """Инициализация и компиляция фильтра.
+
+        Args:
+            exclude (Iterable): шаблоны исключаемых файлов/папок
+            include (Iterable): шаблоны включаемых файлов, если заданы - остальные файлы пропускаются
+            max_depth (int | None): максимальная глубина вложенности выводимых записей (0 - только
+                записи анализируемого каталога)
+            min_size (int | None): минимальный размер файла в байтах
+            modified_since (float | None): минимальное время изменения файла (timestamp)
+
+        Raises:
+            ValueError: недопустимая глубина или размер
+        """
+        if max_depth is not None and max_depth < 0:
+            raise ValueError(f'Недопустимая глубина вложенности {max_depth}')
+        if min_size is not None and min_size < 0:
+            raise ValueError(f'Недопустимый минимальный размер файла {min_size}')
+        self._exclude_name, self._exclude_path = self._compile(exclude)
+        self._include_name, self._include_path = self._compile(include)
+        self._has_exclude = self._exclude_name is not None or self._exclude_path is not None
+        self._has_include = self._include_name is not None or self._include_path is not None
+        self.max_depth = max_depth
+        self._min_size = min_size or 0
+        self._modified_since = modified_since
+
+    @property
+    def excludes(self):
+        """Заданы ли шаблоны исключения."""
+        return self._has_exclude
+
+    @staticmethod
+    def _compile(patterns):
+        """Компиляция шаблонов имен и шаблонов путей.
+
+        Args:
+            patterns (Iterable): шаблоны fnmatch
+
+        Returns:
+            tuple: (регулярное выражение для имен или None, для относительных путей или None)
+        """
+        name_patterns = []
+        path_patterns = []
+        for pattern in patterns:
+            pattern = os.path.normcase(pattern.strip('/'))
+            (path_patterns if '/' in pattern else name_patterns).append(translate(pattern))
+        return tuple(re.compile('|'.join(group)).match if group else None
+                     for group in (name_patterns, path_patterns))
+
+    @staticmethod
+    def _matches(name_match, path_match, name, rel_path):
+        """Проверка имени и относительного пути по скомпилированным шаблонам.
+
+        Args:
+            name_match (Callable | None): проверка имени
+            path_match (Callable | None): проверка относительного пути
+            name (str): имя файла/папки
+            rel_path (str): путь относительно анализируемого каталога через '/'
+
+        Returns:
+            bool: совпадение с одним из шаблонов
+        """
+        return ((name_match is not None and name_match(os.path.normcase(name)) is not None)
+                or (path_match is not None and path_match(os.path.normcase(rel_path)) is not None))
+
+    def is_excluded(self, name, rel_path):
+        """Проверка, исключена ли запись шаблонами исключения.
+
+        Args:
+            name (str): имя файла/папки
+            rel_path (str): путь относительно анализируемого каталога через '/'
+
+        Returns:
+            bool: запись исключена
+        """
+        return self._matches(self._exclude_name, self._exclude_path, name, rel_path)
+
+    def accepts_file(self, name, rel_path, size, mtime):
+        """Проверка файла по шаблонам включения, размеру и времени изменения.
+
+        Args:
+            name (str): имя файла
+            rel_path (str): путь относительно анализируемого каталога через '/'
+            size (int): размер файла
+            mtime (float | None): время изменения файла, None - неизвестно
+
+        Returns:
+            bool: файл выводится в отчет
+        """
+        if size < self._min_size:
+            return False
+        if self._modified_since is not None and (mtime is None or mtime < self._modified_since):
+            return False
+        return not self._has_include or self._matches(self._include_name, self._include_path, name, rel_path)
+
+    def descends(self, depth):
+        """Проверка, нужно ли читать подкаталоги записей глубины depth.
+
+        Args:
+            depth (int): глубина вложенности папки
+
+        Returns:
+            bool: содержимое папки выводится в отчет
+        """
+        return self.max_depth is None or depth < self.max_depth
+
+    def filter_listing(self, zip_rel_path, zip_depth, listing):
+        """Фильтрация списка архива.
+
+        Запись архива исключается, если исключена она сама или одна из ее папок.
+        Вложенные архивы, как и архивы в каталоге, проверяются как папки.
+
+        Args:
+            zip_rel_path (str): путь к архиву относительно анализируемого каталога через '/'
+            zip_depth (int): глубина вложенности архива
+            listing (list): записи архива (путь внутри архива через '/', признак папки,
+                размер, время изменения)
+
+        Returns:
+            list: записи архива, прошедшие фильтр
+        """
+        result = []
+        for i, item in enumerate(listing):
+            key, is_dir, size, mtime = item
+            parts = key.split('/')
+            #За вложенным архивом следуют его записи
+            is_dir = is_dir or (i + 1 < len(listing) and listing[i + 1][0].startswith(key + '/'))
+            if self.max_depth is not None and zip_depth + len(parts) > self.max_depth:
+                continue
+            #Проверка самой записи и всех ее папок внутри архива
+            if self._has_exclude and any(self.is_excluded(part, zip_rel_path + '/' + '/'.join(parts[:level + 1]))
+                                         for level, part in enumerate(parts)):
+                continue
+            if not is_dir and not self.accepts_file(parts[-1], f'{zip_rel_path}/{key}', size, mtime):
+                continue
+            result.append(item)
+        return result
@@ -0,0 +1,163 @@
+"""Модуль с индексом результатов сканирования каталога.
+
+Содержит класс ScanIndex
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class ScanIndex:
+    """Класс дискового индекса (SQLite) со списками записей каталогов.
+
+    Для каждого каталога хранится время его изменения и отсортированный список
+    записей (имя, признак папки, признак файла, размер, время изменения, признак
+    символической ссылки, номер inode). При
+    повторном обходе каталог, время изменения которого не изменилось, берется из
+    индекса без чтения каталога и stat его файлов. Также в индексе кэшируются
+    списки архивов по ключу (путь, размер, время изменения).
+
+    Время изменения каталога меняется при добавлении, удалении и переименовании
+    записей, но не при перезаписи файла на месте, поэтому изменение размера
+    такого файла попадет в отчет только после изменения его каталога.
+
+    Используется как контекстный менеджер, изменения сохраняются при выходе.
+    """
+
+    #Каталоги, измененные позже начала сканирования минус это время (с),
+    #читаются заново, так как их изменения могли не отразиться на времени изменения
+    RACY_SECONDS = 2
+    #Количество каталогов, записываемых в индекс за один раз
+    BATCH_DIRS = 1000
+    #Версия формата индекса, индекс другой версии создается заново
+    VERSION = 3
+
+    def __init__(self, index_path):
+        """Инициализация индекса.
+
+        Args:
+            index_path (str | Path): путь к файлу индекса
+        """
+        self._index_path = Path(index_path)
+        self._connection = None
+        self._lock = threading.Lock()
+        self._updates = []
+        self._zip_updates = []
+        self._scan_started = 0
+        #Статистика использования индекса
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        """Открытие индекса.
+
+        Returns:
+            ScanIndex: открытый индекс
+        """
+        #sqlite3 импортируется только при использовании индекса
+        import sqlite3
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        #Индекс используется из потоков сканера, доступ защищен блокировкой
+        self._connection = sqlite3.connect(self._index_path, check_same_thread = False)
+        if self._connection.execute('PRAGMA user_version').fetchone()[0] != type(self).VERSION:
+            self._connection.execute('DROP TABLE IF EXISTS dirs')
+            self._connection.execute('DROP TABLE IF EXISTS zips')
+            self._connection.execute(f'PRAGMA user_version = {type(self).VERSION}')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS dirs '
+                                 '(path BLOB PRIMARY KEY, mtime REAL NOT NULL, entries TEXT NOT NULL)')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS zips (path BLOB PRIMARY KEY, '
+                                 'size INTEGER NOT NULL, mtime REAL NOT NULL, entries TEXT NOT NULL)')
+        self._scan_started = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Сохранение изменений (если сканирование завершилось без ошибок) и закрытие индекса."""
+        with self._lock:
+            if exc_type is None:
+                self._write_updates()
+                self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+    def lookup(self, dir_path, mtime):
+        """Получение записей каталога из индекса.
+
+        Args:
+            dir_path (str): путь к каталогу
+            mtime (float): текущее время изменения каталога
+
+        Returns:
+            list | None: записи каталога (см. DirScanner) или None, если каталог нужно прочитать заново
+        """
+        with self._lock:
+            row = None
+            if mtime <= self._scan_started - type(self).RACY_SECONDS:
+                row = self._connection.execute('SELECT mtime, entries FROM dirs WHERE path = ?',
+                                               (os.fsencode(dir_path),)).fetchone()
+            if row is None or row[0] != mtime:
+                self.misses += 1
+                return None
+            self.hits += 1
+        prefix = dir_path if dir_path.endswith(os.sep) else dir_path + os.sep
+        return [(prefix + name, is_dir, is_file, size, entry_mtime, is_link, inode and tuple(inode))
+                for name, is_dir, is_file, size, entry_mtime, is_link, inode in json.loads(row[1])]
+
+    def store(self, dir_path, mtime, entries):
+        """Сохранение записей каталога в индекс.
+
+        Args:
+            dir_path (str): путь к каталогу
+            mtime (float): время изменения каталога
+            entries (list): записи каталога
+        """
+        names_start = len(dir_path) + (0 if dir_path.endswith(os.sep) else 1)
+        data = json.dumps([(path[names_start:], *entry) for path, *entry in entries])
+        with self._lock:
+            self._updates.append((os.fsencode(dir_path), mtime, data))
+            if len(self._updates) >= type(self).BATCH_DIRS:
+                self._write_updates()
+
+    def lookup_zip(self, zip_path, size, mtime):
+        """Получение списка архива из индекса.
+
+        Args:
+            zip_path (str): путь к архиву
+            size (int): текущий размер архива
+            mtime (int): текущее время изменения архива
+
+        Returns:
+            list | None: записи архива или None, если архив нужно прочитать заново
+        """
+        with self._lock:
+            row = self._connection.execute('SELECT size, mtime, entries FROM zips WHERE path = ?',
+                                           (os.fsencode(zip_path),)).fetchone()
+        if row is None or row[0] != size or row[1] != mtime:
+            return None
+        return [tuple(item) for item in json.loads(row[2])]
+
+    def store_zip(self, zip_path, size, mtime, listing):
+        """Сохранение списка архива в индекс.
+
+        Args:
+            zip_path (str): путь к архиву
+            size (int): размер архива
+            mtime (int): время изменения архива
+            listing (list): записи архива
+        """
+        data = json.dumps(listing)
+        with self._lock:
+            self._zip_updates.append((os.fsencode(zip_path), size, mtime, data))
+            if len(self._zip_updates) >= type(self).BATCH_DIRS:
+                self._write_updates()
+
+    def _write_updates(self):
+        """Запись накопленных изменений в индекс (вызывается под блокировкой)."""
+        self._connection.executemany('INSERT OR REPLACE INTO dirs (path, mtime, entries) VALUES (?, ?, ?)',
+                                     self._updates)
+        self._connection.executemany('INSERT OR REPLACE INTO zips (path, size, mtime, entries) '
+                                     'VALUES (?, ?, ?, ?)', self._zip_updates)
+        self._updates.clear()
+        self._zip_updates.clear()
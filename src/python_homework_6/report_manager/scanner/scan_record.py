@@ -0,0 +1,50 @@
+"""Модуль с записью о файле/папке, полученной при сканировании каталога.
+
+Содержит класс ScanRecord
+"""
+
+import os
+
+
+class ScanRecord:
+    """Компактная запись о файле/папке.
+
+    Хранит необработанные значения (размер в байтах, время изменения в секундах),
+    их преобразование в читаемый вид выполняют Writer'ы, которым оно нужно.
+    """
+
+    __slots__ = ('path', 'size', 'mtime', 'depth', 'is_dir', 'totals', 'change', 'link')
+
+    def __init__(self, path, size, mtime, depth, is_dir, totals = None, change = None, link = None):
+        """Инициализация записи.
+
+        Args:
+            path (str): полный путь к файлу/папке (для записей архивов - путь внутри архива)
+            size (int): размер в байтах
+            mtime (int | None): время последнего изменения в секундах, None - неизвестно
+            depth (int): глубина вложенности относительно анализируемого каталога
+            is_dir (bool): запись выводится как папка
+            totals (tuple | list | None): итоги папки/архива (суммарный размер, количество файлов),
+                list - итоги еще вычисляются, None - не вычислялись
+            change (ChangeType | None): тип изменения записи в отчете об изменениях (см. ScanDiff)
+            link (str | None): цель символической ссылки или путь первой записи с тем же inode,
+                если запись выводится как ссылка
+        """
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.depth = depth
+        self.is_dir = is_dir
+        self.totals = totals
+        self.change = change
+        self.link = link
+
+    @property
+    def name(self):
+        """Имя файла/папки без пути."""
+        return os.path.basename(self.path)  # noqa: PTH119
+
+    def __repr__(self):
+        """Строковое представление записи для отладки."""
+        return (f'ScanRecord({self.path!r}, {self.size!r}, {self.mtime!r}, '
+                f'{self.depth!r}, {self.is_dir!r}, {self.totals!r}, {self.change!r}, {self.link!r})')
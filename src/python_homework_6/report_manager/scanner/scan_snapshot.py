@@ -0,0 +1,271 @@
+"""Модуль со снимком результатов сканирования каталога.
+
+Содержит классы SnapshotBuilder и ScanSnapshot
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .scan_record import ScanRecord
+
+#Сигнатура файла снимка
+MAGIC = b'RMSNAP01'
+#Заголовок: сигнатура, порядок байт (0 - little, 1 - big), признак итогов папок,
+#количество записей, длина пути каталога, длина таблицы строк
+HEADER = struct.Struct('=8sBB6xQQQ')
+#Значение столбца для неизвестного времени изменения
+NO_MTIME = -(2 ** 63)
+#Флаги записи
+FLAG_DIR = 1
+FLAG_TOTALS = 2
+FLAG_LINK = 4
+#Разделитель имени записи и пути, на который указывает запись-ссылка, в таблице строк
+LINK_SEPARATOR = b'\0'
+#Выравнивание разделов файла
+ALIGN = 8
+
+
+def _padding(size):
+    """Количество байт выравнивания после раздела.
+
+    Args:
+        size (int): размер раздела
+
+    Returns:
+        int: количество байт до границы ALIGN
+    """
+    return -size % ALIGN
+
+
+class SnapshotBuilder:
+    """Класс для построчного формирования снимка сканирования.
+
+    Числовые значения записей хранятся в столбцах array, имена - в общей таблице
+    строк. Для каждой записи хранится только путь относительно предыдущей записи
+    меньшей глубины (родительской папки или архива), полный путь восстанавливается
+    при чтении по глубине записей. У записей-ссылок после имени через NUL хранится
+    путь, на который указывает ссылка.
+    """
+
+    def __init__(self, root):
+        """Инициализация снимка.
+
+        Args:
+            root (str | Path): путь к анализируемому каталогу
+        """
+        self.root = os.fspath(root)
+        self._sizes = array('q')
+        self._mtimes = array('q')
+        self._depths = array('i')
+        self._flags = bytearray()
+        self._total_sizes = array('q')
+        self._total_files = array('q')
+        self._offsets = array('Q', [0])
+        self._strings = bytearray()
+        #Стек (глубина, префикс пути) текущего пути
+        self._stack = []
+        self._root_prefix = self.root if self.root.endswith(os.sep) else self.root + os.sep
+
+    def __len__(self):
+        """Количество записей снимка."""
+        return len(self._sizes)
+
+    def add(self, record):
+        """Добавление записи в снимок.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+
+        Raises:
+            ValueError: путь записи не вложен в путь родительской записи
+
+        Returns:
+            int: номер записи в снимке
+        """
+        stack = self._stack
+        while stack and stack[-1][0] >= record.depth:
+            stack.pop()
+        prefix = stack[-1][1] if stack else self._root_prefix
+        if not record.path.startswith(prefix):
+            raise ValueError(f'Путь {record.path} не вложен в {prefix}')
+        stack.append((record.depth, record.path + os.sep))
+
+        self._strings += os.fsencode(record.path[len(prefix):])
+        if record.link is not None:
+            self._strings += LINK_SEPARATOR + os.fsencode(record.link)
+        self._offsets.append(len(self._strings))
+        self._sizes.append(record.size)
+        self._mtimes.append(NO_MTIME if record.mtime is None else record.mtime)
+        self._depths.append(record.depth)
+        self._flags.append((FLAG_DIR if record.is_dir else 0) | (FLAG_LINK if record.link is not None else 0))
+        self._total_sizes.append(0)
+        self._total_files.append(0)
+        index = len(self._sizes) - 1
+        if isinstance(record.totals, tuple):
+            self.set_totals(index, record.totals)
+        return index
+
+    def set_totals(self, index, totals):
+        """Запись итогов папки/архива.
+
+        Args:
+            index (int): номер записи
+            totals (tuple): суммарный размер и количество файлов
+        """
+        self._flags[index] |= FLAG_TOTALS
+        self._total_sizes[index], self._total_files[index] = totals
+
+    def save(self, snapshot_path):
+        """Сохранение снимка в файл.
+
+        Args:
+            snapshot_path (str | Path): путь к файлу снимка
+        """
+        has_totals = any(flag & FLAG_TOTALS for flag in self._flags)
+        root = os.fsencode(self.root)
+        columns = [self._sizes, self._mtimes, self._depths, self._flags, self._offsets]
+        if has_totals:
+            columns[2:2] = [self._total_sizes, self._total_files]
+        with open(snapshot_path, 'wb') as snapshot_file:  # noqa: PTH123
+            snapshot_file.write(HEADER.pack(MAGIC, sys.byteorder == 'big', has_totals,
+                                            len(self), len(root), len(self._strings)))
+            for section in (root, *columns, self._strings):
+                data = section.tobytes() if isinstance(section, array) else section
+                snapshot_file.write(data)
+                snapshot_file.write(bytes(_padding(len(data))))
+
+
+class ScanSnapshot:
+    """Класс для чтения снимка сканирования через mmap.
+
+    Столбцы снимка отображаются в память без разбора и копирования, поэтому
+    открытие снимка не зависит от количества записей. Записи ScanRecord
+    создаются при переборе. Используется как контекстный менеджер.
+    """
+
+    def __init__(self, snapshot_path):
+        """Открытие снимка.
+
+        Args:
+            snapshot_path (str | Path): путь к файлу снимка
+
+        Raises:
+            ValueError: файл не является снимком или записан с другим порядком байт
+        """
+        self._file = open(snapshot_path, 'rb')  # noqa: PTH123, SIM115
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            #Пустой файл нельзя отобразить в память
+            self._file.close()
+            raise ValueError(f'Файл {snapshot_path} не является снимком сканирования') from None
+        self._views = []
+        try:
+            self._map_sections(snapshot_path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _map_sections(self, snapshot_path):
+        """Получение столбцов снимка из отображенного в память файла.
+
+        Args:
+            snapshot_path (str | Path): путь к файлу снимка
+
+        Raises:
+            ValueError: файл не является снимком или записан с другим порядком байт
+        """
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f'Файл {snapshot_path} не является снимком сканирования')
+        magic, big_endian, has_totals, count, root_len, strings_len = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f'Файл {snapshot_path} не является снимком сканирования')
+        if bool(big_endian) != (sys.byteorder == 'big'):
+            raise ValueError(f'Снимок {snapshot_path} записан с другим порядком байт')
+        self.has_totals = bool(has_totals)
+        self._count = count
+
+        offset = HEADER.size
+
+        def section(length, fmt = 'B'):
+            nonlocal offset
+            size = length * struct.calcsize(fmt)
+            if offset + size > len(self._mmap):
+                raise ValueError(f'Снимок {snapshot_path} поврежден')
+            view = memoryview(self._mmap)[offset:offset + size].cast(fmt)
+            self._views.append(view)
+            offset += size + _padding(size)
+            return view
+
+        self.root = os.fsdecode(bytes(section(root_len)))
+        self._sizes = section(count, 'q')
+        self._mtimes = section(count, 'q')
+        if self.has_totals:
+            self._total_sizes = section(count, 'q')
+            self._total_files = section(count, 'q')
+        self._depths = section(count, 'i')
+        self._flags = section(count)
+        self._offsets = section(count + 1, 'Q')
+        self._strings = section(strings_len)
+
+    def __enter__(self):
+        """Получение открытого снимка.
+
+        Returns:
+            ScanSnapshot: снимок
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Закрытие снимка."""
+        self.close()
+
+    def __len__(self):
+        """Количество записей снимка."""
+        return self._count
+
+    def close(self):
+        """Освобождение столбцов и закрытие файла снимка."""
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+        self._file.close()
+
+    def iter_records(self, totals = True):
+        """Перебор записей снимка в порядке обхода каталога.
+
+        Args:
+            totals (bool): добавлять ли к записям сохраненные итоги папок
+
+        Yields:
+            ScanRecord: запись о файле/папке
+        """
+        sizes, mtimes, depths, flags = self._sizes, self._mtimes, self._depths, self._flags
+        offsets, strings = self._offsets, self._strings
+        root = self.root
+        with_totals = totals and self.has_totals
+        #Стек (глубина, префикс пути) текущего пути
+        stack = []
+        root_prefix = root if root.endswith(os.sep) else root + os.sep
+        for i in range(self._count):
+            depth = depths[i]
+            while stack and stack[-1][0] >= depth:
+                stack.pop()
+            name = bytes(strings[offsets[i]:offsets[i + 1]])
+            flag = flags[i]
+            link = None
+            if flag & FLAG_LINK:
+                name, _, link = name.partition(LINK_SEPARATOR)
+                link = os.fsdecode(link)
+            path = (stack[-1][1] if stack else root_prefix) + os.fsdecode(name)
+            stack.append((depth, path + os.sep))
+            mtime = mtimes[i]
+            record_totals = None
+            if with_totals and flag & FLAG_TOTALS:
+                record_totals = (self._total_sizes[i], self._total_files[i])
+            yield ScanRecord(path, sizes[i], None if mtime == NO_MTIME else mtime, depth,
+                             bool(flag & FLAG_DIR), record_totals, link = link)
@@ -0,0 +1,195 @@
+"""Модуль со сводной статистикой сканирования каталога.
+
+Содержит класс ScanSummary
+"""
+
+import heapq
+import os
+import time
+from bisect import bisect_right
+
+
+class ScanSummary:
+    """Класс сводной статистики, собираемой по ходу обхода каталога.
+
+    Собираются крупнейшие файлы и папки, самые старые файлы и распределения
+    файлов каждого расширения по размеру и по давности изменения. Для списков
+    используются ограниченные кучи из top элементов, для распределений -
+    счетчики фиксированных интервалов, поэтому расход памяти не зависит от
+    количества записей: кроме куч и счетчиков хранится только стек открытых
+    папок текущего пути (как в SizeRollup).
+
+    Учитываются файлы на диске: записи внутри архивов (следующие за файлом более
+    глубокие записи) и записи-ссылки пропускаются, сам архив учитывается как файл.
+    """
+
+    #Границы интервалов размера (байт): (граница, подпись, имя поля JSON)
+    SIZE_BUCKETS = (
+        (1024, '< 1 КБ', 'under_1kb'),
+        (1024 ** 2, '1 КБ - 1 МБ', '1kb_1mb'),
+        (100 * 1024 ** 2, '1 МБ - 100 МБ', '1mb_100mb'),
+        (1024 ** 3, '100 МБ - 1 ГБ', '100mb_1gb'),
+        (None, '> 1 ГБ', 'over_1gb'),
+    )
+    #Границы интервалов давности изменения (с)
+    AGE_BUCKETS = (
+        (86400, '< 1 дня', 'under_1d'),
+        (7 * 86400, '1 - 7 дней', '1d_7d'),
+        (30 * 86400, '7 - 30 дней', '7d_30d'),
+        (365 * 86400, '30 - 365 дней', '30d_1y'),
+        (None, '> 1 года', 'over_1y'),
+    )
+    #Максимальное количество отдельно учитываемых расширений
+    MAX_EXTENSIONS = 64
+    #Расширение для файлов без расширения и для расширений сверх MAX_EXTENSIONS
+    NO_EXTENSION = '(без расширения)'
+    OTHER_EXTENSIONS = '(другие)'
+
+    def __init__(self, top = 10, now = None):
+        """Инициализация статистики.
+
+        Args:
+            top (int): количество записей в списках крупнейших и самых старых файлов/папок
+            now (float | None): время, от которого отсчитывается давность изменения,
+                None - текущее время
+
+        Raises:
+            ValueError: недопустимое количество записей в списках
+        """
+        if top < 1:
+            raise ValueError(f'Недопустимое количество записей сводки {top}')
+        self._top = top
+        self._now = time.time() if now is None else now
+        #Кучи (ключ, порядковый номер, путь, ...): в вершине - запись, вытесняемая первой
+        self._largest_files = []
+        self._largest_dirs = []
+        self._oldest_files = []
+        #Счетчики по расширениям: [файлов, размер, счетчики размеров, счетчики давности]
+        self._extensions = {}
+        #Стек открытых папок текущего пути: [глубина, путь, размер, файлов]
+        self._stack = []
+        #Глубина последнего файла и архива, записи которого сейчас пропускаются
+        self._file_depth = None
+        self._archive_depth = None
+        self._count = 0
+        self._size_limits = [limit for limit, _, _ in type(self).SIZE_BUCKETS[:-1]]
+        self._age_limits = [limit for limit, _, _ in type(self).AGE_BUCKETS[:-1]]
+
+    def add(self, record):
+        """Учет очередной записи обхода.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+        """
+        depth = record.depth
+        if self._archive_depth is not None:
+            if depth > self._archive_depth:
+                return
+            self._archive_depth = None
+        if self._file_depth is not None and depth > self._file_depth:
+            #Более глубокая запись после файла - содержимое архива
+            self._archive_depth = self._file_depth
+            self._file_depth = None
+            return
+        stack = self._stack
+        while stack and stack[-1][0] >= depth:
+            self._close(stack.pop())
+        self._file_depth = None
+        if record.link is not None:
+            return
+        self._count += 1
+        if record.is_dir:
+            stack.append([depth, record.path, 0, 0])
+            return
+        self._file_depth = depth
+        if stack:
+            stack[-1][2] += record.size
+            stack[-1][3] += 1
+        self._push(self._largest_files, (record.size, -self._count, record.path))
+        if record.mtime is not None:
+            self._push(self._oldest_files, (-record.mtime, -self._count, record.path))
+        self._count_extension(record)
+
+    def finish(self):
+        """Закрытие всех оставшихся папок в конце обхода."""
+        while self._stack:
+            self._close(self._stack.pop())
+
+    def _push(self, heap, item):
+        """Добавление элемента в ограниченную кучу.
+
+        Args:
+            heap (list): куча не более чем из top элементов
+            item (tuple): элемент, в куче остаются элементы с наибольшими значениями
+        """
+        if len(heap) < self._top:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def _close(self, item):
+        """Закрытие папки и добавление ее итогов к родительской.
+
+        Args:
+            item (list): элемент стека открытых папок
+        """
+        _, path, size, files = item
+        self._push(self._largest_dirs, (size, -self._count, path, files))
+        if self._stack:
+            self._stack[-1][2] += size
+            self._stack[-1][3] += files
+
+    def _count_extension(self, record):
+        """Учет файла в распределениях его расширения.
+
+        Args:
+            record (ScanRecord): запись о файле
+        """
+        extension = os.path.splitext(record.name)[1].lower() or type(self).NO_EXTENSION  # noqa: PTH122
+        counters = self._extensions.get(extension)
+        if counters is None:
+            if len(self._extensions) >= type(self).MAX_EXTENSIONS:
+                extension = type(self).OTHER_EXTENSIONS
+            counters = self._extensions.setdefault(
+                extension, [0, 0, [0] * len(type(self).SIZE_BUCKETS), [0] * len(type(self).AGE_BUCKETS)])
+        counters[0] += 1
+        counters[1] += record.size
+        counters[2][bisect_right(self._size_limits, record.size)] += 1
+        if record.mtime is not None:
+            counters[3][bisect_right(self._age_limits, self._now - record.mtime)] += 1
+
+    def largest_files(self):
+        """Крупнейшие файлы.
+
+        Returns:
+            list: кортежи (размер, путь) по убыванию размера
+        """
+        return [(size, path) for size, _, path in sorted(self._largest_files, reverse = True)]
+
+    def largest_dirs(self):
+        """Крупнейшие папки по суммарному размеру вложенных файлов.
+
+        Returns:
+            list: кортежи (размер, количество файлов, путь) по убыванию размера
+        """
+        return [(size, files, path) for size, _, path, files in sorted(self._largest_dirs, reverse = True)]
+
+    def oldest_files(self):
+        """Самые старые файлы.
+
+        Returns:
+            list: кортежи (время изменения, путь) по возрастанию времени изменения
+        """
+        return [(-mtime, path) for mtime, _, path in sorted(self._oldest_files, reverse = True)]
+
+    def extensions(self):
+        """Распределения файлов по расширениям.
+
+        Returns:
+            list: кортежи (расширение, количество файлов, размер, счетчики интервалов размера,
+                счетчики интервалов давности) по убыванию суммарного размера
+        """
+        items = [(extension, files, size, tuple(sizes), tuple(ages))
+                 for extension, (files, size, sizes, ages) in self._extensions.items()]
+        items.sort(key = lambda item: (-item[2], item[0]))
+        return items
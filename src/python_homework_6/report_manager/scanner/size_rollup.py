@@ -0,0 +1,61 @@
+"""Модуль с расчетом итогов папок по ходу обхода каталога.
+
+Содержит класс SizeRollup
+"""
+
+
+class SizeRollup:
+    """Класс расчета суммарного размера и количества файлов папок и архивов.
+
+    Записи поступают в порядке обхода в глубину, поэтому папка закрывается,
+    как только приходит запись той же или меньшей глубины. Итоги накапливаются
+    снизу вверх: файл добавляется к своей папке, закрытая папка - к родительской.
+    В памяти хранится только стек открытых папок текущего пути.
+
+    Пока папка открыта, ее итоги - список [размер, количество файлов], после
+    закрытия - кортеж. архив учитывается в родительской папке как файл
+    своего размера, а его итоги - распакованный размер и количество файлов внутри.
+    Записи-ссылки (символические и повторные жесткие ссылки) в итогах не учитываются.
+    """
+
+    def __init__(self):
+        """Инициализация расчета."""
+        #Стек открытых папок и архивов текущего пути
+        self._stack = []
+
+    def add(self, record, container):
+        """Учет очередной записи обхода.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+            container (bool): у записи могут быть вложенные записи (папка или прочитанный архив)
+        """
+        stack = self._stack
+        while stack and stack[-1].depth >= record.depth:
+            self._close(stack.pop())
+        if stack and not record.is_dir and record.link is None:
+            totals = stack[-1].totals
+            totals[0] += record.size
+            totals[1] += 1
+        if container:
+            record.totals = [0, 0]
+            stack.append(record)
+
+    def finish(self):
+        """Закрытие всех оставшихся папок в конце обхода."""
+        while self._stack:
+            self._close(self._stack.pop())
+
+    def _close(self, record):
+        """Закрытие папки/архива и добавление итогов папки к родительской.
+
+        Args:
+            record (ScanRecord): закрываемая запись
+        """
+        size, files = record.totals
+        record.totals = (size, files)
+        #Архив уже учтен в родительской папке как файл
+        if record.is_dir and self._stack:
+            totals = self._stack[-1].totals
+            totals[0] += size
+            totals[1] += files
@@ -0,0 +1,147 @@
+"""Модуль с моделью структуры каталога в памяти.
+
+Содержит класс TreeModel
+"""
+
+import threading
+
+
+class TreeModel:
+    """Класс индекса сканирования в памяти для режима наблюдения за каталогом.
+
+    Реализует те же методы, что и ScanIndex: хранит списки записей каталогов
+    и списки архивов, полученные при обходе. В отличие от ScanIndex, записи
+    каталога считаются актуальными, пока каталог не отмечен измененным через
+    invalidate() (по событиям файловой системы), поэтому изменение файла на месте
+    тоже приводит к повторному чтению его каталога.
+
+    Используется как контекстный менеджер на время одного обхода: каталоги и архивы,
+    которые не встретились при успешном обходе (удалены или исключены фильтром),
+    удаляются из модели при выходе.
+    """
+
+    def __init__(self):
+        """Инициализация пустой модели."""
+        self._lock = threading.Lock()
+        #Каталоги: путь -> (время изменения, записи каталога)
+        self._dirs = {}
+        #Архивы: путь -> (размер, время изменения, записи архива)
+        self._zips = {}
+        #Пути каталогов и архивов, встретившихся при текущем обходе
+        self._seen = set()
+        #Статистика использования модели
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        """Начало обхода.
+
+        Returns:
+            TreeModel: модель
+        """
+        with self._lock:
+            self._seen = set()
+            self.hits = 0
+            self.misses = 0
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Удаление из модели каталогов и архивов, не встретившихся при успешном обходе."""
+        if exc_type is not None:
+            return
+        with self._lock:
+            seen = self._seen
+            self._dirs = {path: value for path, value in self._dirs.items() if path in seen}
+            self._zips = {path: value for path, value in self._zips.items() if path in seen}
+
+    def __len__(self):
+        """Количество каталогов в модели."""
+        return len(self._dirs)
+
+    def lookup(self, dir_path, mtime):
+        """Получение записей каталога из модели.
+
+        Args:
+            dir_path (str): путь к каталогу
+            mtime (float): текущее время изменения каталога
+
+        Returns:
+            list | None: записи каталога или None, если каталог нужно прочитать заново
+        """
+        with self._lock:
+            self._seen.add(dir_path)
+            item = self._dirs.get(dir_path)
+            if item is None or item[0] != mtime:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return item[1]
+
+    def store(self, dir_path, mtime, entries):
+        """Сохранение записей каталога в модель.
+
+        Args:
+            dir_path (str): путь к каталогу
+            mtime (float): время изменения каталога
+            entries (list): записи каталога
+        """
+        with self._lock:
+            self._seen.add(dir_path)
+            self._dirs[dir_path] = (mtime, entries)
+
+    def lookup_zip(self, zip_path, size, mtime):
+        """Получение списка архива из модели.
+
+        Args:
+            zip_path (str): путь к архиву
+            size (int): текущий размер архива
+            mtime (int): текущее время изменения архива
+
+        Returns:
+            list | None: записи архива или None, если архив нужно прочитать заново
+        """
+        with self._lock:
+            self._seen.add(zip_path)
+            item = self._zips.get(zip_path)
+        if item is None or item[0] != size or item[1] != mtime:
+            return None
+        return item[2]
+
+    def store_zip(self, zip_path, size, mtime, listing):
+        """Сохранение списка архива в модель.
+
+        Args:
+            zip_path (str): путь к архиву
+            size (int): размер архива
+            mtime (int): время изменения архива
+            listing (list): записи архива
+        """
+        with self._lock:
+            self._seen.add(zip_path)
+            self._zips[zip_path] = (size, mtime, listing)
+
+    def invalidate(self, paths):
+        """Отметка каталогов и архивов измененными.
+
+        Args:
+            paths (Iterable): пути измененных каталогов и архивов
+        """
+        with self._lock:
+            for path in paths:
+                self._dirs.pop(path, None)
+                self._zips.pop(path, None)
+
+    def clear(self):
+        """Удаление всех каталогов и архивов из модели."""
+        with self._lock:
+            self._dirs.clear()
+            self._zips.clear()
+
+    def dirs(self):
+        """Каталоги модели с временем изменения и записями.
+
+        Returns:
+            list: кортежи (путь к каталогу, время изменения, записи каталога)
+        """
+        with self._lock:
+            return [(path, mtime, entries) for path, (mtime, entries) in self._dirs.items()]
@@ -1,7 +1,21 @@
-from .csv_writer import CsvWriter
-from .docx_writer import DocxWriter
-from .json_writer import JsonWriter
-from .pdf_writer import PdfWriter
-from .xlsx_writer import XlsxWriter
+from importlib import import_module
 
-__all__ = ['DocxWriter', 'XlsxWriter', 'PdfWriter', 'JsonWriter', 'CsvWriter']
\ No newline at end of file
+#Модули Writer'ов импортируются при первом обращении, чтобы не загружать
+#библиотеки всех форматов (reportlab, openpyxl, python-docx) ради одного отчета
+_WRITER_MODULES = {
+    'CsvWriter': '.csv_writer',
+    'DocxWriter': '.docx_writer',
+    'JsonWriter': '.json_writer',
+    'PdfWriter': '.pdf_writer',
+    'SnapshotWriter': '.snapshot_writer',
+    'XlsxWriter': '.xlsx_writer',
+}
+
+
+def __getattr__(name):
+    if name not in _WRITER_MODULES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    return getattr(import_module(_WRITER_MODULES[name], __name__), name)
+
+
+__all__ = ['DocxWriter', 'XlsxWriter', 'PdfWriter', 'JsonWriter', 'CsvWriter', 'SnapshotWriter']
@@ -6,40 +6,99 @@
 import csv
 
 from report_manager.base.base_writer import BaseWriter
+from report_manager.base.formatters import format_size, readable_change, readable_mtime
 
 
 class CsvWriter(BaseWriter):
     """Класс Writer для создания отчета в CSV формате."""
+
+    #Количество строк, выводимых в файл за один вызов writerows
+    BUFFER_ROWS = 1000
     
-    def __init__(self, report_path, dir_path):
+    def __init__(self, report_path, dir_path, compress = False, changes = False):
         """Инициализация объекта класса.
 
         Args:
             report_path (str): путь к файлу отчету 
             dir_path (str): путь к исследуемому каталогу
+            compress (bool): сжимать ли файл отчета в gzip
+            changes (bool): выводить ли столбец с типом изменения (отчет об изменениях)
         """
         super().__init__(report_path, dir_path)
+        self._compress = compress
+        self._changes = changes
         self._csv_file = None
         self._csv_writer = None
+        #Буфер строк для пакетного вывода
+        self._rows = []
 
     def create_file(self):
         """Создание файла."""
         #Открытие файла не через контекстный менеджер нужно, потому что
         #данные в файл выводятся в другом методе write_to_file. Файл закрывается в методе save_file()
-        self._csv_file = open(self._report_path, 'w', encoding = 'utf-8')  # noqa: PTH123, SIM115
+        self._csv_file = self._open_text_file(self._compress)
         self._csv_writer = csv.writer(self._csv_file, delimiter = ';')
-        self._csv_writer.writerow(['Имя файла', 'Размер', 'Последнее изменение'])
+        header = ['Имя файла', 'Размер', 'Последнее изменение']
+        if self._changes:
+            header.append('Изменение')
+        self._csv_writer.writerow(header)
 
-    def write_to_file(self, name, size, last_changed):
+    def write_to_file(self, record):
         """Сбор CSV данных.
+
+        Строки накапливаются в буфере и выводятся в файл пачками.
         
         Args:
-            name (str): имя файла/папки
-            size (str): размера файла в читаемом формате
-            last_changed (str): дата последнего изменения в читаемом формате
+            record (ScanRecord): запись о файле/папке
         """
-        self._csv_writer.writerow([str(name), str(size), str(last_changed)])
+        self._rows.append(self._format_row(record))
+        if len(self._rows) >= type(self).BUFFER_ROWS:
+            self._flush_rows()
+
+    def write_batch(self, records):
+        """Вывод пачки записей одним вызовом writerows.
+
+        Args:
+            records (list): записи ScanRecord о файлах/папках
+        """
+        self._flush_rows()
+        self._csv_writer.writerows(map(self._format_row, records))
+
+    def _format_row(self, record):
+        """Формирование строки CSV для записи.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+
+        Returns:
+            tuple: значения столбцов строки
+        """
+        if self._changes:
+            return record.path, format_size(record), readable_mtime(record.mtime), readable_change(record)
+        return record.path, format_size(record), readable_mtime(record.mtime)
+
+    def _flush_rows(self):
+        """Вывод накопленных строк в файл."""
+        self._csv_writer.writerows(self._rows)
+        self._rows.clear()
         
+    def write_section(self, section):
+        """Вывод раздела отчета блоком строк после пустой строки.
+
+        Args:
+            section (ReportSection): раздел отчета
+        """
+        self._flush_rows()
+        self._csv_writer.writerows([(), (section.title,), section.columns])
+        #Размеры выводятся числом байт
+        self._csv_writer.writerows(section.formatted_rows(size = None))
+
     def save_file(self):
-        """Сохранение файла."""
+        """Вывод оставшихся строк и сохранение файла."""
+        self._flush_rows()
         self._csv_file.close()
+
+    def close(self):
+        """Закрытие файла отчета без сохранения при ошибке."""
+        if self._csv_file is not None and not self._csv_file.closed:
+            self._csv_file.close()
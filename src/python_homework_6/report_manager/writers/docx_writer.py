@@ -3,25 +3,48 @@
 Содержит класс DocxWriter.
 """
 
+import re
+from xml.sax.saxutils import escape
+
 from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
 from docx.shared import Mm
 
 from report_manager.base.base_writer import BaseWriter
+from report_manager.base.formatters import format_size, readable_change, readable_mtime
 
 
 class DocxWriter(BaseWriter):
-    """Класс Writer для создания отчета в DOCX формате."""
+    """Класс Writer для создания отчета в DOCX формате.
+
+    Строки таблицы накапливаются в буфере и добавляются в документ пачками:
+    XML строк формируется напрямую и разбирается одним вызовом parse_xml,
+    что избегает обхода всей таблицы python-docx при добавлении каждой строки.
+    """
 
-    def __init__(self, report_path, dir_path):
+    #Количество строк таблицы, добавляемых за один раз
+    BUFFER_ROWS = 1000
+    #Символы, которые python-docx выводит отдельными элементами
+    SPECIAL_CHARS = re.compile(r'([\t\n\r])')
+
+    def __init__(self, report_path, dir_path, changes = False):
         """Инициализация объекта класса.
 
         Args:
             report_path (str): путь к файлу отчету 
             dir_path (str): путь к исследуемому каталогу
+            changes (bool): выводить ли столбец с типом изменения (отчет об изменениях)
         """
         super().__init__(report_path, dir_path)
+        self._changes = changes
         self.__word_doc = None
         self.__data_tab = None
+        #Таблица структуры каталога (перед ней выводится сводка)
+        self.__entries_tab = None
+        #Буфер строк и XML свойств ячеек таблицы
+        self.__rows = []
+        self.__cells_pr = None
 
     def create_file(self):
         """Создание Word файла с заголовком и таблицей для вывода данных о структуре каталога."""
@@ -38,8 +61,9 @@ class DocxWriter(BaseWriter):
         first_section.right_margin = Mm(10)
 
         #Создание таблицы для данных отчета
-        self.__data_tab = self.__word_doc.add_table(1, 3, 'Light List Accent 1')
+        self.__data_tab = self.__word_doc.add_table(1, 4 if self._changes else 3, 'Light List Accent 1')
         self.__data_tab.autofit = True
+        self.__entries_tab = self.__data_tab
         #Заполнение заголовка таблицы
         for row in self.__data_tab.rows:
             for j, cell in enumerate(row.cells):
@@ -50,27 +74,129 @@ class DocxWriter(BaseWriter):
                         cell.text = 'Размер файла'
                     case 2:
                         cell.text = 'Последнее изменение'
+                    case 3:
+                        cell.text = 'Изменение'
 
-    def write_to_file(self, name, size, last_changed):
+    def write_to_file(self, record):
         """Вывод информации о файле/папке в файл отчета.
 
         Args:
-            name (str): имя файла/папки
-            size (str): размера файла в читаемом формате
-            last_changed (str): дата последнего изменения в читаемом формате
+            record (ScanRecord): запись о файле/папке
+        """
+        self.__rows.append(self.__format_row(record))
+        if len(self.__rows) >= type(self).BUFFER_ROWS:
+            self.__flush_rows()
+
+    def write_batch(self, records):
+        """Вывод пачки записей в буфер строк таблицы.
+
+        Args:
+            records (list): записи ScanRecord о файлах/папках
+        """
+        self.__rows.extend(map(self.__format_row, records))
+        if len(self.__rows) >= type(self).BUFFER_ROWS:
+            self.__flush_rows()
+
+    def __format_row(self, record):
+        """Формирование текста ячеек строки таблицы для записи.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+
+        Returns:
+            tuple: текст ячеек строки
+        """
+        if self._changes:
+            return record.path, format_size(record), readable_mtime(record.mtime), readable_change(record)
+        return record.path, format_size(record), readable_mtime(record.mtime)
+
+    def __flush_rows(self):
+        """Добавление накопленных строк в таблицу одним фрагментом XML."""
+        if not self.__rows:
+            return
+        if self.__cells_pr is None:
+            #Ширины ячеек совпадают с ширинами столбцов сетки таблицы, как в add_row()
+            self.__cells_pr = [f'<w:tcPr><w:tcW w:type="dxa" w:w="{col.w.twips}"/></w:tcPr>'
+                               for col in self.__data_tab._tbl.tblGrid.gridCol_lst]
+        rows_xml = ''.join(
+            '<w:tr>' + ''.join(f'<w:tc>{cell_pr}<w:p>{self.__run_xml(text)}</w:p></w:tc>'
+                               for cell_pr, text in zip(self.__cells_pr, row, strict = True)) + '</w:tr>'
+            for row in self.__rows)
+        self.__data_tab._tbl.extend(parse_xml(f'<w:tbl {nsdecls("w")}>{rows_xml}</w:tbl>'))
+        self.__rows.clear()
+
+    def write_section(self, section):
+        """Вывод раздела отчета заголовком и отдельной таблицей.
+
+        Args:
+            section (ReportSection): раздел отчета
+        """
+        self.__flush_rows()
+        self.__word_doc.add_heading(section.title, 1)
+        self.__add_section_table(section)
+
+    def write_summary(self, summary):
+        """Вывод сводки отчета в начале документа - перед таблицей структуры каталога.
+
+        Args:
+            summary (ReportSummary): сводка отчета
+        """
+        self.__flush_rows()
+        #Элементы сводки добавляются в конец документа и переносятся перед таблицей структуры
+        entries_tbl = self.__entries_tab._tbl
+        entries_tbl.addprevious(self.__word_doc.add_heading(summary.title, 1)._p)
+        for section in summary.sections:
+            entries_tbl.addprevious(self.__word_doc.add_heading(section.title, 2)._p)
+            entries_tbl.addprevious(self.__add_section_table(section)._tbl)
+        #Соседние таблицы Word объединяет, поэтому перед таблицей структуры нужен абзац
+        entries_tbl.addprevious(self.__word_doc.add_paragraph()._p)
+
+    def __add_section_table(self, section):
+        """Добавление в конец документа таблицы раздела.
+
+        Args:
+            section (ReportSection): раздел отчета
+
+        Returns:
+            Table: таблица раздела
+        """
+        self.__data_tab = self.__word_doc.add_table(1, len(section.columns), 'Light List Accent 1')
+        self.__data_tab.autofit = True
+        for cell, text in zip(self.__data_tab.rows[0].cells, section.columns, strict = True):
+            cell.text = text
+        #Строки раздела выводятся так же, как строки основной таблицы
+        self.__cells_pr = None
+        self.__rows.extend(tuple(map(str, row)) for row in section.formatted_rows())
+        self.__flush_rows()
+        return self.__data_tab
+
+    def __run_xml(self, text):
+        """Формирование XML текста ячейки так же, как это делает cell.text в python-docx.
+
+        Args:
+            text (str): текст ячейки
+
+        Returns:
+            str: XML элемента w:r
         """
-        new_row = self.__data_tab.add_row()
-        for j, cell in enumerate(new_row.cells):
-                    match j:
-                        case 0:
-                            cell.text = str(name)
-                        case 1:
-                            cell.text = str(size)
-                        case 2:
-                            cell.text = str(last_changed) 
+        parts = []
+        for part in type(self).SPECIAL_CHARS.split(text):
+            match part:
+                case '':
+                    continue
+                case '\t':
+                    parts.append('<w:tab/>')
+                case '\n' | '\r':
+                    parts.append('<w:br/>')
+                case _:
+                    space = ' xml:space="preserve"' if part != part.strip() else ''
+                    parts.append(f'<w:t{space}>{escape(part)}</w:t>')
+        return f'<w:r>{"".join(parts)}</w:r>'
 
     def save_file(self):
         """Сохранение файла отчета."""
+        #Вывод оставшихся строк
+        self.__flush_rows()
         #Сохранение Word документа
         print(self._report_path)
-        self.__word_doc.save(self._report_path)
\ No newline at end of file
+        self.__word_doc.save(self._report_path)
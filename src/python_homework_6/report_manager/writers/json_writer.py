@@ -6,41 +6,165 @@
 import json
 
 from report_manager.base.base_writer import BaseWriter
+from report_manager.base.formatters import format_size, readable_change, readable_mtime
 
 
 class JsonWriter(BaseWriter):
-    """Класс Writer для создания отчета в JSON формате."""
+    """Класс Writer для создания отчета в JSON формате.
 
-    def __init__(self, report_path, dir_path):
+    Элементы массива выводятся в файл сразу по мере поступления, поэтому расход
+    памяти не зависит от количества записей. Поддерживается вывод в формате
+    JSON Lines (NDJSON) - по одному объекту на строку.
+
+    Если отчет содержит разделы (ReportSection) или сводку (ReportSummary), то вместо
+    массива выводится объект: записи - в поле "entries", строки каждого раздела - в поле
+    с именем раздела, сводка - объектом в поле с именем сводки. В формате JSON Lines
+    строки раздела выводятся объектами с полем "section".
+    """
+
+    def __init__(self, report_path, dir_path, json_lines = False, compress = False, changes = False,
+                 sections = False):
         """Инициализация объекта класса.
 
         Args:
-            report_path (str): путь к файлу отчету 
+            report_path (str): путь к файлу отчету
             dir_path (str): путь к исследуемому каталогу
+            json_lines (bool): выводить ли отчет в формате JSON Lines
+            compress (bool): сжимать ли файл отчета в gzip
+            changes (bool): выводить ли тип изменения (отчет об изменениях)
+            sections (bool): будут ли в отчете разделы или сводка (вывод объекта вместо массива)
         """
         super().__init__(report_path, dir_path)
+        self._json_lines = json_lines
+        self._compress = compress
+        self._changes = changes
+        self._sections = sections and not json_lines
+        #Выведен ли конец массива записей
+        self._entries_closed = False
         self._json_file = None
-        self._json_data = []
+        #Количество выведенных элементов массива
+        self._count = 0
 
     def create_file(self):
         """Создание файла."""
         #Открытие файла не через контекстный менеджер нужно, потому что
         #данные в файл выводятся в другом методе write_to_file. Файл закрывается в методе save_file()
-        self._json_file = open(self._report_path, 'w', encoding = 'utf-8')  # noqa: PTH123, SIM115
+        self._json_file = self._open_text_file(self._compress)
+        if self._sections:
+            self._json_file.write('{\n    "entries": ')
+
+    def write_to_file(self, record):
+        """Вывод JSON данных о файле/папке.
+
+        В обычном режиме вывод совпадает с json.dump(..., indent = 4) для всего массива.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+        """
+        self._json_file.write(self._format_record(record))
+
+    def write_batch(self, records):
+        """Вывод пачки записей одним вызовом write.
+
+        Args:
+            records (list): записи ScanRecord о файлах/папках
+        """
+        self._json_file.write(''.join(map(self._format_record, records)))
+
+    def _format_record(self, record):
+        """Формирование текста JSON элемента для записи.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+
+        Returns:
+            str: текст элемента вместе с разделителем
+        """
+        name = json.dumps(record.path, ensure_ascii = False)
+        size = json.dumps(format_size(record), ensure_ascii = False)
+        last_changed = json.dumps(readable_mtime(record.mtime), ensure_ascii = False)
+        self._count += 1
+        #Тип изменения выводится последним полем элемента
+        change = json.dumps(readable_change(record), ensure_ascii = False) if self._changes else None
+        if self._json_lines:
+            change = f', "change": {change}' if change is not None else ''
+            return f'{{"name": {name}, "size": {size}, "last_changed": {last_changed}{change}}}\n'
+        change = f',\n        "change": {change}' if change is not None else ''
+        prefix = ',\n' if self._count > 1 else '[\n'
+        item = (f'{prefix}    {{\n'
+                f'        "name": {name},\n'
+                f'        "size": {size},\n'
+                f'        "last_changed": {last_changed}{change}\n'
+                '    }')
+        #Массив записей вложен в объект отчета
+        return item.replace('\n', '\n    ') if self._sections else item
+
+    def _close_entries(self):
+        """Вывод конца массива записей."""
+        if not self._entries_closed:
+            self._entries_closed = True
+            if self._count:
+                self._json_file.write('\n    ]' if self._sections else '\n]')
+            else:
+                self._json_file.write('[]')
+
+    def write_section(self, section):
+        """Вывод раздела отчета.
+
+        Args:
+            section (ReportSection): раздел отчета
+        """
+        rows = self._section_rows(section)
+        if self._json_lines:
+            self._json_file.write(''.join(json.dumps({'section': section.name, **row}, ensure_ascii = False) + '\n'
+                                          for row in rows))
+            return
+        if not self._sections:
+            return
+        self._close_entries()
+        text = json.dumps(rows, ensure_ascii = False, indent = 4).replace('\n', '\n    ')
+        self._json_file.write(f',\n    {json.dumps(section.name)}: {text}')
+
+    def write_summary(self, summary):
+        """Вывод сводки отчета объектом, поля которого - строки разделов сводки.
+
+        В формате JSON Lines строки разделов сводки выводятся как строки обычных разделов.
 
-    def write_to_file(self, name, size, last_changed):
-        """Сбор JSON данных.
-        
         Args:
-            name (str): имя файла/папки
-            size (str): размера файла в читаемом формате
-            last_changed (str): дата последнего изменения в читаемом формате
+            summary (ReportSummary): сводка отчета
         """
-        self._json_data.append({'name': str(name),
-                                'size': size,
-                                'last_changed': str(last_changed)})
-        
+        if self._json_lines:
+            super().write_summary(summary)
+            return
+        if not self._sections:
+            return
+        self._close_entries()
+        value = {section.name: self._section_rows(section) for section in summary.sections}
+        text = json.dumps(value, ensure_ascii = False, indent = 4).replace('\n', '\n    ')
+        self._json_file.write(f',\n    {json.dumps(summary.name)}: {text}')
+
+    @staticmethod
+    def _section_rows(section):
+        """Преобразование строк раздела в объекты JSON.
+
+        Args:
+            section (ReportSection): раздел отчета
+
+        Returns:
+            list: строки раздела - словари с полями section.keys
+        """
+        #Размеры выводятся числом байт, время изменения - так же, как поле "last_changed" записей
+        return [dict(zip(section.keys, row, strict = True)) for row in section.formatted_rows(size = None)]
+
     def save_file(self):
-        """Вывод данных в файл и сохранение файла."""
-        json.dump(self._json_data, self._json_file, ensure_ascii = False, indent = 4)
+        """Закрытие JSON массива и сохранение файла."""
+        if not self._json_lines:
+            self._close_entries()
+            if self._sections:
+                self._json_file.write('\n}')
         self._json_file.close()
+
+    def close(self):
+        """Закрытие файла отчета без сохранения при ошибке."""
+        if self._json_file is not None and not self._json_file.closed:
+            self._json_file.close()
@@ -3,6 +3,7 @@
 Содержит класс PdfWriter.
 """
 
+from functools import cache
 from pathlib import Path
 
 from reportlab.lib.pagesizes import A4
@@ -11,10 +12,25 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 from report_manager.base.base_writer import BaseWriter
+from report_manager.base.formatters import format_size, readable_change, readable_mtime
+
+
+@cache
+def _register_font():
+    """Регистрация шрифта Arial для кириллицы (выполняется один раз за процесс)."""
+    #Путь к шрифту относительно корня проекта
+    base_dir = Path(__file__).resolve().parent.parent
+    arial_path = base_dir / 'assets' / 'fonts' / 'arial.ttf'
+    pdfmetrics.registerFont(TTFont('Arial', arial_path))
 
 
 class PdfWriter(BaseWriter):
-    """Класс Writer для создания отчета в PDF формате."""
+    """Класс Writer для создания отчета в PDF формате.
+
+    Текст узла формируется при отрисовке страницы. Страница с последним узлом
+    каждого открытого уровня не отрисовывается, пока уровень не закрыт, поэтому
+    к отрисовке строки папки ее итоги (ScanRecord.totals) уже известны.
+    """
 
     #Размер шрифта заголовка
     HEADER_FONTSIZE = 14 
@@ -28,24 +44,25 @@ class PdfWriter(BaseWriter):
     LEFT = 30
     TOP = 810
     BOTTOM = 20
+    #Итоги папок выводятся без задержки записей
+    DEFERS_TOTALS = True
 
-    def __init__(self, report_path, dir_path):
+    def __init__(self, report_path, dir_path, changes = False):
         """Инициализация параметров вывода PDF файла. Регистрация шрифта для вывода текста.
 
         Args:
             report_path (str): путь для создания файла отчета
             dir_path (str): путь анализируемого каталога
+            changes (bool): выводить ли тип изменения перед узлом (отчет об изменениях)
         """
         super().__init__(report_path, dir_path)
-        #Постраничный список операций для рендера
-        self._pages_ops = [[]]
+        self._changes = changes
+        #Операции для рендера по номерам еще не выведенных страниц
+        self._pages_ops = {0: []}
         #Canvas для отрисовки страниц
         self._pdf_canvas = None
         #Регистрирация шрифта Arial для кириллицы
-        #Путь к шрифту относительно корня проекта
-        base_dir = Path(__file__).resolve().parent.parent
-        arial_path = base_dir / 'assets' / 'fonts' / 'Arial.ttf'
-        pdfmetrics.registerFont(TTFont('Arial', arial_path))
+        _register_font()
 
     def create_file(self):
         """Создание Canvas для отрисовки документа и вывод заголовка документа."""
@@ -82,19 +99,34 @@ class PdfWriter(BaseWriter):
         self._last_x = first_node[0]
         self._last_y = first_node[1]
 
-    def write_to_file(self, name, size, last_changed):
+    def write_to_file(self, record):
         """Формирование списка операций для дальнейшей отрисовки информации о файле/папке.
 
         Args:
-            name (str): имя файла/папки
-            size (str): размера файла в читаемом формате
-            last_changed (str): дата последнего изменения в читаемом формате
+            record (ScanRecord): запись о файле/папке
+        """
+        self._layout_record(record)
+        #Отрисовка страниц, на которые больше не могут выводиться линии
+        self._flush_pages()
+
+    def write_batch(self, records):
+        """Формирование операций для пачки записей с одной проверкой готовых страниц.
+
+        Args:
+            records (list): записи ScanRecord о файлах/папках
+        """
+        for record in records:
+            self._layout_record(record)
+        self._flush_pages()
+
+    def _layout_record(self, record):
+        """Расчет положения узла записи и добавление операций его отрисовки.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
         """
-        #Определение глубины файла/папки относительно корневого каталога
-        path = Path(name)
-        relative_path = path.relative_to(self._dir_path)
-        parts =  relative_path.parts
-        new_deep_level = len(parts) - 1
+        #Глубина файла/папки относительно корневого каталога
+        new_deep_level = record.depth
 
         #Если глубина не изменилась, то необходимо
         if new_deep_level == self._deep_level:
@@ -139,7 +171,7 @@ class PdfWriter(BaseWriter):
         #Отрисовка текущего узла (|_ + текст)
         self._pages_ops[self._cur_page].append(('line', (self._last_x, self._last_y, self._last_x + self._line_height / 2, self._last_y)))
         self._pages_ops[self._cur_page].append(('line', (self._last_x, self._last_y + self._line_height / 2, self._last_x, self._last_y)))
-        self._pages_ops[self._cur_page].append(('drawString', (self._last_x + 10, self._last_y - 3, f'{path.name} - {size} - {last_changed}')))
+        self._pages_ops[self._cur_page].append(('record', (self._last_x + 10, self._last_y - 3, record)))
 
         #Обновление Y для следующего узла
         self._last_y -= self._line_height
@@ -149,13 +181,76 @@ class PdfWriter(BaseWriter):
         if self._last_y < type(self).BOTTOM:
             #Обновление параметров для новой страницы
             self._cur_page += 1
-            self._pages_ops.append([])
+            self._pages_ops[self._cur_page] = []
             self._last_y = type(self).TOP
             self._root = True
 
         #Сохранение глубины узла
         self._deep_level = new_deep_level
-        
+
+    def _flush_pages(self):
+        """Отрисовка страниц, которые больше не могут измениться.
+
+        Линии продолжения рисуются только до страниц узлов, сохраненных в
+        _deep_level_last_pos, поэтому все страницы до самой ранней из них
+        (и до текущей) можно сразу вывести в Canvas и освободить память.
+        """
+        limit = min(self._cur_page, *(pos[0] for pos in self._deep_level_last_pos))
+        for page in list(self._pages_ops):
+            if page >= limit:
+                break
+            self._render_page(self._pages_ops.pop(page))
+
+    def write_section(self, section):
+        """Вывод раздела отчета на отдельных страницах после структуры каталога.
+
+        Args:
+            section (ReportSection): раздел отчета
+        """
+        #Все узлы структуры уже получены, поэтому оставшиеся страницы выводятся сразу
+        self._render_canvas()
+        self._pdf_canvas.setFont('Arial', type(self).HEADER_FONTSIZE)
+        self._pdf_canvas.drawString(*type(self).BEGIN_PAGE, section.title)
+        self._pdf_canvas.setFont('Arial', type(self).BODY_FONTSIZE)
+        self._draw_rows((section.columns, *section.formatted_rows()), type(self).TOP - type(self).HEADER_FONTSIZE)
+        self._pdf_canvas.showPage()
+
+    def write_summary(self, summary):
+        """Вывод сводки отчета на отдельных страницах после структуры каталога.
+
+        Args:
+            summary (ReportSummary): сводка отчета
+        """
+        #Все узлы структуры уже получены, поэтому оставшиеся страницы выводятся сразу
+        self._render_canvas()
+        self._pdf_canvas.setFont('Arial', type(self).HEADER_FONTSIZE)
+        self._pdf_canvas.drawString(*type(self).BEGIN_PAGE, summary.title)
+        self._pdf_canvas.setFont('Arial', type(self).BODY_FONTSIZE)
+        y = type(self).TOP - type(self).HEADER_FONTSIZE
+        for section in summary.sections:
+            #Раздел отделяется пустой строкой, заголовок раздела выводится первой строкой
+            y = self._draw_rows(((f'{section.title}:',), section.columns, *section.formatted_rows()), y - self._line_height)
+        self._pdf_canvas.showPage()
+
+    def _draw_rows(self, rows, y):
+        """Вывод строк раздела с переходом на новые страницы.
+
+        Args:
+            rows (Iterable): строки - кортежи значений столбцов
+            y (float): координата Y первой строки
+
+        Returns:
+            float: координата Y следующей строки
+        """
+        for row in rows:
+            if y < type(self).BOTTOM:
+                self._pdf_canvas.showPage()
+                self._pdf_canvas.setFont('Arial', type(self).BODY_FONTSIZE)
+                y = type(self).TOP
+            self._pdf_canvas.drawString(type(self).LEFT, y, ' - '.join(map(str, row)))
+            y -= self._line_height
+        return y
+
     def save_file(self):
         """Отрисовка всех операций и сохранение файла отчета."""
         #Сохранение PDF документа
@@ -163,17 +258,30 @@ class PdfWriter(BaseWriter):
         self._pdf_canvas.save()
 
     def _render_canvas(self):
-        """Постраничная отрисовка всех операций."""
-        for page_ops in self._pages_ops:
-            #Параметры вывода структуры
-            self._pdf_canvas.setFont('Arial', type(self).BODY_FONTSIZE)
-            self._pdf_canvas.setLineWidth(type(self).LINE_WIDTH)
-            #Отрисовка всех операций страницы
-            for op in page_ops:
-                match op[0]:
-                    case 'line':
-                        self._pdf_canvas.line(*op[1])
-                    case 'drawString':
-                        self._pdf_canvas.drawString(*op[1])
-            #Вывод страницы
-            self._pdf_canvas.showPage()
\ No newline at end of file
+        """Постраничная отрисовка всех оставшихся операций."""
+        for page_ops in self._pages_ops.values():
+            self._render_page(page_ops)
+        self._pages_ops.clear()
+
+    def _render_page(self, page_ops):
+        """Отрисовка операций одной страницы и вывод страницы.
+
+        Args:
+            page_ops (list): список операций страницы
+        """
+        #Параметры вывода структуры
+        self._pdf_canvas.setFont('Arial', type(self).BODY_FONTSIZE)
+        self._pdf_canvas.setLineWidth(type(self).LINE_WIDTH)
+        #Отрисовка всех операций страницы
+        for op in page_ops:
+            match op[0]:
+                case 'line':
+                    self._pdf_canvas.line(*op[1])
+                case 'record':
+                    x, y, record = op[1]
+                    text = f'{record.name} - {format_size(record)} - {readable_mtime(record.mtime)}'
+                    if self._changes and record.change is not None:
+                        text = f'[{readable_change(record)}] {text}'
+                    self._pdf_canvas.drawString(x, y, text)
+        #Вывод страницы
+        self._pdf_canvas.showPage()
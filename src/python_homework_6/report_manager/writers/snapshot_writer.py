@@ -0,0 +1,79 @@
+"""Модуль для сохранения результатов сканирования в снимок.
+
+Содержит класс SnapshotWriter.
+"""
+
+from report_manager.base.base_writer import BaseWriter
+from report_manager.scanner.scan_snapshot import SnapshotBuilder
+
+
+class SnapshotWriter(BaseWriter):
+    """Класс Writer для сохранения снимка сканирования (ScanSnapshot).
+
+    По снимку можно сформировать отчеты любых форматов без повторного
+    обхода каталога (ReportManager.from_snapshot).
+    """
+
+    #Итоги папок записываются в снимок после их вычисления
+    DEFERS_TOTALS = True
+
+    def __init__(self, report_path, dir_path):
+        """Инициализация объекта класса.
+
+        Args:
+            report_path (str): путь к файлу снимка
+            dir_path (str): путь к исследуемому каталогу
+        """
+        super().__init__(report_path, dir_path)
+        self._builder = None
+        #Номера и записи папок, итоги которых еще вычисляются
+        self._pending = []
+
+    def create_file(self):
+        """Создание пустого снимка."""
+        self._builder = SnapshotBuilder(self._dir_path)
+
+    def write_to_file(self, record):
+        """Добавление записи в снимок.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+        """
+        self.write_batch([record])
+
+    def write_batch(self, records):
+        """Добавление пачки записей в снимок.
+
+        Args:
+            records (list): записи ScanRecord о файлах/папках
+        """
+        add = self._builder.add
+        pending = self._pending
+        for record in records:
+            index = add(record)
+            if type(record.totals) is list:
+                pending.append((index, record))
+        if pending:
+            self._pending = self._resolve_totals(pending)
+
+    def _resolve_totals(self, pending):
+        """Запись итогов папок, которые уже вычислены.
+
+        Args:
+            pending (list): номера и записи папок, итоги которых еще вычисляются
+
+        Returns:
+            list: папки, итоги которых по-прежнему не известны
+        """
+        unresolved = []
+        for index, record in pending:
+            if type(record.totals) is list:
+                unresolved.append((index, record))
+            else:
+                self._builder.set_totals(index, record.totals)
+        return unresolved
+
+    def save_file(self):
+        """Сохранение снимка в файл."""
+        self._pending = self._resolve_totals(self._pending)
+        self._builder.save(self._report_path)
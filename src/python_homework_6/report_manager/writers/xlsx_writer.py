@@ -4,15 +4,28 @@
 """
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Border, Font, Side
+from openpyxl.utils import get_column_letter
 
 from report_manager.base.base_writer import BaseWriter
+from report_manager.base.formatters import format_size, mtime_datetime, readable_change
 
 
 class XlsxWriter(BaseWriter):
-    """Класс Writer для создания отчета в XLSX формате."""
+    """Класс Writer для создания отчета в XLSX формате.
 
-    def __init__(self, report_path, dir_path):
+    Книга создается в режиме write-only: строки сразу сериализуются во временный
+    файл и не хранятся в памяти. При достижении предела строк листа Excel вывод
+    продолжается на новом листе с тем же заголовком.
+    """
+
+    #Максимальное количество строк на листе Excel
+    MAX_ROWS = 1048576
+    #Название листа с данными
+    SHEET_TITLE = 'Иерархия каталога'
+
+    def __init__(self, report_path, dir_path, changes = False):
         """Инициализация параметров вывода XLSX файла.
 
         Создание стилей/шрифтов для вывода.
@@ -20,8 +33,10 @@ class XlsxWriter(BaseWriter):
         Args:
             report_path (str): путь для создания файла отчета
             dir_path (str): путь анализируемого каталога
+            changes (bool): выводить ли столбец с типом изменения (отчет об изменениях)
         """
         super().__init__(report_path, dir_path)
+        self._changes = changes
 
         self._header_font = Font(name = 'Calibri', size = 12, bold=True, color='000000')
         side_medium = Side(border_style='medium', color='000000')
@@ -29,36 +44,157 @@ class XlsxWriter(BaseWriter):
                                     right = side_medium, 
                                     top = side_medium, 
                                     bottom = side_medium)
+        self.__excel_wb = None
+        self.__excel_ws = None
+        #Количество листов и строк на текущем листе
+        self.__sheets = 0
+        self.__rows = 0
 
     def create_file(self):
-        """Создание WorkBook + WorkSheet и вывод заголовка."""
-        #Создание рабочей книги с листом и названием
-        self.__excel_wb = Workbook()
-        self.__excel_ws =  self.__excel_wb.active
-        self.__excel_ws.title = 'Иерархия каталога'
+        """Создание WorkBook в режиме write-only и первого листа."""
+        self.__excel_wb = Workbook(write_only = True)
+        self.__add_sheet()
 
-        #Строка с заголовком
-        self.__excel_ws.append(['', f'Отчет о структуре файлов и папок каталога {self._dir_path}'])
-        self.__excel_ws[1][1].font = self._header_font
+    def __add_sheet(self):
+        """Создание нового листа с заголовком и заголовочной строкой таблицы."""
+        self.__sheets += 1
+        title = type(self).SHEET_TITLE
+        self.__excel_ws = self.__excel_wb.create_sheet(
+            title if self.__sheets == 1 else f'{title} ({self.__sheets})')
 
-        self.__excel_ws.append([])
-        self.__excel_ws.row_dimensions[2].height = 7
+        #Ширина столбцов и высота строк задаются до вывода строк
         self.__excel_ws.column_dimensions['A'].width = 1
-
-        #Заголовчная строка таблицы с данными
-        self.__excel_ws.append(['', 'Имя файла/папки', 'Размер файла', 'Последнее изменение'])
-        for i in range(3):
-            self.__excel_ws[3][i + 1].font = self._header_font
-            self.__excel_ws[3][i + 1].border = self._border_medium
         self.__excel_ws.column_dimensions['B'].width = 100
         self.__excel_ws.column_dimensions['C'].width = 25
         self.__excel_ws.column_dimensions['D'].width = 25
+        if self._changes:
+            self.__excel_ws.column_dimensions['E'].width = 20
+        self.__excel_ws.row_dimensions[2].height = 7
+
+        #Строка с заголовком
+        self.__excel_ws.append(['', self.__header_cell(
+            f'Отчет о структуре файлов и папок каталога {self._dir_path}')])
+        self.__excel_ws.append([])
+
+        #Заголовчная строка таблицы с данными
+        headers = ['Имя файла/папки', 'Размер файла', 'Последнее изменение']
+        if self._changes:
+            headers.append('Изменение')
+        self.__excel_ws.append([''] + [self.__header_cell(text, border = True) for text in headers])
+        self.__rows = 3
+
+    def __header_cell(self, value, border = False):
+        """Создание ячейки заголовка со стилем для листа в режиме write-only.
+
+        Args:
+            value (str): текст ячейки
+            border (bool): нужна ли рамка ячейки
+
+        Returns:
+            WriteOnlyCell: ячейка со стилем
+        """
+        cell = WriteOnlyCell(self.__excel_ws, value)
+        cell.font = self._header_font
+        if border:
+            cell.border = self._border_medium
+        return cell
+
+    def write_to_file(self, record):
+        """Вывод новой строки с данными в WorkSheet.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+        """
+        if self.__rows >= type(self).MAX_ROWS:
+            self.__add_sheet()
+        self.__excel_ws.append(self.__format_row(record))
+        self.__rows += 1
 
-    def write_to_file(self, name, size, last_changed):
-        """Вывод новой строки с данными в WorkSheet."""
-        self.__excel_ws.append(['', str(name), size, last_changed])
+    def write_batch(self, records):
+        """Вывод пачки строк с данными в WorkSheet с переходом на новые листы.
+
+        Args:
+            records (list): записи ScanRecord о файлах/папках
+        """
+        start = 0
+        while start < len(records):
+            if self.__rows >= type(self).MAX_ROWS:
+                self.__add_sheet()
+            #Количество строк, которые поместятся на текущий лист
+            end = min(len(records), start + type(self).MAX_ROWS - self.__rows)
+            append = self.__excel_ws.append
+            for record in records[start:end]:
+                append(self.__format_row(record))
+            self.__rows += end - start
+            start = end
+
+    def __format_row(self, record):
+        """Формирование строки листа для записи.
+
+        Args:
+            record (ScanRecord): запись о файле/папке
+
+        Returns:
+            list: значения ячеек строки
+        """
+        row = ['', record.path, format_size(record), mtime_datetime(record.mtime)]
+        if self._changes:
+            row.append(readable_change(record))
+        return row
         
+    def write_section(self, section):
+        """Вывод раздела отчета на отдельный лист.
+
+        Args:
+            section (ReportSection): раздел отчета
+        """
+        self.__excel_ws = self.__excel_wb.create_sheet(section.title)
+        self.__excel_ws.column_dimensions['A'].width = 1
+        #Столбцы данных начинаются со столбца B
+        for column in range(2, len(section.columns) + 2):
+            self.__excel_ws.column_dimensions[get_column_letter(column)].width = 25
+        self.__excel_ws.append([''] + [self.__header_cell(text, border = True) for text in section.columns])
+        #Размеры выводятся числом байт, время изменения - датой
+        for row in section.formatted_rows(size = None, mtime = mtime_datetime):
+            self.__excel_ws.append(['', *row])
+
+    def write_summary(self, summary):
+        """Вывод сводки отчета на отдельный лист: таблицы разделов одна под другой.
+
+        Args:
+            summary (ReportSummary): сводка отчета
+        """
+        self.__excel_ws = self.__excel_wb.create_sheet(summary.title)
+        self.__excel_ws.column_dimensions['A'].width = 1
+        columns = max((len(section.columns) for section in summary.sections), default = 0)
+        for column in range(2, columns + 2):
+            self.__excel_ws.column_dimensions[get_column_letter(column)].width = 25
+        self.__excel_ws.append(['', self.__header_cell(summary.title)])
+        for section in summary.sections:
+            self.__excel_ws.append([])
+            self.__excel_ws.append(['', self.__header_cell(section.title)])
+            self.__excel_ws.append([''] + [self.__header_cell(text, border = True) for text in section.columns])
+            for row in section.formatted_rows(size = None, mtime = mtime_datetime):
+                self.__excel_ws.append(['', *row])
+
     def save_file(self):
         """Сохранение файла отчета."""
         #Сохранение Excel документа
         self.__excel_wb.save(self._report_path)
+
+    def close(self):
+        """Закрытие листов и удаление их временных файлов без сохранения при ошибке.
+
+        Открытого API для удаления временного файла листа в openpyxl нет, поэтому
+        используется метод cleanup, если он есть в установленной версии. Иначе
+        временные файлы удаляет сам openpyxl при завершении процесса.
+        """
+        if self.__excel_wb is None:
+            return
+        for ws in self.__excel_wb.worksheets:
+            #Листы, уже записанные при сохранении книги, пропускаются
+            if not ws.closed:
+                ws.close()
+                cleanup = getattr(getattr(ws, '_writer', None), 'cleanup', None)
+                if cleanup is not None:
+                    cleanup()
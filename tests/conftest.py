@@ -0,0 +1,35 @@
+"""Общие фикстуры тестов."""
+
+import os
+
+import pytest
+
+from .utils import MTIME, make_zip
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Дерево каталога с похожими именами, вложенными папками и ZIP архивом.
+
+    Returns:
+        Path: путь к анализируемому каталогу
+    """
+    root = tmp_path / 'root'
+    files = {
+        'a/c.txt': b'c' * 10,
+        'a/d/e.py': b'e' * 20,
+        'a-b/f.txt': b'f' * 30,
+        'a b.txt': b'',
+        'B.log': b'b' * 5,
+        'z/y/x/w.bin': b'w' * 1000,
+    }
+    for name, data in files.items():
+        path = root / name
+        path.parent.mkdir(parents = True, exist_ok = True)
+        path.write_bytes(data)
+    (root / 'empty').mkdir()
+    (root / 'arch.zip').write_bytes(make_zip({'a/c.txt': '1', 'a-b': '22', 'a/d/e.txt': '333'}))
+    for path in root.rglob('*'):
+        os.utime(path, (MTIME, MTIME))
+    os.utime(root, (MTIME, MTIME))
+    return root
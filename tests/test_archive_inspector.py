@@ -0,0 +1,73 @@
+"""Тесты чтения архивов ArchiveInspector."""
+
+import pytest
+from report_manager.scanner import ArchiveInspector, TarFormat, ZipFormat
+
+from .utils import MTIME, make_tar, make_zip
+
+
+def listing_of(path, **kwargs):
+    return ArchiveInspector(**kwargs).list_archive(str(path), path.stat().st_size, path.stat().st_mtime)
+
+
+@pytest.mark.parametrize(('name', 'mode'), [('a.tar', 'w'), ('a.tar.gz', 'w:gz'), ('a.tgz', 'w:gz'),
+                                            ('a.tar.bz2', 'w:bz2'), ('a.tar.xz', 'w:xz')])
+def test_tar_listing(tmp_path, name, mode):
+    path = tmp_path / name
+    path.write_bytes(make_tar({'./top': None, './top/f.txt': b'f' * 7, 'top/sub/g.txt': b'gg', 'a-b': b'x'}, mode))
+
+    assert ArchiveInspector.is_archive_name(str(path))
+    assert listing_of(path) == [
+        ('a-b', False, 1, MTIME),
+        #Папки восстанавливаются по путям файлов и выводятся без даты изменения
+        ('top', True, 0, None),
+        ('top/f.txt', False, 7, MTIME),
+        ('top/sub', True, 0, None),
+        ('top/sub/g.txt', False, 2, MTIME),
+    ]
+
+
+def test_zip_listing_keeps_folder_contents_together(tmp_path):
+    path = tmp_path / 'a.zip'
+    path.write_bytes(make_zip({'a/c.txt': '1', 'a-b': '22', 'a/d/e.txt': '333'}))
+
+    assert [key for key, *_ in listing_of(path)] == ['a', 'a/c.txt', 'a/d', 'a/d/e.txt', 'a-b']
+
+
+def test_nested_archives(tmp_path):
+    inner_zip = make_zip({'deep/x.txt': 'x' * 10})
+    inner_tar = make_tar({'lvl2/inner.zip': inner_zip, 'lvl2/y.txt': b'yy'})
+    path = tmp_path / 'outer.zip'
+    path.write_bytes(make_zip({'in.tgz': inner_tar, 'big.zip': make_zip({'b.txt': 'b' * 5000})}))
+
+    keys = [key for key, *_ in listing_of(path, nested_size = len(inner_tar))]
+
+    #big.zip больше предельного размера вложенного архива и не раскрывается
+    assert keys == ['big.zip', 'in.tgz', 'in.tgz/lvl2', 'in.tgz/lvl2/inner.zip', 'in.tgz/lvl2/inner.zip/deep',
+                    'in.tgz/lvl2/inner.zip/deep/x.txt', 'in.tgz/lvl2/y.txt']
+    assert [key for key, *_ in listing_of(path, max_nesting = 1)] == [
+        'big.zip', 'big.zip/b.txt', 'in.tgz', 'in.tgz/lvl2', 'in.tgz/lvl2/inner.zip', 'in.tgz/lvl2/y.txt']
+    assert [key for key, *_ in listing_of(path, max_nesting = 0)] == ['big.zip', 'in.tgz']
+
+
+def test_corrupt_archives(tmp_path, capsys):
+    path = tmp_path / 'bad.tar.gz'
+    path.write_bytes(b'\x1f\x8b garbage')
+    nested = tmp_path / 'nested.zip'
+    nested.write_bytes(make_zip({'broken.zip': 'not a zip', 'ok.txt': 'o'}))
+
+    assert listing_of(path) is None
+    assert [key for key, *_ in listing_of(nested)] == ['broken.zip', 'ok.txt']
+    assert 'broken.zip' in capsys.readouterr().out
+
+
+def test_formats_and_limits(tmp_path):
+    path = tmp_path / 'a.tar'
+    path.write_bytes(make_tar({'f.txt': b'f'}, 'w'))
+    inspector = ArchiveInspector(formats = [ZipFormat()])
+
+    assert isinstance(ArchiveInspector().archive_format(str(path)), TarFormat)
+    assert inspector.archive_format(str(path)) is None
+    for kwargs in ({'nested_size': -1}, {'max_nesting': -1}, {'timeout': 0}):
+        with pytest.raises(ValueError, match = 'Недопустим'):
+            ArchiveInspector(**kwargs)
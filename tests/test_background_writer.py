@@ -0,0 +1,68 @@
+"""Тесты вывода отчета в отдельном потоке или процессе."""
+
+import os
+
+import pytest
+from report_manager import CsvWriter, ScanRecord
+from report_manager.base import BackgroundWriter
+
+from .test_writers import ROOT, make_records, write_records
+
+
+class DyingWriter(CsvWriter):
+    """Writer, процесс которого аварийно завершается на первой пачке записей."""
+
+    def write_batch(self, _records):
+        """Аварийное завершение процесса вместо вывода записей."""
+        os._exit(3)
+
+
+def dying_writer_factory(*_args):
+    """Writer, процесс которого аварийно завершается при создании.
+
+    Returns:
+        CsvWriter: не возвращается
+    """
+    os._exit(5)
+
+
+def fill_queue(writer, chunk):
+    """Передача пачек записей, количество которых больше размера очереди.
+
+    Args:
+        writer (BackgroundWriter): Writer
+        chunk (list): пачка записей ScanRecord
+    """
+    for _ in range(writer.QUEUE_CHUNKS * 10):
+        writer.write_batch(chunk)
+
+
+@pytest.mark.parametrize('mode', BackgroundWriter.MODES)
+def test_background_matches_direct_output(tmp_path, mode):
+    records = make_records(False)
+    write_records(CsvWriter(tmp_path / 'direct.csv', ROOT), records, True)
+    write_records(BackgroundWriter(CsvWriter, tmp_path / 'background.csv', ROOT, mode = mode), records, True)
+
+    assert (tmp_path / 'background.csv').read_bytes() == (tmp_path / 'direct.csv').read_bytes()
+
+
+def test_save_file_fails_when_process_dies(tmp_path):
+    writer = BackgroundWriter(DyingWriter, tmp_path / 'report.csv', ROOT, mode = 'process')
+    writer.create_file()
+    writer.write_batch(make_records(False)[:10])
+
+    with pytest.raises(RuntimeError, match = 'код завершения 3'):
+        writer.save_file()
+    writer.close()
+
+
+def test_write_fails_when_process_dies_with_full_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(BackgroundWriter, 'QUEUE_CHUNKS', 2)
+    monkeypatch.setattr(BackgroundWriter, 'WAIT_STEP', 0.05)
+    writer = BackgroundWriter(dying_writer_factory, tmp_path / 'report.csv', ROOT, mode = 'process')
+    writer.create_file()
+    chunk = [ScanRecord(str(ROOT / 'a'), 1, 1700000000, 0, False)] * BackgroundWriter.CHUNK_ROWS
+
+    with pytest.raises(RuntimeError, match = 'код завершения 5'):
+        fill_queue(writer, chunk)
+    writer.close()
@@ -0,0 +1,66 @@
+"""Тесты пакетного формирования отчетов BatchRunner."""
+
+import json
+import time
+
+import pytest
+from report_manager import BatchRunner
+from report_manager.batch_runner import _run_job
+
+
+def slow_progress(_entries, _entries_per_second):
+    """Функция прогресса, задерживающая формирование отчета."""
+    time.sleep(5)
+
+
+def test_run_jobs(tree, tmp_path):
+    jobs = [
+        {'path': str(tree), 'report': str(tmp_path / 'first.csv')},
+        {'path': str(tmp_path / 'missing'), 'report': str(tmp_path / 'missing.csv')},
+        {'path': str(tree / 'a'), 'report': [str(tmp_path / 'second.json')], 'dir_sizes': True},
+    ]
+
+    summary = BatchRunner(jobs, processes = 2, stats = True).run()
+
+    assert summary['jobs'] == 3
+    assert summary['statuses'] == {'ok': 2, 'error': 1}
+    assert [result['path'] for result in summary['results']] == [job['path'] for job in jobs]
+    assert [result['status'] for result in summary['results']] == ['ok', 'error', 'ok']
+    assert summary['results'][0]['stats']['counters']['entries'] > 0
+    assert (tmp_path / 'first.csv').exists()
+    assert not (tmp_path / 'missing.csv').exists()
+    second = json.loads((tmp_path / 'second.json').read_text(encoding = 'utf-8'))
+    assert {record['name']: record['size'] for record in second}[str(tree / 'a' / 'd')].endswith('файлов: 1)')
+
+
+def test_from_manifest(tree, tmp_path):
+    manifest_path = tmp_path / 'jobs.json'
+    manifest_path.write_text(json.dumps([{'path': str(tree), 'report': str(tmp_path / 'report.csv')}]),
+                             encoding = 'utf-8')
+
+    summary = BatchRunner.from_manifest(manifest_path, processes = 1).run()
+
+    assert summary['statuses'] == {'ok': 1}
+    assert (tmp_path / 'report.csv').exists()
+
+
+def test_job_timeout(tree, tmp_path):
+    job = {'path': str(tree), 'report': str(tmp_path / 'report.csv'), 'progress': slow_progress}
+    started = time.perf_counter()
+
+    result = _run_job(job, 0.2)
+
+    assert result['status'] == 'timeout'
+    assert time.perf_counter() - started < 3
+    assert result['error'] == 'Превышено время выполнения 0.2 с'
+
+
+@pytest.mark.parametrize(('jobs', 'kwargs'), [
+    ([{'path': '.'}], {}),
+    (['.'], {}),
+    ([], {'processes': 0}),
+    ([], {'timeout': 0}),
+])
+def test_invalid_batch(jobs, kwargs):
+    with pytest.raises(ValueError, match = 'Задание|Недопустимое'):
+        BatchRunner(jobs, **kwargs)
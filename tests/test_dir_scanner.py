@@ -0,0 +1,141 @@
+"""Тесты обхода каталога DirScanner."""
+
+import os
+from pathlib import Path
+
+import pytest
+from report_manager import DirScanner, LinkPolicy, ReportStats, ScanFilter, ScanIndex
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_scan_order_matches_sorted_rglob(tree, workers):
+    records = list(DirScanner(tree, workers).scan())
+
+    assert [record.path for record in records] == [str(path) for path in sorted(tree.rglob('*'))]
+
+
+def test_scan_records_values(tree):
+    records = {record.path: record for record in DirScanner(tree).scan()}
+
+    for path in tree.rglob('*'):
+        record = records[str(path)]
+        stat = path.stat()
+        assert record.is_dir == path.is_dir()
+        assert record.depth == len(path.relative_to(tree).parts) - 1
+        assert record.mtime == stat.st_mtime
+        if not record.is_dir:
+            assert record.size == stat.st_size
+
+
+def test_scan_with_index_matches_plain_scan(tree, tmp_path):
+    expected = [(r.path, r.size, r.mtime, r.is_dir) for r in DirScanner(tree).scan()]
+    index_path = tmp_path / 'index.sqlite'
+
+    for _ in range(2):
+        with ScanIndex(index_path) as index:
+            records = [(r.path, r.size, r.mtime, r.is_dir) for r in DirScanner(tree, 2, index).scan()]
+        assert records == expected
+
+
+def test_scan_filter_prunes_excluded_dirs(tree):
+    scan_filter = ScanFilter(exclude = ['d', 'z/y'])
+
+    paths = [record.path for record in DirScanner(tree, scan_filter = scan_filter).scan()]
+
+    assert str(tree / 'a' / 'c.txt') in paths
+    assert str(tree / 'z') in paths
+    assert not any(path.startswith((str(tree / 'a' / 'd'), str(tree / 'z' / 'y'))) for path in paths)
+
+
+@pytest.fixture
+def links_tree(tmp_path):
+    """Каталог с символическими и жесткими ссылками.
+
+    Returns:
+        Path: путь к анализируемому каталогу
+    """
+    root = tmp_path / 'root'
+    (root / 'dir').mkdir(parents = True)
+    (root / 'dir' / 'file.txt').write_bytes(b'f' * 10)
+    (root / 'hard.txt').hardlink_to(root / 'dir' / 'file.txt')
+    (root / 'dir_link').symlink_to('dir')
+    (root / 'file_link').symlink_to('dir/file.txt')
+    (root / 'broken').symlink_to('missing')
+    (tmp_path / 'outside').mkdir()
+    (tmp_path / 'outside' / 'o.txt').write_bytes(b'o')
+    (root / 'out_link').symlink_to('../outside')
+    return root
+
+
+def scan_links(root, **kwargs):
+    """Обход каталога с получением путей, признаков папок и ссылок записей.
+
+    Args:
+        root (Path): путь к анализируемому каталогу
+        **kwargs: остальные параметры DirScanner
+
+    Returns:
+        list: кортежи (путь относительно root, папка, ссылка)
+    """
+    return [(str(Path(record.path).relative_to(root)), record.is_dir, record.link)
+            for record in DirScanner(root, **kwargs).scan()]
+
+
+def test_links_report(links_tree):
+    assert scan_links(links_tree, links = LinkPolicy.REPORT) == [
+        ('broken', True, 'missing'),
+        ('dir', True, None),
+        ('dir/file.txt', False, None),
+        ('dir_link', True, 'dir'),
+        ('file_link', False, 'dir/file.txt'),
+        ('hard.txt', False, str(links_tree / 'dir' / 'file.txt')),
+        ('out_link', True, '../outside'),
+    ]
+
+
+def test_links_skip(links_tree):
+    assert scan_links(links_tree, links = LinkPolicy.SKIP) == [
+        ('dir', True, None),
+        ('dir/file.txt', False, None),
+        ('hard.txt', False, str(links_tree / 'dir' / 'file.txt')),
+    ]
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_links_follow(links_tree, workers):
+    file_path = str(links_tree / 'dir' / 'file.txt')
+
+    assert scan_links(links_tree, workers = workers, links = LinkPolicy.FOLLOW) == [
+        ('broken', True, 'missing'),
+        ('dir', True, None),
+        ('dir/file.txt', False, None),
+        ('dir_link', True, str(links_tree / 'dir')),
+        ('file_link', False, file_path),
+        ('hard.txt', False, file_path),
+        ('out_link', True, None),
+        ('out_link/o.txt', False, None),
+    ]
+
+
+def test_hardlinks_stat_once(links_tree):
+    stats = ReportStats()
+
+    records = list(DirScanner(links_tree, stats = stats).scan())
+
+    assert len(records) == 7
+    assert stats.counter('stat_cached') == 1
+    assert stats.counter('link_references') == 1
+
+
+def test_one_file_system_skips_mount_points(tmp_path):
+    mount = next((path for path in ('/proc', '/sys', '/dev') if os.path.isdir(path)  # noqa: PTH112
+                  and os.stat(path).st_dev != tmp_path.stat().st_dev), None)  # noqa: PTH116
+    if mount is None:
+        pytest.skip('Нет каталога другой файловой системы')
+    root = tmp_path / 'root'
+    root.mkdir()
+    (root / 'mount').symlink_to(mount)
+
+    records = list(DirScanner(root, links = LinkPolicy.FOLLOW, one_file_system = True).scan())
+
+    assert [(record.path, record.is_dir) for record in records] == [(str(root / 'mount'), True)]
@@ -0,0 +1,73 @@
+"""Тесты отслеживания изменений каталога."""
+
+import errno
+import os
+import queue
+import threading
+
+import pytest
+from report_manager import ReportManager
+from report_manager.scanner import DirScanner, InotifyWatcher, PollingWatcher, TreeModel
+
+
+def scan_model(root):
+    """Обход каталога с сохранением записей в модель.
+
+    Returns:
+        TreeModel: модель каталога
+    """
+    model = TreeModel()
+    with model:
+        for _ in DirScanner(root, index = model).scan():
+            pass
+    return model
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink'), reason = 'символические ссылки не поддерживаются')
+def test_polling_ignores_unchanged_links(tree):
+    (tree / 'dangling').symlink_to(tree / 'missing')
+    (tree / 'valid').symlink_to(tree / 'a' / 'c.txt')
+    (tree / 'dir_link').symlink_to(tree / 'z')
+    watcher = PollingWatcher(scan_model(tree), interval = 0.01)
+
+    assert watcher.wait(1) == set()
+    assert watcher.wait(1) == set()
+
+
+def test_polling_detects_changes(tree):
+    watcher = PollingWatcher(scan_model(tree), interval = 0.01)
+    (tree / 'a' / 'c.txt').write_bytes(b'changed content')
+    (tree / 'arch.zip').write_bytes(b'')
+
+    assert watcher.wait(1) == {str(tree / 'a'), str(tree), str(tree / 'arch.zip')}
+
+
+def test_watch_falls_back_to_polling_when_new_dir_cannot_be_watched(tree, tmp_path, monkeypatch):
+    try:
+        InotifyWatcher(TreeModel()).close()
+    except OSError:
+        pytest.skip('inotify недоступен')
+    add_watch = InotifyWatcher._add_watch
+
+    def failing_add_watch(self, dir_path):
+        if dir_path == str(tree / 'new'):
+            raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC), dir_path)
+        add_watch(self, dir_path)
+
+    monkeypatch.setattr(InotifyWatcher, '_add_watch', failing_add_watch)
+    updates = queue.Queue()
+    stop = threading.Event()
+    manager = ReportManager(tree, tmp_path / 'report.csv')
+    thread = threading.Thread(target = manager.watch, kwargs = {'debounce': 0.05, 'interval': 0.2,
+                                                                'on_update': updates.put, 'stop': stop})
+    thread.start()
+    try:
+        assert updates.get(timeout = 10) == set()
+        (tree / 'new').mkdir()
+        #После ошибки inotify изменение находит периодическая проверка
+        assert str(tree) in updates.get(timeout = 10)
+    finally:
+        stop.set()
+        thread.join(10)
+    assert not thread.is_alive()
+    assert str(tree / 'new') in (tmp_path / 'report.csv').read_text(encoding = 'utf-8-sig')
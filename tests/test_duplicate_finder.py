@@ -0,0 +1,82 @@
+"""Тесты поиска файлов-дубликатов."""
+
+import json
+
+import pytest
+from report_manager import ReportManager, ReportStats, ScanRecord
+from report_manager.scanner import DuplicateFinder
+
+
+def test_duplicates_section_sizes_are_numbers(tmp_path):
+    root = tmp_path / 'root'
+    root.mkdir()
+    for name in ('a.bin', 'b.bin'):
+        (root / name).write_bytes(b'x' * 5000)
+    report_path = tmp_path / 'report.json'
+    ReportManager(root, report_path, duplicates = True).make_report()
+
+    duplicates = json.loads(report_path.read_text(encoding = 'utf-8'))['duplicates']
+
+    assert duplicates == [{'group': 1, 'size': 5000, 'path': str(root / 'a.bin')},
+                          {'group': 1, 'size': 5000, 'path': str(root / 'b.bin')}]
+
+
+def make_files(root, files):
+    """Создание файлов и записей сканирования о них.
+
+    Args:
+        root (Path): каталог для файлов
+        files (dict): имена и содержимое файлов
+
+    Returns:
+        list: записи ScanRecord о файлах
+    """
+    root.mkdir()
+    records = []
+    for name, data in files.items():
+        (root / name).write_bytes(data)
+        records.append(ScanRecord(str(root / name), len(data), 0, 0, False))
+    return records
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_find_groups_files_with_same_content(tmp_path, workers):
+    large = bytes(range(256)) * 64
+    middle = bytearray(large)
+    middle[len(large) // 2] ^= 1
+    records = make_files(tmp_path / 'root', {
+        'a.bin': large,
+        'b.bin': large,
+        'last.bin': large[:-1] + b'!',
+        'middle.bin': bytes(middle),
+        'c.txt': b'small',
+        'd.txt': b'small',
+        'e.txt': b'other',
+        'empty1': b'',
+        'empty2': b'',
+    })
+    link = ScanRecord(str(tmp_path / 'root' / 'link.bin'), len(large), 0, 0, False, link = records[0].path)
+    stats = ReportStats()
+    finder = DuplicateFinder(workers, stats)
+    for record in [*records, link]:
+        finder.add(record)
+
+    groups = finder.find()
+
+    root = tmp_path / 'root'
+    assert groups == [(len(large), [str(root / 'a.bin'), str(root / 'b.bin')]),
+                      (5, [str(root / 'c.txt'), str(root / 'd.txt')])]
+    assert stats.counter('duplicate_candidates') == 7
+    assert stats.counter('partial_hashes') == 7
+    #Файл, отличающийся последним байтом, отсеивается частичным хэшем, отличающийся в середине - полным
+    assert stats.counter('full_hashes') == 3
+
+
+def test_find_skips_removed_files(tmp_path):
+    records = make_files(tmp_path / 'root', {'a.txt': b'same', 'b.txt': b'same', 'c.txt': b'same'})
+    (tmp_path / 'root' / 'c.txt').unlink()
+    finder = DuplicateFinder()
+    for record in records:
+        finder.add(record)
+
+    assert finder.find() == [(4, [records[0].path, records[1].path])]
@@ -0,0 +1,65 @@
+"""Тесты постраничной отрисовки PDF отчета."""
+
+import pytest
+from report_manager import PdfWriter, ScanRecord
+
+from .test_writers import ROOT
+
+#Количество записей на несколько десятков страниц
+RECORDS = 3000
+
+
+def write_pages(writer, records):
+    """Вывод записей с подсчетом страниц, ожидающих отрисовки.
+
+    Args:
+        writer (PdfWriter): Writer
+        records (list): записи ScanRecord
+
+    Returns:
+        int: наибольшее количество неотрисованных страниц после вывода записи
+    """
+    writer.create_file()
+    pending = 0
+    for record in records:
+        writer.write_to_file(record)
+        pending = max(pending, len(writer._pages_ops))
+    return pending
+
+
+def test_flat_pages_are_rendered_while_writing(tmp_path):
+    writer = PdfWriter(tmp_path / 'report.pdf', ROOT)
+    records = [ScanRecord(str(ROOT / f'{i}.txt'), i, 1700000000, 0, False) for i in range(RECORDS)]
+
+    pending = write_pages(writer, records)
+
+    assert pending <= 2
+    rendered = writer._pdf_canvas.getPageNumber() - 1
+    writer.save_file()
+    assert rendered > RECORDS // 100
+    assert writer._pages_ops == {}
+
+
+@pytest.mark.parametrize('batch', [False, True])
+def test_open_level_pages_are_kept_until_closed(tmp_path, batch):
+    writer = PdfWriter(tmp_path / 'report.pdf', ROOT)
+    folder = ScanRecord(str(ROOT / 'dir'), 0, 1700000000, 0, True, totals = [0, 0])
+    files = [ScanRecord(str(ROOT / 'dir' / f'{i}.txt'), i, 1700000000, 1, False) for i in range(RECORDS)]
+    writer.create_file()
+    if batch:
+        writer.write_batch([folder, *files])
+    else:
+        for record in [folder, *files]:
+            writer.write_to_file(record)
+
+    #Пока папка открыта, страница с ее строкой и все следующие не отрисованы
+    assert writer._pdf_canvas.getPageNumber() == 1
+    pages = len(writer._pages_ops)
+    assert pages > RECORDS // 100
+    folder.totals = (sum(range(RECORDS)), RECORDS)
+    writer.write_to_file(ScanRecord(str(ROOT / 'next.txt'), 1, 1700000000, 0, False))
+
+    assert writer._pdf_canvas.getPageNumber() == pages
+    assert len(writer._pages_ops) == 1
+    writer.save_file()
+    assert (tmp_path / 'report.pdf').stat().st_size > 0
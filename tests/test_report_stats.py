@@ -0,0 +1,72 @@
+"""Тесты статистики формирования отчета ReportStats."""
+
+import threading
+
+import pytest
+from report_manager import ReportManager, ReportStats, ScanRecord
+
+
+def test_phases_sum_calls():
+    stats = ReportStats()
+    stats.start()
+    for _ in range(3):
+        with stats.phase('scan'):
+            sum(range(10000))
+    with pytest.raises(KeyError), stats.phase('write:report.csv'):
+        raise KeyError
+    stats.stop()
+
+    phases = stats.to_dict()['phases']
+
+    assert set(phases) == {'scan', 'write:report.csv'}
+    assert phases['scan']['calls'] == 3
+    assert phases['scan']['wall_time'] > 0
+    assert phases['write:report.csv']['calls'] == 1
+    assert stats.wall_time >= phases['scan']['wall_time']
+
+
+def test_counters_from_threads():
+    stats = ReportStats()
+    threads = [threading.Thread(target = lambda: [stats.add(stat_calls = 1, bytes = 2) for _ in range(1000)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stats.counter('stat_calls') == 4000
+    assert stats.counter('bytes') == 8000
+    assert stats.counter('missing') == 0
+
+
+def test_count_batch_and_progress():
+    calls = []
+    stats = ReportStats(lambda entries, speed: calls.append((entries, speed)))
+    stats.start()
+    stats.count_batch([ScanRecord('/a', 0, 0, 0, True), ScanRecord('/a/b', 10, 0, 1, False),
+                       ScanRecord('/a/c', 5, 0, 1, False)])
+    stats.count_batch([ScanRecord('/d', 1, 0, 0, False)])
+    stats.stop()
+
+    assert stats.to_dict()['counters'] == {'entries': 4, 'files': 3, 'dirs': 1, 'bytes': 16, 'batches': 2}
+    assert stats.peak_memory is None
+    assert calls[-1][0] == 4
+    assert calls[-1][1] == stats.entries_per_second > 0
+
+
+def test_report_manager_stats(tree, tmp_path):
+    manager = ReportManager(tree, [tmp_path / 'report.csv', tmp_path / 'report.json'], stats = True,
+                            batch_size = 3)
+    manager.make_report()
+
+    stats = manager.stats.to_dict()
+
+    for name in ('report.csv', 'report.json'):
+        for phase in ('init', 'create', 'write', 'save'):
+            assert stats['phases'][f'{phase}:{name}']['calls'] >= 1
+    assert stats['phases']['scan']['calls'] >= 1
+    counters = stats['counters']
+    assert counters['entries'] == counters['files'] + counters['dirs']
+    assert counters['batches'] == -(-counters['entries'] // 3)
+    assert counters['archives'] == 1
+    assert stats['peak_memory'] > 0
@@ -0,0 +1,83 @@
+"""Тесты фильтра записей сканирования ScanFilter."""
+
+import csv
+import os
+
+import pytest
+from report_manager import ReportManager, ScanFilter
+from report_manager.scanner import ZipFormat
+
+from .utils import make_tar
+
+
+def test_name_and_path_patterns():
+    scan_filter = ScanFilter(exclude = ['*.pyc', 'build/out', '/node_modules/'])
+
+    assert scan_filter.is_excluded('x.pyc', 'src/x.pyc')
+    assert scan_filter.is_excluded('node_modules', 'web/node_modules')
+    assert scan_filter.is_excluded('out', 'build/out')
+    #Шаблон с '/' сравнивается с путем от анализируемого каталога, а не с именем
+    assert not scan_filter.is_excluded('out', 'src/build/out')
+    assert not scan_filter.is_excluded('x.py', 'src/x.py')
+
+
+def test_include_size_and_mtime_apply_to_files():
+    scan_filter = ScanFilter(include = ['*.py', 'docs/*'], min_size = 10, modified_since = 100)
+
+    assert scan_filter.accepts_file('a.py', 'src/a.py', 10, 100)
+    assert scan_filter.accepts_file('readme', 'docs/readme', 10, 100)
+    assert not scan_filter.accepts_file('a.txt', 'src/a.txt', 10, 100)
+    assert not scan_filter.accepts_file('a.py', 'src/a.py', 9, 100)
+    assert not scan_filter.accepts_file('a.py', 'src/a.py', 10, 99)
+    assert not scan_filter.accepts_file('a.py', 'src/a.py', 10, None)
+
+
+def test_max_depth():
+    scan_filter = ScanFilter(max_depth = 1)
+
+    assert scan_filter.descends(0)
+    assert not scan_filter.descends(1)
+
+
+@pytest.mark.parametrize('kwargs', [{'max_depth': -1}, {'min_size': -1}])
+def test_invalid_limits(kwargs):
+    with pytest.raises(ValueError, match = 'Недопустим'):
+        ScanFilter(**kwargs)
+
+
+def report_paths(tree, tmp_path, **kwargs):
+    """Относительные пути записей CSV отчета по каталогу tree.
+
+    Returns:
+        list: пути записей через '/'
+    """
+    report_path = tmp_path / 'report.csv'
+    ReportManager(tree, report_path, **kwargs).make_report()
+    with open(report_path, encoding = 'utf-8-sig', newline = '') as file:  # noqa: PTH123
+        rows = list(csv.reader(file, delimiter = ';'))[1:]
+    return [row[0][len(str(tree)) + 1:].replace('\\', '/') for row in rows]
+
+
+def test_include_keeps_folders_and_archives(tree, tmp_path):
+    paths = report_paths(tree, tmp_path, include = ['*.txt'])
+
+    assert paths == ['a', 'a/c.txt', 'a/d', 'a b.txt', 'a-b', 'a-b/f.txt', 'arch.zip', 'arch.zip/a',
+                     'arch.zip/a/c.txt', 'arch.zip/a/d', 'arch.zip/a/d/e.txt', 'empty', 'z', 'z/y', 'z/y/x']
+
+
+def test_include_filters_archives_of_unconfigured_formats(tree, tmp_path):
+    (tree / 't.tar').write_bytes(make_tar({'g.txt': b'g'}, mode = 'w'))
+
+    assert 't.tar/g.txt' in report_paths(tree, tmp_path, include = ['*.txt'])
+    #TAR архив не читается, поэтому проверяется фильтром как обычный файл
+    paths = report_paths(tree, tmp_path, include = ['*.txt'], archive_formats = [ZipFormat()])
+    assert 't.tar' not in paths
+    assert 'arch.zip/a/c.txt' in paths
+
+
+@pytest.mark.skipif(os.path.normcase('B') != 'B', reason = 'порядок имен зависит от регистра')
+def test_exclude_applies_inside_archives(tree, tmp_path):
+    paths = report_paths(tree, tmp_path, exclude = ['d', 'z'], max_depth = 1)
+
+    assert paths == ['B.log', 'a', 'a/c.txt', 'a b.txt', 'a-b', 'a-b/f.txt', 'arch.zip', 'arch.zip/a',
+                     'arch.zip/a-b', 'empty']
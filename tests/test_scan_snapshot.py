@@ -0,0 +1,88 @@
+"""Тесты снимка сканирования ScanSnapshot и сравнения сканирований ScanDiff."""
+
+import csv
+import os
+
+import pytest
+from report_manager import ChangeType, ReportManager, ScanDiff, ScanRecord, ScanSnapshot
+
+
+def read_csv(path):
+    with open(path, encoding = 'utf-8-sig', newline = '') as file:  # noqa: PTH123
+        return list(csv.reader(file, delimiter = ';'))
+
+
+@pytest.mark.parametrize('dir_sizes', [False, True])
+def test_snapshot_round_trip(tree, tmp_path, dir_sizes):
+    snapshot_path = tmp_path / 'scan.snap'
+    ReportManager(tree, [snapshot_path, tmp_path / 'scan.csv'], dir_sizes = dir_sizes).make_report()
+
+    ReportManager.from_snapshot(snapshot_path, tmp_path / 'snap.csv', dir_sizes = dir_sizes).make_report()
+
+    assert read_csv(tmp_path / 'snap.csv') == read_csv(tmp_path / 'scan.csv')
+    with ScanSnapshot(snapshot_path) as snapshot:
+        assert snapshot.root == str(tree)
+        assert len(snapshot) == len(read_csv(tmp_path / 'scan.csv')) - 1
+
+
+def test_snapshot_totals_computed_when_not_saved(tree, tmp_path):
+    ReportManager(tree, [tmp_path / 'scan.snap']).make_report()
+    ReportManager(tree, [tmp_path / 'scan.csv'], dir_sizes = True).make_report()
+
+    ReportManager.from_snapshot(tmp_path / 'scan.snap', tmp_path / 'snap.csv', dir_sizes = True).make_report()
+
+    assert read_csv(tmp_path / 'snap.csv') == read_csv(tmp_path / 'scan.csv')
+
+
+def records(*items):
+    """Записи сканирования из кортежей (относительный путь, размер, время изменения, папка).
+
+    Returns:
+        list: записи ScanRecord
+    """
+    return [ScanRecord(os.path.join('/root', *path.split('/')), size, mtime, path.count('/'), is_dir)  # noqa: PTH118
+            for path, size, mtime, is_dir in items]
+
+
+def test_scan_diff_classifies_changes():
+    old = records(('a', 0, 1, True), ('a/removed.txt', 1, 1, False), ('a/resized.txt', 1, 1, False),
+                  ('a/same.txt', 1, 1, False), ('a/touched.txt', 1, 1, False), ('b', 0, 1, True),
+                  ('c', 5, 1, False), ('d', 0, 1, True), ('d/old.txt', 1, 1, False))
+    new = records(('a', 0, 2, True), ('a/added.txt', 1, 1, False), ('a/resized.txt', 2, 1, False),
+                  ('a/same.txt', 1, 1, False), ('a/touched.txt', 1, 2, False), ('b', 3, 1, False),
+                  ('c', 0, 1, True), ('d', 0, 1, True), ('d/old.txt', 1, 1, False))
+    scan_diff = ScanDiff()
+
+    result = [(record.path.removeprefix('/root' + os.sep).replace(os.sep, '/'), record.change)
+              for record in scan_diff.diff(old, new)]
+
+    assert result == [
+        ('a', None),
+        ('a/added.txt', ChangeType.ADDED),
+        ('a/removed.txt', ChangeType.REMOVED),
+        ('a/resized.txt', ChangeType.RESIZED),
+        ('a/touched.txt', ChangeType.MODIFIED),
+        ('b', ChangeType.REMOVED),
+        ('b', ChangeType.ADDED),
+        ('c', ChangeType.REMOVED),
+        ('c', ChangeType.ADDED),
+    ]
+    assert scan_diff.counts == {ChangeType.ADDED: 3, ChangeType.REMOVED: 3, ChangeType.RESIZED: 1,
+                                ChangeType.MODIFIED: 1}
+
+
+def test_diff_report_against_snapshot(tree, tmp_path):
+    snapshot_path = tmp_path / 'scan.snap'
+    ReportManager(tree, snapshot_path).make_report()
+    (tree / 'a' / 'c.txt').write_bytes(b'changed')
+    (tree / 'a-b' / 'f.txt').unlink()
+    (tree / 'new.txt').write_bytes(b'')
+
+    ReportManager(tree, tmp_path / 'diff.csv', baseline = snapshot_path).make_report()
+
+    changes = {row[0]: row[3] for row in read_csv(tmp_path / 'diff.csv')[1:] if row[3]}
+    assert changes == {
+        str(tree / 'a' / 'c.txt'): ChangeType.RESIZED.value,
+        str(tree / 'a-b' / 'f.txt'): ChangeType.REMOVED.value,
+        str(tree / 'new.txt'): ChangeType.ADDED.value,
+    }
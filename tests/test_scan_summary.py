@@ -0,0 +1,82 @@
+"""Тесты сводной статистики сканирования ScanSummary."""
+
+import pytest
+from report_manager import ScanRecord
+from report_manager.scanner import ScanSummary
+
+NOW = 1_000_000_000
+DAY = 86400
+
+
+def summarize(summary, *items):
+    """Учет записей в сводке.
+
+    Args:
+        summary (ScanSummary): сводка
+        items (tuple): кортежи (путь, размер, давность изменения в днях, глубина, папка)
+
+    Returns:
+        ScanSummary: сводка после учета всех записей
+    """
+    for path, size, age, depth, is_dir in items:
+        summary.add(ScanRecord(path, size, NOW - age * DAY, depth, is_dir))
+    summary.finish()
+    return summary
+
+
+def test_summary_top_lists():
+    summary = summarize(ScanSummary(top = 2, now = NOW),
+                        ('a', 0, 0, 0, True),
+                        ('a/big.bin', 5000, 2, 1, False),
+                        ('a/b', 0, 0, 1, True),
+                        ('a/b/c.txt', 100, 400, 2, False),
+                        ('a/b/d.txt', 100, 10, 2, False),
+                        ('arch.zip', 300, 1, 0, False),
+                        ('arch.zip/inner.bin', 10 ** 6, 1000, 1, False),
+                        ('e', 0, 0, 0, True),
+                        ('e/f.log', 200, 50, 1, False))
+
+    assert summary.largest_files() == [(5000, 'a/big.bin'), (300, 'arch.zip')]
+    assert summary.largest_dirs() == [(5200, 3, 'a'), (200, 2, 'a/b')]
+    assert summary.oldest_files() == [(NOW - 400 * DAY, 'a/b/c.txt'), (NOW - 50 * DAY, 'e/f.log')]
+
+
+def test_summary_skips_links():
+    summary = ScanSummary(now = NOW)
+    summary.add(ScanRecord('a', 0, NOW, 0, True))
+    summary.add(ScanRecord('a/link', 50, NOW, 1, False, link = 'target'))
+    summary.finish()
+
+    assert summary.largest_files() == []
+    assert summary.largest_dirs() == [(0, 0, 'a')]
+
+
+def test_summary_bucket_counts():
+    summary = summarize(ScanSummary(now = NOW),
+                        ('a.txt', 1023, 0.5, 0, False),
+                        ('b.txt', 1024, 1, 0, False),
+                        ('c.TXT', 2 * 1024 ** 3, 400, 0, False),
+                        ('d', 10, 8, 0, False))
+
+    assert summary.extensions() == [
+        ('.txt', 3, 1023 + 1024 + 2 * 1024 ** 3, (1, 1, 0, 0, 1), (1, 1, 0, 0, 1)),
+        (ScanSummary.NO_EXTENSION, 1, 10, (1, 0, 0, 0, 0), (0, 0, 1, 0, 0)),
+    ]
+
+
+def test_summary_extensions_limit(monkeypatch):
+    monkeypatch.setattr(ScanSummary, 'MAX_EXTENSIONS', 2)
+    summary = summarize(ScanSummary(now = NOW),
+                        ('a.py', 30, 0, 0, False),
+                        ('b.md', 20, 0, 0, False),
+                        ('c.csv', 10, 0, 0, False),
+                        ('d.json', 5, 0, 0, False),
+                        ('e.py', 1, 0, 0, False))
+
+    assert [(extension, files, size) for extension, files, size, _, _ in summary.extensions()] == [
+        ('.py', 2, 31), ('.md', 1, 20), (ScanSummary.OTHER_EXTENSIONS, 2, 15)]
+
+
+def test_summary_invalid_top():
+    with pytest.raises(ValueError, match = 'Недопустимое'):
+        ScanSummary(top = 0)
@@ -0,0 +1,108 @@
+"""Тесты расчета итогов папок SizeRollup и задержки записей RollupWriter."""
+
+import csv
+
+import pytest
+from report_manager import ReportManager, ScanRecord
+from report_manager.base import BaseWriter, RollupWriter
+from report_manager.scanner import SizeRollup
+
+from .test_writers import ROOT
+
+
+class ListWriter(BaseWriter):
+    """Writer, собирающий выведенные записи с итогами на момент вывода."""
+
+    def __init__(self):
+        """Инициализация списка выведенных записей."""
+        super().__init__(ROOT / 'report.csv', ROOT)
+        self.rows = []
+
+    def create_file(self):
+        """Файл отчета не создается."""
+
+    def write_to_file(self, record):
+        """Сохранение имени и итогов записи."""
+        self.rows.append((record.name, record.totals))
+
+    def save_file(self):
+        """Файл отчета не сохраняется."""
+
+
+def rollup_records(rollup, *items):
+    """Учет записей в расчете итогов.
+
+    Args:
+        rollup (SizeRollup): расчет итогов
+        items (tuple): кортежи (имя, размер, глубина, папка)
+
+    Returns:
+        list: записи ScanRecord
+    """
+    records = []
+    for name, size, depth, is_dir in items:
+        record = ScanRecord(str(ROOT / name), size, 0, depth, is_dir)
+        rollup.add(record, is_dir)
+        records.append(record)
+    return records
+
+
+def read_csv(path):
+    with open(path, encoding = 'utf-8-sig', newline = '') as file:  # noqa: PTH123
+        return list(csv.reader(file, delimiter = ';'))
+
+
+def test_size_rollup_totals():
+    rollup = SizeRollup()
+    records = rollup_records(rollup, ('a', 0, 0, True), ('b', 0, 1, True), ('c.txt', 10, 2, False),
+                             ('d.txt', 20, 1, False), ('e', 0, 0, True))
+    link = ScanRecord(str(ROOT / 'g'), 7, 0, 1, False, link = str(ROOT / 'd.txt'))
+    rollup.add(link, False)
+    assert type(records[4].totals) is list
+
+    rollup.finish()
+
+    assert [record.totals for record in records] == [(30, 2), (10, 1), None, None, (0, 0)]
+
+
+def test_rollup_writer_holds_records_until_folder_closes():
+    rollup = SizeRollup()
+    list_writer = ListWriter()
+    writer = RollupWriter(list_writer)
+
+    writer.write_batch(rollup_records(rollup, ('a.txt', 1, 0, False), ('b', 0, 0, True), ('c.txt', 2, 1, False)))
+    assert list_writer.rows == [('a.txt', None)]
+    writer.write_batch(rollup_records(rollup, ('d', 0, 0, True)))
+    assert list_writer.rows == [('a.txt', None), ('b', (2, 1)), ('c.txt', None)]
+    rollup.finish()
+    writer.save_file()
+
+    assert list_writer.rows[-1] == ('d', (0, 0))
+
+
+def test_rollup_writer_spills_held_records(monkeypatch):
+    monkeypatch.setattr(RollupWriter, 'HOLD_ROWS', 1)
+    rollup = SizeRollup()
+    list_writer = ListWriter()
+    writer = RollupWriter(list_writer)
+
+    for item in [('a', 0, 0, True), ('b', 0, 1, True), ('c.txt', 1, 2, False), ('d.txt', 2, 1, False),
+                 ('e', 0, 1, True), ('f.txt', 4, 2, False)]:
+        writer.write_batch(rollup_records(rollup, item))
+    assert writer._spill is not None
+    assert list_writer.rows == []
+    writer.write_batch(rollup_records(rollup, ('g.txt', 8, 0, False)))
+
+    assert writer._spill is None
+    assert list_writer.rows == [('a', (7, 3)), ('b', (1, 1)), ('c.txt', None), ('d.txt', None),
+                                ('e', (4, 1)), ('f.txt', None), ('g.txt', None)]
+
+
+@pytest.mark.parametrize('hold_rows', [1, 3])
+def test_spilled_report_matches(tree, tmp_path, monkeypatch, hold_rows):
+    ReportManager(tree, tmp_path / 'held.csv', dir_sizes = True, batch_size = 1).make_report()
+    monkeypatch.setattr(RollupWriter, 'HOLD_ROWS', hold_rows)
+
+    ReportManager(tree, tmp_path / 'spilled.csv', dir_sizes = True, batch_size = 1).make_report()
+
+    assert read_csv(tmp_path / 'spilled.csv') == read_csv(tmp_path / 'held.csv')
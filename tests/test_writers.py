@@ -0,0 +1,174 @@
+"""Тесты вывода записей Writer'ами."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+from docx import Document
+from openpyxl import load_workbook
+from openpyxl.worksheet._writer import WorksheetWriter
+from report_manager import (
+    ChangeType,
+    CsvWriter,
+    DocxWriter,
+    JsonWriter,
+    ScanRecord,
+    XlsxWriter,
+)
+from report_manager.base import ReportSection, ReportSummary
+from report_manager.base.formatters import mtime_datetime, readable_mtime
+
+ROOT = Path('/data/root')
+
+
+def make_records(changes):
+    """Записи о папках и файлах, в том числе ссылки, итоги папок и изменения.
+
+    Args:
+        changes (bool): заполнять ли тип изменения
+
+    Returns:
+        list: записи ScanRecord
+    """
+    records = []
+    change_types = [None, *ChangeType] if changes else [None]
+    for i in range(2500):
+        depth = i % 4
+        is_dir = i % 5 == 0
+        records.append(ScanRecord(str(ROOT / f'dir{i // 50}' / f'name;{i} "q"'), i * 1000, 1700000000 + i,
+                                  depth, is_dir, totals = (i * 10, i) if is_dir and i % 2 else None,
+                                  change = change_types[i % len(change_types)],
+                                  link = f'/data/target{i}' if i % 97 == 0 else None))
+    return records
+
+
+def write_records(writer, records, batch):
+    """Вывод записей по одной или пачками разного размера.
+
+    Args:
+        writer (BaseWriter): Writer
+        records (list): записи ScanRecord
+        batch (bool): выводить пачками через write_batch
+    """
+    writer.create_file()
+    if batch:
+        for start in range(0, len(records), 700):
+            writer.write_batch(records[start:start + 700])
+    else:
+        for record in records:
+            writer.write_to_file(record)
+    writer.save_file()
+
+
+def read_xlsx(path):
+    return [[cell.value for cell in row] for ws in load_workbook(path).worksheets for row in ws.iter_rows()]
+
+
+def read_docx(path):
+    return [[cell.text for cell in row.cells] for table in Document(path).tables for row in table.rows]
+
+
+@pytest.mark.parametrize('changes', [False, True])
+@pytest.mark.parametrize(('writer_factory', 'extension', 'read'), [
+    (CsvWriter, 'csv', Path.read_bytes),
+    (JsonWriter, 'json', Path.read_bytes),
+    (lambda *args, **kwargs: JsonWriter(*args, json_lines = True, **kwargs), 'jsonl', Path.read_bytes),
+    (XlsxWriter, 'xlsx', read_xlsx),
+    (DocxWriter, 'docx', read_docx),
+])
+def test_write_batch_matches_write_to_file(tmp_path, writer_factory, extension, read, changes):
+    records = make_records(changes)
+    outputs = []
+    for batch in (False, True):
+        report_path = tmp_path / f'report_{batch}.{extension}'
+        write_records(writer_factory(report_path, ROOT, changes = changes), records, batch)
+        outputs.append(read(report_path))
+
+    assert outputs[0] == outputs[1]
+
+
+def test_json_report_is_valid_array(tmp_path):
+    records = make_records(False)
+    report_path = tmp_path / 'report.json'
+    write_records(JsonWriter(report_path, ROOT), records, True)
+
+    data = json.loads(report_path.read_text(encoding = 'utf-8'))
+
+    assert len(data) == len(records)
+    assert data[1]['name'] == records[1].path
+
+
+def test_xlsx_close_removes_sheet_temp_files(tmp_path, monkeypatch):
+    temp_dir = tmp_path / 'temp'
+    temp_dir.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(temp_dir))
+    writer = XlsxWriter(tmp_path / 'report.xlsx', ROOT)
+    writer.create_file()
+    writer.write_batch(make_records(False))
+    writer.close()
+
+    assert list(temp_dir.iterdir()) == []
+    assert not (tmp_path / 'report.xlsx').exists()
+
+
+def test_xlsx_close_without_sheet_cleanup(tmp_path, monkeypatch):
+    #В другой версии openpyxl внутреннего метода удаления временного файла может не быть
+    monkeypatch.delattr(WorksheetWriter, 'cleanup')
+    writer = XlsxWriter(tmp_path / 'report.xlsx', ROOT)
+    writer.create_file()
+    writer.write_batch(make_records(False))
+    writer.close()
+
+    assert not (tmp_path / 'report.xlsx').exists()
+
+
+def make_summary():
+    """Сводка с размером, количеством файлов и временем изменения.
+
+    Returns:
+        ReportSummary: сводка
+    """
+    return ReportSummary('summary', 'Сводка', [
+        ReportSection('largest_dirs', 'Крупнейшие папки', ('Размер папки', 'Файлов', 'Последнее изменение'),
+                      ('size', 'files', 'mtime'), [(10000, 3, 1700000000)],
+                      (ReportSection.SIZE, None, ReportSection.MTIME)),
+    ])
+
+
+@pytest.mark.parametrize('json_lines', [False, True])
+def test_json_summary_values_are_numbers(tmp_path, json_lines):
+    report_path = tmp_path / 'report.json'
+    writer = JsonWriter(report_path, ROOT, json_lines = json_lines, sections = True)
+    writer.create_file()
+    writer.write_batch(make_records(False)[:3])
+    writer.write_summary(make_summary())
+    writer.save_file()
+
+    text = report_path.read_text(encoding = 'utf-8')
+    if json_lines:
+        row = json.loads(text.splitlines()[-1])
+        assert row.pop('section') == 'largest_dirs'
+    else:
+        row = json.loads(text)['summary']['largest_dirs'][0]
+    assert row == {'size': 10000, 'files': 3, 'mtime': readable_mtime(1700000000)}
+
+
+def test_xlsx_summary_values_are_numbers(tmp_path):
+    report_path = tmp_path / 'report.xlsx'
+    writer = XlsxWriter(report_path, ROOT)
+    writer.create_file()
+    writer.write_summary(make_summary())
+    writer.save_file()
+
+    assert read_xlsx(report_path)[-1] == [None, 10000, 3, mtime_datetime(1700000000)]
+
+
+def test_docx_summary_values_are_readable(tmp_path):
+    report_path = tmp_path / 'report.docx'
+    writer = DocxWriter(report_path, ROOT)
+    writer.create_file()
+    writer.write_summary(make_summary())
+    writer.save_file()
+
+    assert ['9.77КБ', '3', readable_mtime(1700000000)] in read_docx(report_path)
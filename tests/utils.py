@@ -0,0 +1,48 @@
+"""Вспомогательные функции тестов: создание архивов."""
+
+import io
+import tarfile
+import zipfile
+
+#Время изменения файлов дерева каталога
+MTIME = 1700000000
+
+
+def make_zip(files):
+    """Создание ZIP архива в памяти.
+
+    Args:
+        files (dict): содержимое архива - путь внутри архива -> данные
+
+    Returns:
+        bytes: данные архива
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        for name, data in files.items():
+            zip_file.writestr(zipfile.ZipInfo(name, (2023, 11, 14, 22, 13, 20)), data)
+    return buffer.getvalue()
+
+
+def make_tar(files, mode = 'w:gz'):
+    """Создание tar архива в памяти.
+
+    Args:
+        files (dict): содержимое архива - путь внутри архива -> данные, None - папка
+        mode (str): режим tarfile.open (сжатие)
+
+    Returns:
+        bytes: данные архива
+    """
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj = buffer, mode = mode) as tar_file:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.mtime = MTIME
+            if data is None:
+                info.type = tarfile.DIRTYPE
+                tar_file.addfile(info)
+            else:
+                info.size = len(data)
+                tar_file.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()